@@ -150,6 +150,20 @@ def format(ctx: Context) -> None:
     ctx.run(tools.ruff.format(*PY_SRC_LIST, config="config/ruff.toml"), title="Formatting code")
 
 
+@duty
+def benchmark(ctx: Context, *cli_args: str) -> None:
+    """Run the benchmark suite on synthetic sakes.
+
+    Parameters:
+        cli_args: Arguments passed to `scripts/benchmark.py`, see `python scripts/benchmark.py --help`.
+    """
+    ctx.run(
+        [sys.executable, "scripts/benchmark.py", *cli_args],
+        title=pyprefix("Running benchmarks"),
+        capture=False,
+    )
+
+
 @duty
 def build(ctx: Context) -> None:
     """Build source and wheel distributions."""
@@ -0,0 +1,523 @@
+"""Benchmark public Sake methods on synthetic sake of different size.
+
+Synthetic sakes are generate in a work directory (and reuse by next run), each method is run on each sake with each
+read_threads value, timing are write in a json file that could be compare with result of an other commit:
+
+    python scripts/benchmark.py --variants 1000 100000 --samples 10 1000 --read-threads 1 4 --output new.json
+    python scripts/benchmark.py --compare old.json new.json
+
+Script use only public Sake API and its own generator, so it could be copied and run on an older commit. Methods
+parameters missing in this commit (read_threads, chunk_size, ...) are not used.
+
+With `--trace directory`, a Chrome trace of all method call on each sake is write in directory (see sake.trace).
+"""
+
+from __future__ import annotations
+
+# std import
+import argparse
+import datetime
+import functools
+import inspect
+import json
+import os
+import pathlib
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+# 3rd party import
+import duckdb
+import numpy
+import polars
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:
+    # std import
+    import collections
+
+PREINDICATION = "germline"
+
+# approximate length of GRCh38 chromosomes
+CHROMOSOMES = {
+    "1": 248_956_422,
+    "2": 242_193_529,
+    "3": 198_295_559,
+    "4": 190_214_555,
+    "5": 181_538_259,
+    "6": 170_805_979,
+    "7": 159_345_973,
+    "8": 145_138_636,
+    "9": 138_394_717,
+    "10": 133_797_422,
+    "11": 135_086_622,
+    "12": 133_275_309,
+    "13": 114_364_328,
+    "14": 107_043_718,
+    "15": 101_991_189,
+    "16": 90_338_345,
+    "17": 83_257_441,
+    "18": 80_373_285,
+    "19": 58_617_616,
+    "20": 64_444_167,
+    "21": 46_709_983,
+    "22": 50_818_468,
+    "X": 156_040_895,
+    "Y": 57_227_415,
+}
+
+NUCLEOTIDES = numpy.array(["A", "C", "G", "T"])
+EFFECTS = numpy.array(["intron_variant", "missense_variant", "synonymous_variant", "stop_gained", "intergenic_region"])
+ROLES = ("patient", "mere", "pere")
+
+# fraction of heterozygote genotypes and of deletion in cnv
+HET_RATE = 0.8
+DEL_RATE = 0.5
+
+
+def generate_patients(n_samples: int) -> polars.DataFrame:
+    """Generate trio families, sample name is pid_crc follow by role index."""
+    n_families = max(1, n_samples // len(ROLES))
+    pids = [f"{family:06X}" for family in range(n_families)]
+
+    return polars.DataFrame(
+        {
+            "sample": [f"{pid}{member}" for pid in pids for member in range(len(ROLES))],
+            "kindex": [member == 0 for _ in pids for member in range(len(ROLES))],
+            "gender": [("F", "F", "M")[member] for _ in pids for member in range(len(ROLES))],
+            "link": [ROLES[member] for _ in pids for member in range(len(ROLES))],
+            "affected": [member == 0 for _ in pids for member in range(len(ROLES))],
+            "pid_crc": [pid for pid in pids for _ in range(len(ROLES))],
+            "preindication": ["p1"] * (n_families * len(ROLES)),
+        },
+    )
+
+
+def generate_chromosome(
+    rng: numpy.random.Generator,
+    chrom: str,
+    n_variants: int,
+    samples: numpy.ndarray,
+) -> tuple[polars.DataFrame, polars.DataFrame]:
+    """Generate variants and genotypes of a chromosome.
+
+    Variants are snv with variantplaner like id (position shift of 31 bits plus reference and alternative),
+    number of carriers follow a geometric law so most variants are rare.
+
+    Return:
+      variants and genotypes
+    """
+    positions = rng.integers(1, CHROMOSOMES[chrom], n_variants, dtype=numpy.uint64)
+    ref = rng.integers(0, 4, n_variants, dtype=numpy.uint64)
+    alt = (ref + rng.integers(1, 4, n_variants, dtype=numpy.uint64)) % 4
+    ids, index = numpy.unique((positions << numpy.uint64(31)) | (ref << numpy.uint64(2)) | alt, return_index=True)
+
+    variants = polars.DataFrame(
+        {
+            "id": ids,
+            "chr": polars.Series([chrom] * len(ids), dtype=polars.String),
+            "pos": positions[index],
+            "ref": NUCLEOTIDES[ref[index]],
+            "alt": NUCLEOTIDES[alt[index]],
+        },
+    )
+
+    carriers = numpy.minimum(rng.geometric(0.5, len(ids)), len(samples))
+    n_genotypes = int(carriers.sum())
+    ref_depth = rng.integers(0, 40, n_genotypes, dtype=numpy.uint32)
+    alt_depth = rng.integers(1, 40, n_genotypes, dtype=numpy.uint32)
+    genotypes = (
+        polars.DataFrame(
+            {
+                "id": numpy.repeat(ids, carriers),
+                "sample": samples[rng.integers(0, len(samples), n_genotypes)],
+                "gt": numpy.where(rng.random(n_genotypes) < HET_RATE, 1, 2).astype(numpy.uint8),
+                "ad": numpy.stack([ref_depth, alt_depth], axis=1),
+                "dp": ref_depth + alt_depth,
+                "gq": rng.integers(10, 100, n_genotypes, dtype=numpy.uint32),
+            },
+        )
+        .with_columns(polars.col("ad").cast(polars.List(polars.UInt32)))
+        .unique(["id", "sample"], keep="first", maintain_order=True)
+    )
+
+    return variants, sake.utils.add_id_part(genotypes).with_columns(polars.col("id_part").cast(polars.UInt64))
+
+
+def generate_lake(path: pathlib.Path, n_variants: int, n_samples: int, seed: int = 42) -> None:
+    """Write a synthetic sake in path.
+
+    Sake contains variants, snpeff annotations split by chromosome, genotypes partitions, genotypes and
+    transmissions of each prescription, patients information and wisecondor cnv.
+
+    Parameters:
+      path: directory of sake
+      n_variants: number of variants
+      n_samples: number of samples, samples are group in trio
+      seed: seed of random generator
+    """
+    for directory in (
+        path / PREINDICATION / "variants",
+        path / "annotations" / "snpeff" / "4.3t" / PREINDICATION,
+        path / PREINDICATION / "genotypes" / "samples",
+        path / PREINDICATION / "genotypes" / "transmissions",
+        path / PREINDICATION / "genotypes" / "partitions",
+        path / "samples",
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=path) as tmp_dir:
+        write_lake(path, pathlib.Path(tmp_dir), n_variants, n_samples, seed)
+
+
+def write_lake(path: pathlib.Path, tmp_path: pathlib.Path, n_variants: int, n_samples: int, seed: int) -> None:
+    """Write synthetic sake in path with tmp_path as scratch directory.
+
+    Patients file is write last, its presence mark a complete sake.
+    """
+    rng = numpy.random.default_rng(seed)
+    target = path / PREINDICATION
+    (tmp_path / "genotypes").mkdir()
+
+    patients = generate_patients(n_samples)
+    patients_path = tmp_path / "patients.parquet"
+    patients.write_parquet(patients_path)
+    samples = patients.get_column("sample").to_numpy()
+
+    lengths = numpy.array(list(CHROMOSOMES.values()), dtype=numpy.float64)
+    for chrom, count in zip(CHROMOSOMES, rng.multinomial(n_variants, lengths / lengths.sum())):
+        variants, genotypes = generate_chromosome(rng, chrom, int(count), samples)
+
+        variants.write_parquet(target / "variants" / f"{chrom}.parquet")
+        variants.select(
+            "id",
+            effect=polars.Series(EFFECTS[rng.integers(0, len(EFFECTS), variants.height)]),
+            gene_name=polars.format("GENE{}", polars.col("pos") // 100_000),
+        ).write_parquet(path / "annotations" / "snpeff" / "4.3t" / PREINDICATION / f"{chrom}.parquet")
+        genotypes.write_parquet(tmp_path / "genotypes" / f"{chrom}.parquet")
+
+    db = duckdb.connect()
+    db.execute(f"SET temp_directory = '{tmp_path / 'duckdb'}'")
+    genotypes_path = f"{tmp_path / 'genotypes'}/*.parquet"
+
+    # partition by a copy of id_part, PARTITION_BY remove its column from files
+    db.execute(
+        f"""COPY (
+            SELECT *, id_part AS part FROM read_parquet('{genotypes_path}') ORDER BY id
+        ) TO '{tmp_path / "partitions"}' (FORMAT parquet, PARTITION_BY (part), FILENAME_PATTERN '{{i}}')""",  # noqa: S608
+    )
+
+    db.execute(
+        f"""COPY (
+            SELECT g.id, g.sample, g.gt, g.ad, g.dp, g.gq, p.pid_crc
+            FROM read_parquet('{genotypes_path}') AS g JOIN read_parquet('{patients_path}') AS p ON g.sample = p.sample
+            ORDER BY g.id
+        ) TO '{tmp_path / "samples"}' (FORMAT parquet, PARTITION_BY (pid_crc), FILENAME_PATTERN '{{i}}')""",  # noqa: S608
+    )
+
+    role = """(
+        SELECT g.id, g.gt, g.ad, g.dp, g.gq, p.pid_crc
+        FROM read_parquet('{genotypes_path}') AS g JOIN read_parquet('{patients_path}') AS p ON g.sample = p.sample
+        WHERE p.link = '{link}'
+    )"""
+    db.execute(
+        f"""COPY (
+            SELECT
+                i.id,
+                i.gt AS index_gt, i.ad AS index_ad, i.dp AS index_dp, i.gq AS index_gq,
+                m.gt AS mother_gt, m.ad AS mother_ad, m.dp AS mother_dp, m.gq AS mother_gq,
+                f.gt AS father_gt, f.ad AS father_ad, f.dp AS father_dp, f.gq AS father_gq,
+                chr(33 + i.gt) || chr(33 + coalesce(m.gt, 0)) || chr(33 + coalesce(f.gt, 0)) AS origin,
+                i.pid_crc
+            FROM {role.format(genotypes_path=genotypes_path, patients_path=patients_path, link="patient")} AS i
+            LEFT JOIN {role.format(genotypes_path=genotypes_path, patients_path=patients_path, link="mere")} AS m
+                ON i.id = m.id AND i.pid_crc = m.pid_crc
+            LEFT JOIN {role.format(genotypes_path=genotypes_path, patients_path=patients_path, link="pere")} AS f
+                ON i.id = f.id AND i.pid_crc = f.pid_crc
+            ORDER BY i.id
+        ) TO '{tmp_path / "transmissions"}' (FORMAT parquet, PARTITION_BY (pid_crc), FILENAME_PATTERN '{{i}}')""",  # noqa: S608
+    )
+    db.close()
+
+    for partition in (tmp_path / "partitions").iterdir():
+        os.replace(partition, target / "genotypes" / "partitions" / partition.name.replace("part=", "id_part="))
+
+    for name in ("samples", "transmissions"):
+        for partition in (tmp_path / name).iterdir():
+            pid = partition.name.removeprefix("pid_crc=")
+            os.replace(partition / "0.parquet", target / "genotypes" / name / f"{pid}.parquet")
+
+    generate_cnv(rng, target / "cnv", patients)
+
+    os.replace(patients_path, path / "samples" / "patients.parquet")
+
+
+def generate_cnv(
+    rng: numpy.random.Generator,
+    path: pathlib.Path,
+    patients: polars.DataFrame,
+    per_sample: int = 5,
+) -> None:
+    """Write wisecondor cnv group by type and chromosome and by prescription."""
+    samples = numpy.repeat(patients.get_column("sample").to_numpy(), per_sample)
+    chroms = numpy.array(list(CHROMOSOMES))[rng.integers(0, len(CHROMOSOMES), len(samples))]
+    starts = rng.integers(1, 40_000, len(samples)) * 1_000 + 2
+    types = numpy.where(rng.random(len(samples)) < DEL_RATE, "DEL", "DUP")
+
+    cnv = polars.DataFrame(
+        {
+            "chr": chroms,
+            "start": starts,
+            "end": starts + rng.integers(10, 5_000, len(samples)) * 1_000,
+            "type": types,
+            "tool": ["wisecondor"] * len(samples),
+            "sample": samples,
+            "gt": numpy.ones(len(samples), dtype=numpy.uint32),
+            "zs": numpy.where(types == "DEL", -1, 1) * rng.uniform(5, 100, len(samples)),
+            "rt": numpy.where(types == "DEL", -1, 1) * rng.uniform(0, 1, len(samples)),
+        },
+    ).join(patients.select("sample", "pid_crc"), on="sample")
+
+    # each file is write even if empty, get_cnv fail on missing file
+    for sv_type in ("DEL", "DUP"):
+        (path / "groupby" / "wisecondor" / sv_type).mkdir(parents=True, exist_ok=True)
+        for chrom in CHROMOSOMES:
+            cnv.filter(polars.col("type") == sv_type, polars.col("chr") == chrom).drop("pid_crc").write_parquet(
+                path / "groupby" / "wisecondor" / sv_type / f"{chrom}.parquet",
+            )
+
+    for (pid,), data in cnv.group_by(["pid_crc"]):
+        (path / "samples" / str(pid)).mkdir(parents=True, exist_ok=True)
+        data.drop("pid_crc").write_parquet(path / "samples" / str(pid) / "wisecondor.parquet")
+
+
+def accepts(function: collections.abc.Callable[..., typing.Any], parameter: str) -> bool:
+    """Check if function has parameter, older commits miss some of them."""
+    return parameter in inspect.signature(function).parameters
+
+
+def timeit(
+    function: collections.abc.Callable[[], typing.Any],
+    repeat: int,
+) -> tuple[list[float], int | None]:
+    """Run function repeat times after one warmup run.
+
+    Return:
+      time in seconds of each run and number of row of result
+    """
+    result = function()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return times, getattr(result, "height", None)
+
+
+def run_benchmarks(
+    path: pathlib.Path,
+    read_threads: list[int],
+    repeat: int,
+    query_size: int,
+    seed: int = 42,
+    *,
+    tracer: sake.trace.Tracer | None = None,
+) -> list[dict[str, typing.Any]]:
+    """Time public Sake methods on sake in path.
+
+    Methods with read_threads parameter are run with each value of read_threads, other only once.
+
+    Parameters:
+      path: sake path
+      read_threads: read_threads values
+      repeat: number of timed run of each method
+      query_size: number of variants used as input of add_* methods
+      seed: seed of random generator used to choose input
+      tracer: if set, each method call is added to trace
+
+    Return:
+      one result by method and read_threads value
+    """
+    rng = numpy.random.default_rng(seed)
+    # stats_callbacks is missing in older commits
+    options: dict[str, typing.Any] = {} if tracer is None else {"stats_callbacks": [tracer]}
+    database = sake.Sake(path, PREINDICATION, threads=max(read_threads), **options)
+
+    all_variants = typing.cast("polars.DataFrame", database.get_interval("1", 0, CHROMOSOMES["1"]))
+    variants = all_variants.sample(min(query_size, all_variants.height), seed=seed)
+    genotypes = typing.cast("polars.DataFrame", database.add_genotypes(variants))
+    samples = typing.cast("polars.DataFrame", database.add_sample_info(genotypes))
+    pids = (
+        polars.read_parquet(path / "samples" / "patients.parquet")
+        .get_column("pid_crc")
+        .unique(maintain_order=True)
+        .to_list()[:10]
+    )
+
+    chroms = list(numpy.array(list(CHROMOSOMES))[rng.integers(0, len(CHROMOSOMES), 100)])
+    starts = [int(rng.integers(0, CHROMOSOMES[chrom] - 1_000_000)) for chrom in chroms]
+    stops = [start + 1_000_000 for start in starts]
+
+    # name, method, positional arguments and optional keyword arguments, unknown keyword are drop
+    cases: list[
+        tuple[str, collections.abc.Callable[..., typing.Any], tuple[typing.Any, ...], dict[str, typing.Any]]
+    ] = [
+        ("get_interval", database.get_interval, ("1", 10_000_000, 20_000_000), {}),
+        ("get_intervals", database.get_intervals, (chroms, starts, stops), {}),
+        ("get_variant_of_prescription", database.get_variant_of_prescription, (pids[0],), {}),
+        ("get_variant_of_prescriptions", database.get_variant_of_prescriptions, (pids,), {"chunk_size": 2}),
+        ("add_variants", database.add_variants, (variants.select("id"),), {}),
+        ("add_genotypes", database.add_genotypes, (variants,), {}),
+        ("add_annotations", database.add_annotations, (variants, "snpeff", "4.3t"), {}),
+        ("add_transmissions", database.add_transmissions, (samples,), {}),
+        ("add_sample_info", database.add_sample_info, (genotypes,), {}),
+        ("get_cnv", database.get_cnv, ("1", 0, 100_000_000, "wisecondor", "DEL"), {"exact": False}),
+        ("utils.add_recurrence", sake.utils.add_recurrence, (genotypes,), {}),
+    ]
+
+    results = []
+    for name, method, args, kwargs in cases:
+        parallel = accepts(method, "read_threads")
+        options = {key: value for key, value in kwargs.items() if accepts(method, key)}
+
+        for value in read_threads if parallel else [1]:
+            if parallel:
+                options["read_threads"] = value
+            times, rows = timeit(functools.partial(method, *args, **options), repeat)
+            results.append(
+                {
+                    "method": name,
+                    "read_threads": value if parallel else None,
+                    "rows": rows,
+                    "times": times,
+                    "min": min(times),
+                    "median": statistics.median(times),
+                },
+            )
+
+    if hasattr(database, "close"):
+        database.close()
+    return results
+
+
+def environment() -> dict[str, typing.Any]:
+    """Get information about commit and machine."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "date": datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+        "sake": sake.__version__,
+        "polars": polars.__version__,
+        "duckdb": duckdb.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(old_path: pathlib.Path, new_path: pathlib.Path) -> None:
+    """Print median time of each benchmark in two result files and their ratio."""
+    runs = []
+    for path in (old_path, new_path):
+        with open(path) as fh_in:
+            runs.append(
+                {
+                    (bench["variants"], bench["samples"], bench["method"], bench["read_threads"]): bench["median"]
+                    for bench in json.load(fh_in)["results"]
+                },
+            )
+
+    print(f"{'variants':>10} {'samples':>8} {'method':<30} {'threads':>7} {'old':>10} {'new':>10} {'ratio':>7}")
+    for key in sorted(runs[0].keys() & runs[1].keys(), key=str):
+        old, new = runs[0][key], runs[1][key]
+        variants, samples, method, threads = key
+        print(
+            f"{variants:>10} {samples:>8} {method:<30} {threads or '-':>7} {old:>10.4f} {new:>10.4f} {new / old:>7.2f}",
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", type=int, nargs="+", default=[1_000, 100_000], help="number of variants")
+    parser.add_argument("--samples", type=int, nargs="+", default=[10, 1_000], help="number of samples")
+    parser.add_argument("--read-threads", type=int, nargs="+", default=[1, 4], help="read_threads values")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed run of each method")
+    parser.add_argument("--query-size", type=int, default=10_000, help="number of variants in input of add_*")
+    parser.add_argument("--seed", type=int, default=42, help="seed of random generator")
+    parser.add_argument(
+        "--workdir",
+        type=pathlib.Path,
+        default=pathlib.Path("benchmark"),
+        help="directory where synthetic sake are generate",
+    )
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="json result path")
+    parser.add_argument(
+        "--trace",
+        type=pathlib.Path,
+        default=None,
+        help="directory where a Chrome trace of each sake is write, open it in Perfetto",
+    )
+    parser.add_argument("--compare", type=pathlib.Path, nargs=2, metavar=("OLD", "NEW"), help="compare two results")
+    args = parser.parse_args(argv)
+
+    if args.compare is not None:
+        compare(*args.compare)
+        return 0
+    if args.trace is not None and not hasattr(sake, "trace"):
+        parser.error("--trace require sake.trace, missing in this commit")
+
+    results = []
+    for n_variants in args.variants:
+        for n_samples in args.samples:
+            path = args.workdir / f"sake_{n_variants}_{n_samples}_{args.seed}"
+            # patients file is write at end of generation
+            if not (path / "samples" / "patients.parquet").is_file():
+                print(f"generate {path}", file=sys.stderr)
+                shutil.rmtree(path, ignore_errors=True)
+                generate_lake(path, n_variants, n_samples, args.seed)
+
+            print(f"benchmark {path}", file=sys.stderr)
+            tracer = None if args.trace is None else sake.trace.Tracer()
+            for bench in run_benchmarks(
+                path,
+                args.read_threads,
+                args.repeat,
+                args.query_size,
+                args.seed,
+                tracer=tracer,
+            ):
+                results.append({"variants": n_variants, "samples": n_samples, **bench})
+
+            if tracer is not None:
+                args.trace.mkdir(parents=True, exist_ok=True)
+                tracer.save(args.trace / f"{path.name}.json")
+
+    report = json.dumps({"environment": environment(), "results": results}, indent=2)
+    if args.output is None:
+        print(report)
+    else:
+        args.output.write_text(report)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,10 +7,25 @@ from __future__ import annotations
 
 # 3rd party import
 # project import
-from sake import _utils, utils
+from sake import _utils, aio, cache, catalog, index, metadata, stats, synth, trace, utils
 from sake.duckdb_query import QUERY
+from sake.lazy import LazyQuery
 from sake.obj import Sake
 
-__all__: list[str] = ["QUERY", "Sake", "_utils", "utils"]
+__all__: list[str] = [
+    "QUERY",
+    "LazyQuery",
+    "Sake",
+    "_utils",
+    "aio",
+    "cache",
+    "catalog",
+    "index",
+    "metadata",
+    "stats",
+    "synth",
+    "trace",
+    "utils",
+]
 
 __version__ = "0.3.0"
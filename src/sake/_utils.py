@@ -3,12 +3,19 @@
 from __future__ import annotations
 
 # std import
+import contextlib
+import glob
+import json
 import os
 import pathlib
+import threading
 import typing
 
 # 3rd party import
 import duckdb
+import numpy
+import polars
+import pyarrow
 from tqdm.auto import tqdm
 
 # project import
@@ -18,9 +25,33 @@ if typing.TYPE_CHECKING:  # pragma: no cover
     # std import
     import collections
 
-    import polars
-
-__all__ = ["QueryByGroupBy", "fix_annotation_path", "flatten_tuples", "get_chromosome_path", "wrap_iterator"]
+    Output: typing.TypeAlias = polars.DataFrame | pyarrow.Table | pyarrow.RecordBatchReader | duckdb.DuckDBPyRelation
+    """Type of Sake method result, depends on output parameter."""
+
+__all__ = [
+    "QueryByGroupBy",
+    "QueryByParams",
+    "configure_connection",
+    "disable_join_in_filter",
+    "fetch_arrow_reader",
+    "fetch_arrow_table",
+    "fix_annotation_path",
+    "flatten_tuples",
+    "get_chromosome_path",
+    "get_connection",
+    "id_filter",
+    "profiling",
+    "quote_identifier",
+    "set_thread_cursor",
+    "use_cursor",
+    "wrap_iterator",
+]
+
+# above this number of ids, filter on id range instead of id list
+ID_LIST_MAX = 1024
+
+# duckdb connections kept warm between call, one by thread of each process
+_LOCAL = threading.local()
 
 
 def flatten_tuples(t: (typing.Any)) -> typing.Any:
@@ -46,6 +77,154 @@ def wrap_iterator(
     return iterator
 
 
+def get_connection(threads: int) -> duckdb.DuckDBPyConnection:
+    """Get a duckdb in memory connection configured to use threads.
+
+    Connection is created at first call and reused by next call in same thread, this function is also use as worker
+    initializer to open connection before first task. If a cursor is set for this thread by
+    [set_thread_cursor][sake._utils.set_thread_cursor] it's returned instead.
+    """
+    cursor = getattr(_LOCAL, "cursor", None)
+    if cursor is not None:
+        return cursor
+
+    connections = getattr(_LOCAL, "connections", None)
+    if connections is None:
+        connections = _LOCAL.connections = {}
+
+    if threads not in connections:
+        duckdb_db = duckdb.connect(":memory:")
+        configure_connection(duckdb_db, threads)
+        connections[threads] = duckdb_db
+
+    return connections[threads]
+
+
+def configure_connection(duckdb_db: duckdb.DuckDBPyConnection, threads: int | None = None) -> None:
+    """Apply sake settings on a duckdb connection or cursor.
+
+    Number of threads is a database setting, keep it None for a cursor else it change threads of all cursors.
+    """
+    duckdb_db.query("SET enable_progress_bar = false;")
+    if threads is not None:
+        duckdb_db.query(f"SET threads TO {threads};")
+    # keep parquet footer between query, duckdb check file change before reuse
+    duckdb_db.query("SET parquet_metadata_cache = true;")
+
+
+def set_thread_cursor(database: duckdb.DuckDBPyConnection) -> None:
+    """Open a cursor on database used by get_connection in current thread, use as thread worker initializer."""
+    _LOCAL.cursor = database.cursor()
+    # cursor doesn't inherit session settings of its database
+    configure_connection(_LOCAL.cursor)
+
+
+@contextlib.contextmanager
+def use_cursor(cursor: duckdb.DuckDBPyConnection) -> collections.abc.Generator[None, None, None]:
+    """Use cursor as connection of get_connection in current thread during block."""
+    previous = getattr(_LOCAL, "cursor", None)
+    _LOCAL.cursor = cursor
+    try:
+        yield
+    finally:
+        _LOCAL.cursor = previous
+
+
+@contextlib.contextmanager
+def disable_join_in_filter(
+    duckdb_db: duckdb.DuckDBPyConnection,
+    ids: polars.Series,
+) -> collections.abc.Generator[None, None, None]:
+    """Stop duckdb to push IN filter build by join in scan of other side during block, if ids contains hashed ids.
+
+    When other side is a DataFrame filter is convert in pyarrow expression, pyarrow fail to convert ids upper than
+    2**63 (hashed ids), other queries keep filter. Option doesn't exist before duckdb 1.2, filter isn't build by these
+    version.
+    """
+    maximum = ids.max()
+    if maximum is None or typing.cast("int", maximum) < 2**63:
+        yield
+        return
+
+    with contextlib.suppress(duckdb.CatalogException):
+        duckdb_db.query("SET dynamic_or_filter_threshold = 0;")
+    try:
+        yield
+    finally:
+        with contextlib.suppress(duckdb.CatalogException):
+            duckdb_db.query("RESET dynamic_or_filter_threshold;")
+
+
+def fetch_arrow_table(result: duckdb.DuckDBPyConnection | duckdb.DuckDBPyRelation) -> pyarrow.Table:
+    """Get result of duckdb query as pyarrow.Table, without deprecated method of recent duckdb version."""
+    if hasattr(result, "to_arrow_table"):
+        return result.to_arrow_table()
+    return result.fetch_arrow_table()  # pragma: no cover
+
+
+def fetch_arrow_reader(result: duckdb.DuckDBPyRelation) -> pyarrow.RecordBatchReader:
+    """Get result of duckdb relation as pyarrow.RecordBatchReader, without deprecated method of recent duckdb version."""
+    if hasattr(result, "to_arrow_reader"):
+        return result.to_arrow_reader()
+    return result.fetch_arrow_reader()  # pragma: no cover
+
+
+@contextlib.contextmanager
+def profiling(
+    duckdb_db: duckdb.DuckDBPyConnection,
+    *,
+    enable: bool = True,
+) -> collections.abc.Generator[dict[str, typing.Any], None, None]:
+    """Activate duckdb profiling of query run in context, profile is added to yielded dict at context exit.
+
+    Profile contains same information as EXPLAIN ANALYZE, yielded dict stay empty if enable is False. Query must be
+    run in caller frame, duckdb replacement scan (`_data`, `_slice`) only look at this frame.
+    """
+    profile: dict[str, typing.Any] = {}
+    if not enable:
+        yield profile
+        return
+
+    duckdb_db.execute("PRAGMA enable_profiling = 'no_output';")
+    try:
+        yield profile
+        profile.update(json.loads(duckdb_db.get_profiling_information(format="json")))
+    finally:
+        duckdb_db.execute("PRAGMA disable_profiling;")
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a column name for duckdb sql, name could contains any character (`-`, `.`, space, quote, ...)."""
+    escaped = name.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def id_filter(ids: polars.Series, column: str = "id") -> str:
+    """Build a sql condition that keep only row with an id present in ids.
+
+    Small set are send as an `IN` list, larger set and hashed ids as an id range. Condition is write with constant so duckdb push it in
+    parquet scan and skip row groups with id statistics outside ids.
+    """
+    values: list[int] = ids.drop_nulls().unique().sort().to_list()
+    if not values:
+        return "false"
+
+    # duckdb push IN list in arrow scan of joined DataFrame and pyarrow fail to convert value upper than 2**63, hashed
+    # ids (bit 63 set) are always keep with a range
+    small = [value for value in values if value < 2**63]
+    large = values[len(small) :]
+
+    conditions = []
+    if len(small) > ID_LIST_MAX:
+        conditions.append(f"{column} between {small[0]}::UBIGINT and {small[-1]}::UBIGINT")
+    elif small:
+        conditions.append(f"{column} in ({', '.join(f'{value}::UBIGINT' for value in small)})")
+    if large:
+        conditions.append(f"{column} between {large[0]}::UBIGINT and {large[-1]}::UBIGINT")
+
+    return conditions[0] if len(conditions) == 1 else f"({' or '.join(conditions)})"
+
+
 def get_chromosome_path(
     prefix: pathlib.Path,
     chroms: list[str] | None = None,
@@ -59,7 +238,7 @@ def get_chromosome_path(
     if chroms is not None:
         for chrom in chroms:
             path = prefix / f"{chrom}.parquet"
-            if path.is_file():
+            if sake.metadata.is_file(path):
                 yield path
     else:
         with os.scandir(prefix) as iterator:
@@ -74,31 +253,38 @@ def fix_annotation_path(
     version: str,
     preindication: str,
     chrom_basename: str = "1",
+    *,
+    is_file: collections.abc.Callable[[pathlib.Path], bool] | None = None,
 ) -> tuple[pathlib.Path, bool] | None:
     """Generate annotation path by check present of file.
 
+    File presence is check with is_file, by default [sake.metadata.is_file][sake.metadata.is_file].
+
     Return:
       - path of annotation
       - if annotation are split by chromosome or not
     """
+    if is_file is None:
+        is_file = sake.metadata.is_file
+
     path = annotations_path / name / version / preindication / f"{chrom_basename}.parquet"
-    if path.is_file():
+    if is_file(path):
         return (path, True)
 
     path = annotations_path / name / version / f"{preindication}.parquet"
-    if path.is_file():
+    if is_file(path):
         return (path, False)
 
     path = annotations_path / name / version / f"{chrom_basename}.parquet"
-    if path.is_file():
+    if is_file(path):
         return (path, True)
 
     path = annotations_path / name / f"{version}.parquet"
-    if path.is_file():
+    if is_file(path):
         return (path, False)
 
     path = annotations_path / name / f"{chrom_basename}.parquet"
-    if path.is_file():
+    if is_file(path):
         return (path, True)
 
     return None
@@ -115,45 +301,200 @@ class QueryByGroupBy:
         query_params: dict[str, str] | None = None,
         expressions: polars.IntoExpr | collections.abc.Iterable[polars.IntoExpr] | None = None,
         select_columns: list[str] | None = None,
+        *,
+        zonemap_template: str | None = None,
+        bloom_template: str | None = None,
+        parameter_columns: dict[str, int] | None = None,
+        profile: bool = False,
     ):
-        """Create quering object."""
+        """Create quering object.
+
+        If zonemap_template is set and a zonemap exist (see [read_zonemap][sake.index.read_zonemap]), only row groups
+        that overlap an interval (start, stop columns of group) are read and query `{source}` is replaced by this
+        slice. If query contains `{id_filter}` it's replaced by a condition on id of group, see
+        [id_filter][sake._utils.id_filter]. If bloom_template is set and bloom filter is up to date, ids absent of file are removed from this condition and only row groups that could
+        contains an id are read. Each parameter_columns item add a column with value of group parameter at this index
+        (e.g. preindication of group), after select_columns. If profile is True duckdb profile of query is added to
+        statistics.
+        """
         self.threads = threads
         self.path_template = path_template
         self.query_name = query_name
         self.query_params = query_params
         self.select_columns = select_columns
         self.expressions = expressions
+        self.zonemap_template = zonemap_template
+        self.bloom_template = bloom_template
+        self.parameter_columns = parameter_columns
+        self.profile = profile
 
     def __call__(self, params: tuple[tuple[int, typing.Any], polars.DataFrame]) -> polars.DataFrame | None:
         """Run query."""
-        duckdb_db = duckdb.connect(":memory:")
-        duckdb_db.query("SET enable_progress_bar = false;")
-        duckdb_db.query(f"SET threads TO {self.threads};")
+        return self.run(params)[0]
 
+    def run(
+        self,
+        params: tuple[tuple[int, typing.Any], polars.DataFrame],
+    ) -> tuple[polars.DataFrame | None, sake.stats.QueryStats]:
+        """Run query and record its statistics, see [QueryStats][sake.stats.QueryStats].
+
+        Stages are `prune` (read of index and row groups), `scan` (duckdb query), `expressions` and `select`.
+        """
         parameter, _data = params
+        stats = sake.stats.QueryStats(name=self.query_name, key=tuple(parameter), rows_in=_data.height)
+
+        duckdb_db = get_connection(self.threads)
 
         path = self.path_template.format(*parameter)
-        if self.query_params is not None:
-            query = sake.QUERY[self.query_name].format(**self.query_params)
-        else:
-            query = sake.QUERY[self.query_name]
+        stat = sake.metadata.file_stat(path)
+        if stat is None or stat[0] == 0:
+            stats.finish()
+            return (None, stats)
+
+        with stats.stage("prune"):
+            query_params = {} if self.query_params is None else dict(self.query_params)
+            execute_params = {"path": path}
+            # None mean whole file is read
+            read_row_groups: list[int] | None = None
+            # ids of _data joined with file, empty if query doesn't filter on id
+            join_ids = polars.Series("id", [], dtype=polars.UInt64)
+
+            zonemap = None
+            if self.zonemap_template is not None:
+                zonemap = sake.index.read_zonemap(
+                    pathlib.Path(path),
+                    pathlib.Path(self.zonemap_template.format(*parameter)),
+                )
+            if zonemap is not None:
+                read_row_groups = sorted(
+                    {
+                        row_group
+                        for start, stop in _data.select("start", "stop").iter_rows()
+                        for row_group in sake.index.overlap_row_groups(zonemap, start, stop)
+                    },
+                )
+                _slice = sake.index.read_row_groups(pathlib.Path(path), read_row_groups)
+                _slice = _slice.append_column(
+                    "file_row_number",
+                    pyarrow.array(range(_slice.num_rows), pyarrow.int64()),
+                )
+                query_params["source"] = "_slice"
+                execute_params = {}
+
+            if "{id_filter}" in sake.QUERY[self.query_name]:
+                join_ids = _data.get_column("id")
+                ids = join_ids.drop_nulls().unique()
+
+                bloom = None
+                if self.bloom_template is not None:
+                    bloom = sake.index.read_bloom_filter(
+                        pathlib.Path(path),
+                        pathlib.Path(self.bloom_template.format(*parameter)),
+                    )
+                if bloom is not None:
+                    contains = bloom.might_contain(ids.to_numpy())
+                    ids = ids.filter(polars.Series(contains.any(axis=0)))
+                    candidates = numpy.flatnonzero(contains.any(axis=1)).tolist()
+                    if len(candidates) < len(bloom):
+                        read_row_groups = candidates
+                        _slice = sake.index.read_row_groups(pathlib.Path(path), candidates)
+                        query_params["source"] = "_slice"
+                        execute_params = {}
+
+                query_params["id_filter"] = id_filter(ids)
+                if read_row_groups is None:
+                    # id filter is push in scan, duckdb skip row groups with id statistics outside ids
+                    read_row_groups = sake.index.statistics_row_groups(path, ids.sort().to_numpy())
+
+            if "{source}" in sake.QUERY[self.query_name]:
+                query_params.setdefault("source", "read_parquet($path)")
+
+            query = sake.QUERY[self.query_name].format(**query_params) if query_params else sake.QUERY[self.query_name]
+
+        stats.add_file(path, sake.stats.parquet_bytes(path, read_row_groups))
+
+        join_filter = disable_join_in_filter(duckdb_db, join_ids)
+        with stats.stage("scan"), join_filter, profiling(duckdb_db, enable=self.profile) as profile:
+            result = duckdb_db.execute(query, execute_params).pl()
+        stats.profile = profile or None
 
-        if not os.path.isfile(path) or os.path.getsize(path) == 0:
-            return None
+        if self.expressions is not None:
+            with stats.stage("expressions"):
+                result = result.with_columns(
+                    self.expressions,
+                )
 
-        result = duckdb_db.execute(
-            query,
-            {
-                "path": path,
-            },
-        ).pl()
+        if self.select_columns is not None:
+            with stats.stage("select"):
+                result = result.select(self.select_columns)
 
-        if self.expressions is not None:
+        if self.parameter_columns is not None:
+            overwritten = [name for name in self.parameter_columns if name in result.columns]
+            if overwritten:
+                raise ValueError(f"parameter columns {overwritten} are already in result")
             result = result.with_columns(
-                self.expressions,
+                polars.lit(parameter[index]).alias(name) for name, index in self.parameter_columns.items()
             )
 
-        if self.select_columns is not None:
-            result = result.select(self.select_columns)
+        stats.finish(result)
+        return (result, stats)
+
+
+class QueryByParams:
+    """Class to run same query with different parameters."""
+
+    def __init__(
+        self,
+        threads: int,
+        query_name: str,
+        query_params: dict[str, str] | None = None,
+        *,
+        profile: bool = False,
+    ):
+        """Create quering object, if profile is True duckdb profile of query is added to statistics."""
+        self.threads = threads
+        self.query_name = query_name
+        self.query_params = query_params
+        self.profile = profile
+
+    def __call__(
+        self,
+        params: dict[str, typing.Any] | tuple[dict[str, typing.Any], polars.DataFrame],
+    ) -> polars.DataFrame:
+        """Run query, if params is a tuple second value is visible as `_data` in query."""
+        return self.run(params)[0]
+
+    def run(
+        self,
+        params: dict[str, typing.Any] | tuple[dict[str, typing.Any], polars.DataFrame],
+    ) -> tuple[polars.DataFrame, sake.stats.QueryStats]:
+        """Run query and record its statistics, see [QueryStats][sake.stats.QueryStats].
+
+        Parquet files are found in `path`, `sample_paths` and `variant_path` parameters, query key is stem of `path`.
+        """
+        duckdb_db = get_connection(self.threads)
+
+        stats = sake.stats.QueryStats(name=self.query_name)
+        if isinstance(params, tuple):
+            params, _data = params
+            stats.rows_in = _data.height
+
+        if "path" in params:
+            stats.key = (pathlib.Path(params["path"]).stem,)
+        for name in ("path", "sample_paths", "variant_path"):
+            values = params.get(name, [])
+            for value in [values] if isinstance(values, str) else values:
+                for path in sorted(glob.glob(value)) if "*" in value else [value]:
+                    stats.add_file(path, sake.stats.parquet_bytes(path))
+
+        if self.query_params is not None:
+            query = sake.QUERY[self.query_name].format(**self.query_params)
+        else:
+            query = sake.QUERY[self.query_name]
+
+        with stats.stage("scan"), profiling(duckdb_db, enable=self.profile) as profile:
+            result = duckdb_db.execute(query, params).pl()
+        stats.profile = profile or None
 
-        return result
+        stats.finish(result)
+        return (result, stats)
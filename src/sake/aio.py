@@ -0,0 +1,295 @@
+"""Define AsyncSake, an asyncio facade of Sake."""
+
+from __future__ import annotations
+
+# std import
+import asyncio
+import concurrent.futures
+import functools
+import json
+import threading
+import typing
+
+# 3rd party import
+import polars
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import collections
+
+    # 3rd party import
+    import duckdb
+
+__all__: list[str] = ["AsyncSake"]
+
+# output that could be consumed only once or are bound to a cursor, call with this output are never shared
+UNSHARED_OUTPUTS = ("reader", "relation")
+
+# returned by next at generator end, StopIteration couldn't go through a future
+_END = object()
+
+
+# json type of argument that could be part of a single-flight key
+_SCALARS = (str, int, float, bool, type(None))
+
+
+class _Flight:
+    """A Sake method call in progress, shared by all callers that wait its result."""
+
+    def __init__(self) -> None:
+        self.future: asyncio.Future[typing.Any] | None = None
+        self.waiters = 0
+        # set by event loop when all callers are cancelled
+        self.cancelled = False
+        # cursor own by this call during its run, used to interrupt running query
+        self.cursor: duckdb.DuckDBPyConnection | None = None
+        # protect cursor between its close by worker and its interruption by event loop
+        self.lock = threading.Lock()
+
+    def interrupt(self) -> None:
+        """Interrupt query running on cursor of call, if call is running."""
+        with self.lock:
+            if self.cursor is not None:
+                self.cursor.interrupt()
+
+
+class AsyncSake:
+    """Asyncio facade of [Sake][sake.Sake], each method of Sake have an awaitable version.
+
+    Methods are run in a bounded pool of threads, each call query Sake database with its own duckdb cursor, event loop
+    is never blocked and Sake caches are shared by all calls. Identical calls (same method, json scalar arguments and
+    input DataFrame content) in progress are run once and all callers get same result (single-flight), except call
+    with reader or relation output. If a call is cancelled by all its callers, it's removed from pool if it isn't
+    started else query running on its cursor is interrupted. Queries run by worker pool of Sake (read_threads > 1)
+    aren't interrupted, call stop when they end.
+    """
+
+    def __init__(self, database: sake.Sake, max_workers: int | None = None, *, single_flight: bool = True):
+        """Create facade.
+
+        Parameters:
+          database: Sake object used by all call
+          max_workers: maximal number of call run at same time, default is database.threads
+          single_flight: share result of identical call in progress
+        """
+        self.database = database
+        self.max_workers = database.threads if max_workers is None else max_workers
+        self.single_flight = single_flight
+        self.__executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="sake-aio",
+        )
+        self.__flights: dict[tuple[str, str], _Flight] = {}
+
+    async def __aenter__(self) -> AsyncSake:  # noqa: PYI034
+        return self
+
+    async def __aexit__(self, *_args: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Wait end of calls in progress and shutdown thread pool and worker pools of database."""
+        await asyncio.get_running_loop().run_in_executor(None, self.__executor.shutdown)
+        self.database.close()
+
+    def __unshared(self, kwargs: dict[str, typing.Any]) -> bool:
+        """Check if call output is bound to its cursor and could be consumed only once."""
+        output = kwargs.get("output")
+        return (self.database.output if output is None else output) in UNSHARED_OUTPUTS
+
+    def __key(self, name: str, args: tuple[typing.Any, ...], kwargs: dict[str, typing.Any]) -> tuple[str, str] | None:
+        """Compute key of a call, None if call couldn't be shared."""
+        if not self.single_flight:
+            return None
+
+        if self.__unshared(kwargs):
+            return None
+
+        def value_key(value: typing.Any) -> typing.Any:
+            """Get json value of an argument, raise TypeError if argument couldn't be part of key."""
+            if isinstance(value, polars.DataFrame):
+                return {"frame": sake.cache.frame_digest(value)}
+            if isinstance(value, polars.Series):
+                return {"series": sake.cache.frame_digest(value.to_frame())}
+            if isinstance(value, _SCALARS):
+                return value
+            if isinstance(value, (list, tuple)) and all(isinstance(element, _SCALARS) for element in value):
+                return list(value)
+            # str of other object (numpy array, pyarrow table, lazy frame, ...) didn't represent all its content
+            raise TypeError
+
+        try:
+            arguments = [[value_key(value) for value in args], {key: value_key(value) for key, value in kwargs.items()}]
+        except TypeError:
+            return None
+
+        return (name, json.dumps(arguments, sort_keys=True))
+
+    def __run(
+        self,
+        flight: _Flight,
+        name: str,
+        args: tuple[typing.Any, ...],
+        kwargs: dict[str, typing.Any],
+    ) -> typing.Any:
+        """Run method in worker thread on a cursor own by call, a call cancelled before its start isn't run."""
+        if flight.cancelled:
+            return None
+
+        cursor = self.database.db.cursor()
+        sake._utils.configure_connection(cursor)
+        with flight.lock:
+            flight.cursor = cursor
+        try:
+            with self.database._use_connection(cursor):
+                return getattr(self.database, name)(*args, **kwargs)
+        finally:
+            with flight.lock:
+                flight.cursor = None
+            # reader and relation read data through cursor after call, cursor is close when they're garbage collected
+            if not self.__unshared(kwargs):
+                cursor.close()
+
+    def __done(self, key: tuple[str, str], flight: _Flight, _future: asyncio.Future[typing.Any]) -> None:
+        """Forget a finished call, next identical call is run again."""
+        if self.__flights.get(key) is flight:
+            del self.__flights[key]
+
+    async def _call(self, name: str, args: tuple[typing.Any, ...], kwargs: dict[str, typing.Any]) -> typing.Any:
+        """Run a Sake method in thread pool, or wait result of an identical call in progress."""
+        key = self.__key(name, args, kwargs)
+        flight = None if key is None else self.__flights.get(key)
+
+        if flight is None:
+            flight = _Flight()
+            flight.future = asyncio.get_running_loop().run_in_executor(
+                self.__executor,
+                functools.partial(self.__run, flight, name, args, kwargs),
+            )
+            if key is not None:
+                self.__flights[key] = flight
+                flight.future.add_done_callback(functools.partial(self.__done, key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.future)  # type: ignore[arg-type]
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if flight.waiters == 0:
+                flight.cancelled = True
+                if key is not None:
+                    self.__done(key, flight, flight.future)  # type: ignore[arg-type]
+                flight.future.cancel()  # type: ignore[union-attr]
+                flight.interrupt()
+            raise
+
+    async def add_annotations(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.add_annotations][sake.Sake.add_annotations]."""
+        return await self._call("add_annotations", args, kwargs)
+
+    async def add_genotypes(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.add_genotypes][sake.Sake.add_genotypes]."""
+        return await self._call("add_genotypes", args, kwargs)
+
+    async def iter_genotypes(
+        self,
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> collections.abc.AsyncGenerator[sake._utils.Output, None]:
+        """Asynchronous version of [Sake.iter_genotypes][sake.Sake.iter_genotypes], call are never shared."""
+        loop = asyncio.get_running_loop()
+        generator = self.database.iter_genotypes(*args, **kwargs)
+        # a step could still run in worker when async generator is close
+        lock = threading.Lock()
+
+        def step() -> typing.Any:
+            with lock:
+                return next(generator, _END)
+
+        def close() -> None:
+            with lock:
+                generator.close()
+
+        try:
+            while True:
+                value = await loop.run_in_executor(self.__executor, step)
+                if value is _END:
+                    break
+                yield value
+        finally:
+            self.__executor.submit(close)
+
+    async def add_sample_info(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.add_sample_info][sake.Sake.add_sample_info]."""
+        return await self._call("add_sample_info", args, kwargs)
+
+    async def add_transmissions(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.add_transmissions][sake.Sake.add_transmissions]."""
+        return await self._call("add_transmissions", args, kwargs)
+
+    async def add_variants(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.add_variants][sake.Sake.add_variants]."""
+        return await self._call("add_variants", args, kwargs)
+
+    async def all_variants(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.all_variants][sake.Sake.all_variants]."""
+        return await self._call("all_variants", args, kwargs)
+
+    async def add_recurrence(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.add_recurrence][sake.Sake.add_recurrence]."""
+        return await self._call("add_recurrence", args, kwargs)
+
+    async def count_recurrence(self, *args: typing.Any, **kwargs: typing.Any) -> polars.DataFrame:
+        """Awaitable version of [Sake.count_recurrence][sake.Sake.count_recurrence]."""
+        return await self._call("count_recurrence", args, kwargs)
+
+    async def get_annotations(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output | None:
+        """Awaitable version of [Sake.get_annotations][sake.Sake.get_annotations]."""
+        return await self._call("get_annotations", args, kwargs)
+
+    async def get_cnv(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.get_cnv][sake.Sake.get_cnv]."""
+        return await self._call("get_cnv", args, kwargs)
+
+    async def get_cnv_by_sample(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.get_cnv_by_sample][sake.Sake.get_cnv_by_sample]."""
+        return await self._call("get_cnv_by_sample", args, kwargs)
+
+    async def get_interval(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.get_interval][sake.Sake.get_interval]."""
+        return await self._call("get_interval", args, kwargs)
+
+    async def get_intervals(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.get_intervals][sake.Sake.get_intervals]."""
+        return await self._call("get_intervals", args, kwargs)
+
+    async def get_intervals_from(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.get_intervals_from][sake.Sake.get_intervals_from]."""
+        return await self._call("get_intervals_from", args, kwargs)
+
+    async def get_variant_of_prescription(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.get_variant_of_prescription][sake.Sake.get_variant_of_prescription]."""
+        return await self._call("get_variant_of_prescription", args, kwargs)
+
+    async def get_variant_of_prescriptions(self, *args: typing.Any, **kwargs: typing.Any) -> sake._utils.Output:
+        """Awaitable version of [Sake.get_variant_of_prescriptions][sake.Sake.get_variant_of_prescriptions]."""
+        return await self._call("get_variant_of_prescriptions", args, kwargs)
+
+    async def build_locator(self) -> sake.index.Locator:
+        """Awaitable version of [Sake.build_locator][sake.Sake.build_locator]."""
+        return await self._call("build_locator", (), {})
+
+    async def build_recurrence(self) -> None:
+        """Awaitable version of [Sake.build_recurrence][sake.Sake.build_recurrence]."""
+        await self._call("build_recurrence", (), {})
+
+    async def build_interval_index(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        """Awaitable version of [Sake.build_interval_index][sake.Sake.build_interval_index]."""
+        await self._call("build_interval_index", args, kwargs)
+
+    async def build_bloom_filters(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        """Awaitable version of [Sake.build_bloom_filters][sake.Sake.build_bloom_filters]."""
+        await self._call("build_bloom_filters", args, kwargs)
@@ -0,0 +1,153 @@
+"""Define ResultCache, a persistent cache of Sake method result."""
+
+from __future__ import annotations
+
+# std import
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import typing
+
+# 3rd party import
+import polars
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import collections
+    import pathlib
+
+__all__: list[str] = ["ResultCache", "frame_digest"]
+
+
+def frame_digest(frame: polars.DataFrame) -> str:
+    """Compute a hash of DataFrame schema and content."""
+    digest = hashlib.sha256(str(frame.schema).encode())
+    digest.update(frame.hash_rows(seed=0).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Cache of polars.DataFrame store as parquet file in a directory.
+
+    Entry key is a hash of method name, arguments, input DataFrame content and size and mtime of sake files read by
+    method, a change in sake files create a new key so old result is never return. When directory size is upper than
+    max_size, least recently used entries are removed.
+    """
+
+    def __init__(self, directory: pathlib.Path, max_size: int = 10 * 2**30):
+        """Create cache in directory.
+
+        Parameters:
+          directory: where result are store
+          max_size: maximal size of directory in bytes
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(
+        name: str,
+        arguments: dict[str, typing.Any],
+        frames: collections.abc.Iterable[polars.DataFrame] = (),
+        paths: collections.abc.Iterable[pathlib.Path] = (),
+    ) -> str:
+        """Compute key of a method call.
+
+        Parameters:
+          name: name of method
+          arguments: arguments of method, must be json serializable (or have a stable str)
+          frames: input DataFrame of method
+          paths: sake files read by method, file size and mtime are part of key
+
+        Return:
+          hexadecimal key
+        """
+        digest = hashlib.sha256()
+        digest.update(
+            json.dumps(
+                {
+                    "name": name,
+                    "arguments": arguments,
+                    "files": {str(path): sake.metadata.file_stat(path, max_age=0) for path in sorted(paths)},
+                    "versions": [sake.__version__, polars.__version__],
+                },
+                sort_keys=True,
+                default=str,
+            ).encode(),
+        )
+
+        for frame in frames:
+            digest.update(frame_digest(frame).encode())
+
+        return digest.hexdigest()
+
+    def __path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}.parquet"
+
+    def get(self, key: str) -> polars.DataFrame | None:
+        """Get result associate to key, None if key isn't in cache."""
+        path = self.__path(key)
+        try:
+            result = polars.read_parquet(path)
+            # mtime is used as last access time
+            os.utime(path)
+        except FileNotFoundError:
+            with self.__lock:
+                self.misses += 1
+            return None
+
+        with self.__lock:
+            self.hits += 1
+        return result
+
+    def set(self, key: str, result: polars.DataFrame) -> None:
+        """Store result, least recently used entries are removed if cache is too large."""
+        path = self.__path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        result.write_parquet(tmp_path)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until cache size is lower than max_size."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".parquet"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # pragma: no cover
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+    def size(self) -> int:
+        """Get size of cache in bytes."""
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith(".parquet"))
+
+    def clear(self) -> None:
+        """Remove all entries and reset counter."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".parquet"):
+                os.remove(entry.path)
+
+        with self.__lock:
+            self.hits = 0
+            self.misses = 0
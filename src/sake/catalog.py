@@ -0,0 +1,186 @@
+"""Define SakeCatalog, an in memory list of sake files."""
+
+from __future__ import annotations
+
+# std import
+import collections
+import json
+import os
+import threading
+import typing
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import pathlib
+
+__all__: list[str] = ["SakeCatalog"]
+
+
+class SakeCatalog:
+    """List of parquet files of a sake and their size.
+
+    Each directory is walk once, at first lookup of a path inside it, after that file existence, size and directory
+    content are answered from memory. Catalog could be save in a json manifest and reload without walk sake. File
+    create or remove after walk of its directory are seen only after [refresh][sake.catalog.SakeCatalog.refresh].
+    """
+
+    def __init__(
+        self,
+        root: pathlib.Path,
+        directories: list[pathlib.Path],
+        files: dict[str, int] | None = None,
+        walked: list[str] | None = None,
+        *,
+        manifest: pathlib.Path | None = None,
+    ):
+        """Create catalog of parquet files in directories.
+
+        Parameters:
+          root: sake path, files are store relatively to root
+          directories: directories indexed by catalog
+          files: size of each file, path relative to root, if None directories are walk when needed
+          walked: directories (relative to root) already walk, if None and files is set all directories are walk
+          manifest: if set catalog is save in this file after each directory walk
+        """
+        self.root = root
+        self.directories = directories
+        self.manifest = manifest
+        self.lock = threading.Lock()
+        self.names = [self.__relative(directory) for directory in directories]
+
+        if files is None:
+            self.__set_files({}, [])
+        else:
+            self.__set_files(files, list(self.names) if walked is None else walked)
+
+    def __set_files(self, files: dict[str, int], walked: list[str]) -> None:
+        """Set files and compute content of each directory."""
+        children: dict[str, list[str]] = collections.defaultdict(list)
+        for name in sorted(files):
+            children[os.path.dirname(name)].append(name)
+
+        self.files = files
+        self.children = children
+        self.walked = walked
+
+    def __relative(self, path: pathlib.Path | str) -> str:
+        """Get path relative to root."""
+        return os.path.relpath(path, self.root)
+
+    def __walk(self, path: pathlib.Path | str | None = None) -> None:
+        """Walk directories that contains path and aren't already walk, if path is None all directories are walk."""
+        if len(self.walked) == len(self.names):
+            return
+
+        relative = None if path is None else self.__relative(path)
+        directories = [
+            (directory, name)
+            for directory, name in zip(self.directories, self.names)
+            if name not in self.walked and (relative is None or relative == name or relative.startswith(name + os.sep))
+        ]
+        if not directories:
+            return
+
+        with self.lock:
+            files = dict(self.files)
+            walked = list(self.walked)
+            for directory, name in directories:
+                if name in walked:
+                    continue
+                for dirpath, _, filenames in os.walk(directory):
+                    for filename in filenames:
+                        if filename.endswith(".parquet"):
+                            file_path = os.path.join(dirpath, filename)
+                            files[self.__relative(file_path)] = os.path.getsize(file_path)
+                walked.append(name)
+
+            self.__set_files(files, walked)
+            if self.manifest is not None:
+                self.save(self.manifest)
+
+    def refresh(self) -> None:
+        """Forget content of directories, they are walk again at next lookup."""
+        with self.lock:
+            self.__set_files({}, [])
+            if self.manifest is not None:
+                self.save(self.manifest)
+
+    def __len__(self) -> int:
+        self.__walk()
+        return len(self.files)
+
+    def size(self, path: pathlib.Path | str) -> int | None:
+        """Get size of file, None if file isn't in catalog."""
+        self.__walk(path)
+        return self.files.get(self.__relative(path))
+
+    def is_file(self, path: pathlib.Path | str) -> bool:
+        """Check if file is in catalog."""
+        self.__walk(path)
+        return self.__relative(path) in self.files
+
+    def get_chromosome_path(
+        self,
+        prefix: pathlib.Path,
+        chroms: list[str] | None = None,
+    ) -> collections.abc.Generator[pathlib.Path, None, None]:
+        """Get parquet files of directory, same as [get_chromosome_path][sake._utils.get_chromosome_path].
+
+        Files are sorted by name.
+        """
+        if chroms is not None:
+            for chrom in chroms:
+                path = prefix / f"{chrom}.parquet"
+                if self.is_file(path):
+                    yield path
+        else:
+            self.__walk(prefix)
+            for name in self.children.get(self.__relative(prefix), []):
+                yield self.root / name
+
+    def fix_annotation_path(
+        self,
+        annotations_path: pathlib.Path,
+        name: str,
+        version: str,
+        preindication: str,
+        chrom_basename: str = "1",
+    ) -> tuple[pathlib.Path, bool] | None:
+        """Find annotation path, same as [fix_annotation_path][sake._utils.fix_annotation_path]."""
+        return sake._utils.fix_annotation_path(
+            annotations_path,
+            name,
+            version,
+            preindication,
+            chrom_basename=chrom_basename,
+            is_file=self.is_file,
+        )
+
+    def save(self, path: pathlib.Path) -> None:
+        """Write catalog in a json manifest."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as fh_out:
+            json.dump(
+                {
+                    "directories": [self.__relative(directory) for directory in self.directories],
+                    "walked": self.walked,
+                    "files": self.files,
+                },
+                fh_out,
+            )
+
+    @classmethod
+    def load(cls, root: pathlib.Path, path: pathlib.Path) -> SakeCatalog:
+        """Read catalog from a json manifest, directories not walk before save are walk when needed."""
+        with open(path) as fh_in:
+            manifest = json.load(fh_in)
+
+        return cls(
+            root,
+            [root / directory for directory in manifest["directories"]],
+            manifest["files"],
+            manifest.get("walked"),
+        )
@@ -21,6 +21,46 @@ QUERY: dict[str, str] = {
     and
         v.pos < $stop
     """,
+    "get_interval_preindications": """
+    select
+        v.id, v.chr, v.pos, v.ref, v.alt, p.preindication
+    from
+        read_parquet($paths, filename = true) as v
+    join
+        (select unnest($paths) as filename, unnest($preindications) as preindication) as p
+    on
+        v.filename == p.filename
+    where
+        v.chr == $chrom
+    and
+        v.pos > $start
+    and
+        v.pos < $stop
+    """,
+    "get_interval_slice": """
+    select
+        v.id, v.chr, v.pos, v.ref, v.alt
+    from
+        _slice as v
+    where
+        v.chr == $chrom
+    and
+        v.pos > $start
+    and
+        v.pos < $stop
+    """,
+    "get_intervals": """
+    select
+        v.id, v.chr, v.pos, v.ref, v.alt, v.file_row_number, i.* exclude (chr, start, stop)
+    from
+        {source} as v
+    join
+        _data as i
+    on
+        v.pos > i.start
+    and
+        v.pos < i.stop
+    """,
     "get_variant_of_prescription": """
     select
         v.chr, v.pos, v.ref, v.alt, g.*
@@ -31,6 +71,16 @@ QUERY: dict[str, str] = {
     on
         v.id = g.id
     """,
+    "get_variant_of_prescriptions": """
+    select
+        v.chr, v.pos, v.ref, v.alt, g.*
+    from
+        read_parquet($sample_paths) as g
+    join
+        read_parquet($variant_path) as v
+    on
+        v.id = g.id
+    """,
     "get_annotations": """
     select
         v.*, {columns}
@@ -81,7 +131,7 @@ QUERY: dict[str, str] = {
     from
         _data as v
     left join
-        read_parquet($path) as t
+        (select * from {source} where {id_filter}) as t
     on
         v.id == t.id
     where
@@ -93,7 +143,7 @@ QUERY: dict[str, str] = {
     from
         _data as v
     join
-        read_parquet($path) as g
+        (select * from {source} where {id_filter}) as g
     on
         v.id == g.id
     """,
@@ -107,4 +157,145 @@ QUERY: dict[str, str] = {
     and
         v.end {stop_comp} $stop
     """,
+    "build_recurrence": """
+    copy (
+        select
+            g.id,
+            sum(g.gt)::BIGINT as sake_AC,
+            sum(g.gt::BIGINT - 1)::BIGINT as sake_nhomalt,
+            count(distinct g.sample)::UINTEGER as sake_carriers
+        from
+            (select distinct id, gt, sample from read_parquet($path)) as g
+        group by
+            g.id
+        order by
+            g.id
+    ) to '{output}' (format parquet)
+    """,
+    "count_recurrence": """
+    select
+        g.id{group_columns},
+        sum(g.gt)::BIGINT as sake_AC,
+        sum(g.gt::BIGINT - 1)::BIGINT as sake_nhomalt,
+        count(distinct g.sample)::UINTEGER as sake_carriers
+    from
+        (select distinct id, gt, sample from {source} where {id_filter}) as g
+    {samples_join}
+    group by
+        g.id{group_columns}
+    """,
+    "get_recurrence": """
+    select
+        r.id, r.sake_AC, r.sake_nhomalt, r.sake_carriers
+    from
+        {source} as r
+    where
+        {id_filter}
+    """,
+    "lazy_source": """
+    select
+        *
+    from
+        {source}
+    """,
+    "lazy_all_variants": """
+    select
+        v.id, v.chr, v.pos, v.ref, v.alt
+    from
+        read_parquet(${path}) as v
+    """,
+    "lazy_get_interval": """
+    select
+        v.id, v.chr, v.pos, v.ref, v.alt
+    from
+        read_parquet(${path}) as v
+    where
+        v.chr == ${chrom}
+    and
+        v.pos > ${start}
+    and
+        v.pos < ${stop}
+    """,
+    "lazy_get_variant_of_prescription": """
+    select
+        v.chr, v.pos, v.ref, v.alt, g.*
+    from
+        read_parquet(${sample_path}) as g
+    join
+        read_parquet(${variant_path}) as v
+    on
+        v.id = g.id
+    """,
+    "lazy_add_variants": """
+    select
+        v.chr, v.pos, v.ref, v.alt, d.*
+    from
+        read_parquet(${path}) as v
+    join
+        ({source}) as d
+    on
+        v.id == d.id
+    """,
+    "lazy_add_genotypes": """
+    select
+        v.*, {columns}
+    from
+        ({source}) as v
+    join
+        read_parquet(${path}, hive_partitioning = false) as g
+    on
+        v.id == g.id
+    """,
+    "lazy_add_annotations": """
+    select
+        v.*, {columns}
+    from
+        ({source}) as v
+    left join
+        read_parquet(${path}) as a
+    on
+        v.id == a.id
+    """,
+    "lazy_add_sample_info": """
+    select
+        v.*, {columns}
+    from
+        ({source}) as v
+    left join
+        read_parquet(${path}) as s
+    on
+        v.sample == s.sample
+    """,
+    "lazy_add_transmissions": """
+    select
+        v.*, {columns}
+    from
+        ({source}) as v
+    left join
+        read_parquet(${path}, filename = true) as t
+    on
+        v.id == t.id and v.pid_crc == parse_filename(t.filename, true)
+    where
+        v.kindex == True
+    """,
+    "lazy_filter": """
+    select
+        *
+    from
+        ({source}) as v
+    where
+        {condition}
+    """,
+    "lazy_distinct": """
+    select distinct
+        {expression}
+    from
+        ({source}) as v
+    """,
+    "lazy_select": """
+    select
+        {columns}
+    from
+        ({source}) as v
+    """,
 }
@@ -0,0 +1,465 @@
+"""Define sidecar index use to read only part of parquet file."""
+
+from __future__ import annotations
+
+# std import
+import contextlib
+import json
+import os
+import tempfile
+import typing
+
+# 3rd party import
+import numpy
+import polars
+import pyarrow.compute
+import pyarrow.parquet
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import collections
+    import pathlib
+
+__all__: list[str] = [
+    "BloomFilter",
+    "Locator",
+    "build_bloom_filter",
+    "build_zonemap",
+    "column_min_max",
+    "overlap_row_groups",
+    "read_bloom_filter",
+    "read_row_groups",
+    "read_zonemap",
+    "statistics_row_groups",
+    "statistics_zonemap",
+]
+
+# salt of parquet split block bloom filter
+BLOOM_SALT = numpy.array(
+    [0x47B6137B, 0x44974D91, 0x8824AD5B, 0xA2B7289D, 0x705495C7, 0x2DF1424B, 0x9EFC4947, 0x5C6BFB31],
+    dtype=numpy.uint32,
+)
+
+
+def _file_key(path: pathlib.Path) -> dict[str, int]:
+    """Get value use to check if an index is fresh."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+@contextlib.contextmanager
+def _replace(path: pathlib.Path, mode: str = "wb") -> collections.abc.Generator[typing.IO[typing.Any], None, None]:
+    """Write in a temporary file next to path and rename it to path at end.
+
+    File memory mapped by a reader keep its content, reader see the new file only when it open it again.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with open(fd, mode) as fh_out:
+            yield fh_out
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def column_min_max(path: pathlib.Path, column: str) -> tuple[typing.Any, typing.Any] | None:
+    """Get min and max of column from parquet row group statistics.
+
+    Return:
+      min and max of column, None if a row group didn't have statistics.
+    """
+    metadata = sake.metadata.parquet_metadata(path)
+    column_index = metadata.schema.to_arrow_schema().get_field_index(column)
+
+    minimum, maximum = None, None
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        if row_group.num_rows == 0:
+            continue
+
+        statistics = row_group.column(column_index).statistics
+        if statistics is None or not statistics.has_min_max:
+            return None
+
+        minimum = statistics.min if minimum is None else min(minimum, statistics.min)
+        maximum = statistics.max if maximum is None else max(maximum, statistics.max)
+
+    if minimum is None:
+        return None
+
+    return (minimum, maximum)
+
+
+def statistics_row_groups(path: pathlib.Path | str, values: numpy.ndarray, column: str = "id") -> list[int]:
+    """Get row groups that could contains one of values according to column statistics.
+
+    It's row groups duckdb read when it push a filter on these values in parquet scan, row group without statistics
+    is always read.
+
+    Parameters:
+      path: parquet file
+      values: sorted values
+      column: name of column
+
+    Return:
+      index of row groups
+    """
+    metadata = sake.metadata.parquet_metadata(path)
+    column_index = metadata.schema.to_arrow_schema().get_field_index(column)
+
+    row_groups = []
+    for i in range(metadata.num_row_groups):
+        statistics = metadata.row_group(i).column(column_index).statistics
+        if (
+            statistics is None
+            or not statistics.has_min_max
+            or numpy.searchsorted(values, statistics.min, "left") < numpy.searchsorted(values, statistics.max, "right")
+        ):
+            row_groups.append(i)
+
+    return row_groups
+
+
+def statistics_zonemap(path: pathlib.Path | str, column: str = "pos") -> list[tuple[int, int]] | None:
+    """Get min and max of column for each row group from parquet statistics.
+
+    Return:
+      min and max of column for each row group, None if a row group didn't have statistics.
+    """
+    metadata = sake.metadata.parquet_metadata(path)
+    column_index = metadata.schema.to_arrow_schema().get_field_index(column)
+
+    row_groups = []
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        statistics = row_group.column(column_index).statistics
+        if row_group.num_rows == 0:
+            # row group without value, no interval could overlap it
+            row_groups.append((1, 0))
+        elif statistics is None or not statistics.has_min_max:
+            return None
+        else:
+            row_groups.append((int(statistics.min), int(statistics.max)))
+
+    return row_groups
+
+
+def build_zonemap(path: pathlib.Path, index: pathlib.Path, column: str = "pos") -> list[tuple[int, int]]:
+    """Compute min and max of column for each row group of parquet file.
+
+    If parquet file store row group statistics they are used and nothing is write, else column is read and zonemap
+    is write in index.
+
+    Parameters:
+      path: parquet file
+      index: path of json file where zonemap is write
+      column: name of column indexed
+
+    Return:
+      min and max of column for each row group
+    """
+    row_groups = statistics_zonemap(path, column)
+    if row_groups is not None:
+        return row_groups
+
+    parquet = pyarrow.parquet.ParquetFile(path)
+    row_groups = []
+    for i in range(parquet.metadata.num_row_groups):
+        values = parquet.read_row_group(i, columns=[column]).column(0)
+        min_max = pyarrow.compute.min_max(values)
+        if min_max["min"].is_valid:
+            row_groups.append((min_max["min"].as_py(), min_max["max"].as_py()))
+        else:
+            # row group without value, no interval could overlap it
+            row_groups.append((1, 0))
+
+    size, mtime_ns = sake.metadata.file_stat(path, max_age=0)  # type: ignore[misc]
+    index.parent.mkdir(parents=True, exist_ok=True)
+    with _replace(index, "w") as fh_out:
+        json.dump({"size": size, "mtime_ns": mtime_ns, "column": column, "row_groups": row_groups}, fh_out)
+    # next read see new index
+    sake.metadata.file_stat(index, max_age=0)
+
+    return row_groups
+
+
+def read_zonemap(path: pathlib.Path, index: pathlib.Path, column: str = "pos") -> list[tuple[int, int]] | None:
+    """Read zonemap of parquet file, from its row group statistics or from index.
+
+    Return:
+      min and max of each row group, None if file didn't have statistics and index didn't exist or parquet file
+      change after index build.
+    """
+    key = sake.metadata.file_stat(path, max_age=0)
+    if key is None or key[0] == 0:
+        return None
+
+    row_groups = statistics_zonemap(path, column)
+    if row_groups is not None:
+        return row_groups
+
+    if not sake.metadata.is_file(index):
+        return None
+
+    with open(index) as fh_in:
+        zonemap = json.load(fh_in)
+
+    if (zonemap["size"], zonemap["mtime_ns"]) != key:
+        return None
+
+    return [(row_group[0], row_group[1]) for row_group in zonemap["row_groups"]]
+
+
+def overlap_row_groups(zonemap: list[tuple[int, int]], start: int, stop: int) -> list[int]:
+    """Get index of row group that could contains value strictly between start and stop."""
+    return [i for i, (minimum, maximum) in enumerate(zonemap) if maximum > start and minimum < stop]
+
+
+def read_row_groups(path: pathlib.Path, row_groups: list[int], columns: list[str] | None = None) -> pyarrow.Table:
+    """Read only some row groups of a parquet file."""
+    parquet = pyarrow.parquet.ParquetFile(path)
+    if not row_groups:
+        schema = parquet.schema_arrow
+        if columns is not None:
+            schema = pyarrow.schema([schema.field(name) for name in columns])
+        return schema.empty_table()
+
+    return parquet.read_row_groups(row_groups, columns=columns)
+
+
+class Locator:
+    """Sorted and memory mapped index of variants id.
+
+    Index store sorted ids and for each id chromosome, position, reference and alternative sequence in fixed width
+    numpy array (string are store as arrow offsets and data), file are memory mapped so N ids are locate by a
+    vectorized binary search in O(N log M) without parquet scan.
+    """
+
+    STRING_COLUMNS = ("ref", "alt")
+
+    def __init__(self, directory: pathlib.Path):
+        """Load locator store in directory."""
+        self.directory = directory
+
+        with open(directory / "meta.json") as fh_in:
+            meta = json.load(fh_in)
+        self.chroms: list[str] = meta["chroms"]
+        self.files: dict[str, dict[str, int]] = meta["files"]
+
+        self.ids = numpy.load(directory / "id.npy", mmap_mode="r")
+        self.chr = numpy.load(directory / "chr.npy", mmap_mode="r")
+        self.pos = numpy.load(directory / "pos.npy", mmap_mode="r")
+
+        self.strings = {}
+        for name in Locator.STRING_COLUMNS:
+            offsets = numpy.load(directory / f"{name}_offsets.npy", mmap_mode="r")
+            data = numpy.load(directory / f"{name}_data.npy", mmap_mode="r")
+            self.strings[name] = pyarrow.Array.from_buffers(
+                pyarrow.large_string(),
+                len(self.ids),
+                [None, pyarrow.py_buffer(offsets), pyarrow.py_buffer(data)],
+            )
+
+    @classmethod
+    def build(cls, paths: collections.abc.Iterable[pathlib.Path], directory: pathlib.Path) -> Locator:
+        """Build locator of variants files in directory."""
+        paths = sorted(paths)
+        variants = (
+            polars.concat([polars.read_parquet(path, columns=["id", "chr", "pos", "ref", "alt"]) for path in paths])
+            .with_columns(polars.col("chr").cast(polars.String))
+            .sort("id")
+        )
+
+        chroms = variants.get_column("chr").unique().sort().to_list()
+        chr_code = variants.get_column("chr").replace_strict(
+            chroms,
+            list(range(len(chroms))),
+            return_dtype=polars.UInt16,
+        )
+
+        # files are replace not overwrite, locator already open on directory keep reading old files
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, values in (
+            ("id", variants.get_column("id").to_numpy()),
+            ("chr", chr_code.to_numpy()),
+            ("pos", variants.get_column("pos").to_numpy()),
+        ):
+            with _replace(directory / f"{name}.npy") as fh_out:
+                numpy.save(fh_out, values)
+
+        for name in Locator.STRING_COLUMNS:
+            array = variants.get_column(name).fill_null("").to_arrow().cast(pyarrow.large_string())
+            buffers = array.buffers()
+            offsets = numpy.frombuffer(buffers[1], dtype=numpy.int64)[array.offset : array.offset + len(array) + 1]
+            data = numpy.frombuffer(buffers[2], dtype=numpy.uint8)[offsets[0] : offsets[-1]]
+            with _replace(directory / f"{name}_offsets.npy") as fh_out:
+                numpy.save(fh_out, offsets - offsets[0])
+            with _replace(directory / f"{name}_data.npy") as fh_out:
+                numpy.save(fh_out, data)
+
+        # meta is write last, a locator without meta is incomplete
+        with _replace(directory / "meta.json", "w") as fh_out:
+            json.dump({"chroms": chroms, "files": {path.name: _file_key(path) for path in paths}}, fh_out)
+
+        return cls(directory)
+
+    @staticmethod
+    def is_fresh(directory: pathlib.Path, paths: collections.abc.Iterable[pathlib.Path]) -> bool:
+        """Check if locator exist and was build from current version of variants files."""
+        if not (directory / "meta.json").is_file():
+            return False
+
+        with open(directory / "meta.json") as fh_in:
+            files = json.load(fh_in)["files"]
+
+        return files == {path.name: _file_key(path) for path in paths}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def locate(self, ids: polars.Series | numpy.ndarray) -> polars.DataFrame:
+        """Get id, chr, pos, ref and alt of ids present in index, one row by query id."""
+        query = numpy.asarray(ids, dtype=numpy.uint64)
+
+        index = numpy.searchsorted(self.ids, query)
+        index[index >= len(self.ids)] = 0
+        found = index[self.ids[index] == query] if len(self.ids) else index[:0]
+
+        take = pyarrow.array(found)
+        return polars.DataFrame(
+            {
+                "id": numpy.asarray(self.ids[found]),
+                "chr": polars.Series(self.chroms, dtype=polars.String).gather(self.chr[found]),
+                "pos": numpy.asarray(self.pos[found]),
+                "ref": polars.from_arrow(self.strings["ref"].take(take)),
+                "alt": polars.from_arrow(self.strings["alt"].take(take)),
+            },
+        )
+
+
+class BloomFilter:
+    """Split block bloom filter of uint64 values, one filter by row group of a parquet file.
+
+    Each filter is a set of 256 bits blocks, a value set one bit in each of the 8 words of one block (same scheme as
+    parquet bloom filter). Filter could say a value is absent, never that a value is present.
+    """
+
+    def __init__(self, blocks: numpy.ndarray, offsets: numpy.ndarray):
+        """Create bloom filter, blocks of row group i are blocks[offsets[i]:offsets[i + 1]]."""
+        self.blocks = blocks
+        self.offsets = offsets
+
+    @staticmethod
+    def hash(values: numpy.ndarray) -> numpy.ndarray:
+        """Mix bits of values with splitmix64 finalizer."""
+        hashes = numpy.asarray(values, dtype=numpy.uint64) + numpy.uint64(0x9E3779B97F4A7C15)
+        hashes = (hashes ^ (hashes >> numpy.uint64(30))) * numpy.uint64(0xBF58476D1CE4E5B9)
+        hashes = (hashes ^ (hashes >> numpy.uint64(27))) * numpy.uint64(0x94D049BB133111EB)
+        return hashes ^ (hashes >> numpy.uint64(31))
+
+    @staticmethod
+    def __block_and_mask(hashes: numpy.ndarray, number_of_blocks: int) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """Get index of block and bit mask of each word for each hash."""
+        block = ((hashes >> numpy.uint64(32)) * numpy.uint64(number_of_blocks)) >> numpy.uint64(32)
+        key = hashes.astype(numpy.uint32)
+        mask = numpy.left_shift(numpy.uint32(1), (key[:, None] * BLOOM_SALT) >> numpy.uint32(27))
+        return block.astype(numpy.int64), mask
+
+    @classmethod
+    def build(cls, row_groups: collections.abc.Iterable[numpy.ndarray], bits_per_value: int = 16) -> BloomFilter:
+        """Build filter of each row group values."""
+        all_blocks = []
+        offsets = [0]
+        for values in row_groups:
+            number_of_blocks = max(1, -(-len(values) * bits_per_value // 256))
+            blocks = numpy.zeros((number_of_blocks, 8), dtype=numpy.uint32)
+
+            block, mask = BloomFilter.__block_and_mask(BloomFilter.hash(values), number_of_blocks)
+            for word in range(8):
+                numpy.bitwise_or.at(blocks[:, word], block, mask[:, word])
+
+            all_blocks.append(blocks)
+            offsets.append(offsets[-1] + number_of_blocks)
+
+        blocks = numpy.concatenate(all_blocks) if all_blocks else numpy.zeros((0, 8), dtype=numpy.uint32)
+        return cls(blocks, numpy.array(offsets, dtype=numpy.int64))
+
+    def __len__(self) -> int:
+        """Get number of row groups."""
+        return len(self.offsets) - 1
+
+    def might_contain(self, values: numpy.ndarray) -> numpy.ndarray:
+        """Check which values could be present in each row group.
+
+        Return:
+          boolean array of shape (number of row groups, number of values)
+        """
+        hashes = BloomFilter.hash(values)
+        result = numpy.zeros((len(self), len(hashes)), dtype=bool)
+
+        for i in range(len(self)):
+            blocks = self.blocks[self.offsets[i] : self.offsets[i + 1]]
+            block, mask = BloomFilter.__block_and_mask(hashes, len(blocks))
+            result[i] = ((blocks[block] & mask) == mask).all(axis=1)
+
+        return result
+
+
+def build_bloom_filter(
+    path: pathlib.Path,
+    index: pathlib.Path,
+    column: str = "id",
+    bits_per_value: int = 16,
+) -> BloomFilter:
+    """Build bloom filter of column for each row group of parquet file and write it in index.
+
+    Parameters:
+      path: parquet file
+      index: path of npz file where filter is write
+      column: name of column indexed, must be an unsigned integer column
+      bits_per_value: size of filter, with 16 bits false positive rate is around 0.1%
+
+    Return:
+      bloom filter of file
+    """
+    parquet = pyarrow.parquet.ParquetFile(path)
+    bloom = BloomFilter.build(
+        (
+            parquet.read_row_group(i, columns=[column]).column(0).to_numpy()
+            for i in range(parquet.metadata.num_row_groups)
+        ),
+        bits_per_value,
+    )
+
+    key = _file_key(path)
+    index.parent.mkdir(parents=True, exist_ok=True)
+    with open(index, "wb") as fh_out:
+        numpy.savez(
+            fh_out,
+            blocks=bloom.blocks,
+            offsets=bloom.offsets,
+            key=numpy.array([key["size"], key["mtime_ns"]], dtype=numpy.int64),
+        )
+
+    return bloom
+
+
+def read_bloom_filter(path: pathlib.Path, index: pathlib.Path) -> BloomFilter | None:
+    """Read bloom filter of parquet file.
+
+    Return:
+      bloom filter, None if index didn't exist or parquet file change after index build.
+    """
+    if not index.is_file() or not path.is_file():
+        return None
+
+    with numpy.load(index) as data:
+        key = _file_key(path)
+        if data["key"].tolist() != [key["size"], key["mtime_ns"]]:
+            return None
+
+        return BloomFilter(data["blocks"], data["offsets"])
@@ -0,0 +1,310 @@
+"""Define LazyQuery, a chain of Sake operation run as one duckdb query."""
+
+from __future__ import annotations
+
+# std import
+import glob
+import re
+import typing
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import collections
+    import pathlib
+
+    import polars
+    import pyarrow
+
+    ToFiles: typing.TypeAlias = collections.abc.Callable[[list[typing.Any]], list[str]]
+    """Convert distinct values of previous steps in a list of files."""
+
+__all__: list[str] = ["LazyQuery"]
+
+
+TRANSMISSIONS_CAST = {
+    "gt": "UTINYINT",
+    "dp": "UINTEGER",
+    "gq": "UINTEGER",
+}
+
+
+class LazyQuery:
+    """Chain of Sake operation.
+
+    Each method return a new LazyQuery, nothing is read before `collect`, `to_arrow` or `sink_parquet` is call. All
+    step are merged in one duckdb query so projection and filter could reach parquet scan and no intermediate
+    DataFrame are materialized.
+
+    Genotypes partitions and transmissions files to read depends on ids and prescriptions of previous steps, they are
+    found just before run by a `select distinct` on previous steps.
+    """
+
+    def __init__(
+        self,
+        database: sake.Sake,
+        source: str | None = None,
+        params: dict[str, typing.Any] | None = None,
+        data: polars.DataFrame | None = None,
+        deferred: list[tuple[str, str, ToFiles]] | None = None,
+    ):
+        """Create a lazy query, if data is set query start from this DataFrame.
+
+        deferred contains parameter name, query and a function, at run time parameter is set, in order, to result of
+        function on values return by query.
+        """
+        self.database = database
+        self.data = data
+        self.params = {} if params is None else params
+        self.deferred = [] if deferred is None else deferred
+
+        if source is None and data is not None:
+            source = sake.QUERY["lazy_source"].format(source="_lazy_data")
+        self.source = source
+
+    @property
+    def sql(self) -> str:
+        """Get sql query."""
+        if self.source is None:
+            raise ValueError("LazyQuery have no source, start it with get_interval, all_variants, ...")
+        return self.source
+
+    def __param(self, params: dict[str, typing.Any], value: typing.Any) -> str:
+        """Register value as a query parameter and return its name."""
+        name = f"p{len(params)}"
+        params[name] = value
+        return name
+
+    def __chain(
+        self,
+        query_name: str,
+        values: dict[str, typing.Any],
+        files: tuple[str, str, ToFiles] | None = None,
+        **kwargs: str,
+    ) -> LazyQuery:
+        """Create a new LazyQuery, values are pass as parameter, kwargs are format in query.
+
+        If files is set, it's the name of a parameter, an expression on previous steps and a function that convert
+        distinct values of expression in a list of files, parameter is set at run time.
+        """
+        params = dict(self.params)
+        names = {key: self.__param(params, value) for key, value in values.items()}
+        deferred = list(self.deferred)
+
+        if "{source}" in sake.QUERY[query_name]:
+            kwargs["source"] = self.sql
+
+        if files is not None:
+            (key, expression, to_files) = files
+            names[key] = self.__param(params, None)
+            query = sake.QUERY["lazy_distinct"].format(expression=expression, source=self.sql)
+            deferred.append((names[key], query, to_files))
+
+        source = sake.QUERY[query_name].format(**names, **kwargs)
+
+        return LazyQuery(self.database, source, params, self.data, deferred)
+
+    def __existing(self, paths: list[pathlib.Path], pattern: str) -> list[str]:
+        """Keep paths present in sake.
+
+        read_parquet need at least one file, if no path exist first file match by pattern is used, its rows can't
+        match previous steps.
+        """
+        catalog = self.database.get_catalog()
+        existing = [str(path) for path in paths if catalog.is_file(path)]
+        if not existing:
+            existing = sorted(glob.glob(pattern))[:1] or [pattern]
+        return existing
+
+    # Source step
+    def all_variants(self) -> LazyQuery:
+        """Start from all variants of target."""
+        return self.__chain("lazy_all_variants", {"path": f"{self.database.variants_path}/*.parquet"})
+
+    def get_interval(self, chrom: str, start: int, stop: int) -> LazyQuery:
+        """Start from variants of chromosome between start and stop."""
+        return self.__chain(
+            "lazy_get_interval",
+            {
+                "path": str(self.database.variants_path / f"{chrom}.parquet"),  # type: ignore[operator]
+                "chrom": chrom,
+                "start": start,
+                "stop": stop,
+            },
+        )
+
+    def get_variant_of_prescription(self, prescription: str) -> LazyQuery:
+        """Start from all variants of a prescription."""
+        return self.__chain(
+            "lazy_get_variant_of_prescription",
+            {
+                "sample_path": str(self.database.prescriptions_path / f"{prescription}.parquet"),  # type: ignore[operator]
+                "variant_path": f"{self.database.variants_path}/*.parquet",
+            },
+        )
+
+    # Transformation step
+    def add_variants(self) -> LazyQuery:
+        """Use id column to add variant information."""
+        return self.__chain("lazy_add_variants", {"path": f"{self.database.variants_path}/*.parquet"})
+
+    def add_genotypes(self, *, select_columns: list[str] | None = None, number_of_bits: int = 8) -> LazyQuery:
+        """Add genotype information, see [Sake.add_genotypes][sake.Sake.add_genotypes].
+
+        Only partitions of ids of previous steps are read, see [add_id_part][sake.utils.add_id_part].
+        """
+        if select_columns is None:
+            select_columns = self.database.genotype_columns
+
+        columns = ["g.sample"]
+        for column in select_columns:  # type: ignore[union-attr]
+            if column == "ad":
+                columns.append("array_to_string(g.ad, ',') as ad")
+            else:
+                columns.append(f"g.{sake._utils.quote_identifier(column)}")
+
+        partitions_path = self.database.partitions_path
+
+        def to_files(id_parts: list[int | None]) -> list[str]:
+            return self.__existing(
+                [
+                    partitions_path / f"id_part={id_part}" / "0.parquet"  # type: ignore[operator]
+                    for id_part in sorted(id_part for id_part in id_parts if id_part is not None)
+                ],
+                f"{partitions_path}/*/0.parquet",
+            )
+
+        # same value as utils.add_id_part, hashed ids (bit 63 set) are in last partition
+        id_part = f"""case when v.id >= {2**63}::UBIGINT then {2**number_of_bits - 1}
+        else v.id >> {63 - number_of_bits} end"""
+
+        return self.__chain(
+            "lazy_add_genotypes",
+            {},
+            ("path", f"{id_part}::UBIGINT", to_files),
+            columns=", ".join(columns),
+        )
+
+    def add_annotations(
+        self,
+        name: str,
+        version: str,
+        *,
+        rename_column: bool = True,
+        select_columns: list[str] | None = None,
+        chrom_basename: str = "1",
+    ) -> LazyQuery:
+        """Add annotations, see [Sake.add_annotations][sake.Sake.add_annotations].
+
+        If annotations can't be found, query isn't change.
+        """
+        annotation_path_result = self.database.get_catalog().fix_annotation_path(
+            self.database.annotations_path,  # type: ignore[arg-type]
+            name,
+            version,
+            self.database.preindication,
+            chrom_basename=chrom_basename,
+        )
+        if annotation_path_result is None:
+            return self
+        (annotation_path, split_by_chr) = annotation_path_result
+
+        schema = sake.metadata.parquet_schema(annotation_path)
+        columns = [
+            f"a.{sake._utils.quote_identifier(col)} as {sake._utils.quote_identifier(f'{name}_{col}')}"
+            if rename_column
+            else f"a.{sake._utils.quote_identifier(col)}"
+            for col in schema
+            if col != "id" and (select_columns is None or col in select_columns)
+        ]
+
+        path = f"{annotation_path.parent}/*.parquet" if split_by_chr else str(annotation_path)
+
+        return self.__chain("lazy_add_annotations", {"path": path}, columns=", ".join(columns))
+
+    def add_sample_info(self, *, select_columns: list[str] | None = None) -> LazyQuery:
+        """Add sample information, see [Sake.add_sample_info][sake.Sake.add_sample_info]."""
+        schema = sake.metadata.parquet_schema(self.database.samples_path)  # type: ignore[arg-type]
+
+        if select_columns is None:
+            select_columns = [col for col in schema if col != "sample"]
+
+        columns = ",".join([f"s.{sake._utils.quote_identifier(col)}" for col in schema if col in select_columns])
+
+        return self.__chain("lazy_add_sample_info", {"path": str(self.database.samples_path)}, columns=columns)
+
+    def add_transmissions(self, *, select_columns: list[str] | None = None) -> LazyQuery:
+        """Add transmissions information, see [Sake.add_transmissions][sake.Sake.add_transmissions]."""
+        if select_columns is None:
+            select_columns = [
+                f"{prefix}_{suffix}"
+                for suffix in self.database.genotype_columns  # type: ignore[union-attr]
+                for prefix in ["index", "father", "mother"]
+            ]
+
+        columns = []
+        for column in select_columns:
+            suffix = column.rsplit("_", 1)[-1]
+            name = sake._utils.quote_identifier(column)
+            if suffix == "ad":
+                columns.append(f"array_to_string(t.{name}, ',') as {name}")
+            elif suffix in TRANSMISSIONS_CAST:
+                columns.append(f"t.{name}::{TRANSMISSIONS_CAST[suffix]} as {name}")
+            else:
+                columns.append(f"t.{name}")
+        columns.append("t.origin")
+
+        transmissions_path = self.database.transmissions_path
+
+        def to_files(pids: list[str | None]) -> list[str]:
+            return self.__existing(
+                [transmissions_path / f"{pid}.parquet" for pid in sorted(pid for pid in pids if pid is not None)],  # type: ignore[operator]
+                f"{transmissions_path}/*.parquet",
+            )
+
+        return self.__chain(
+            "lazy_add_transmissions",
+            {},
+            ("path", "v.pid_crc", to_files),
+            columns=", ".join(columns),
+        )
+
+    def filter(self, condition: str) -> LazyQuery:
+        """Keep only row that match condition, a duckdb sql expression."""
+        return self.__chain("lazy_filter", {}, condition=condition)
+
+    def select(self, *columns: str) -> LazyQuery:
+        """Keep only columns."""
+        return self.__chain("lazy_select", {}, columns=", ".join(columns))
+
+    # Collect step
+    def __execute(self, query: str) -> typing.Any:
+        """Run query, input DataFrame is visible as _lazy_data.
+
+        Deferred parameters are compute before, each one with parameters used by its query.
+        """
+        _lazy_data = self.data  # used by duckdb replacement scan
+        connection = self.database._connection()
+
+        params = dict(self.params)
+        for name, keys_query, to_files in self.deferred:
+            used = {key: params[key] for key in re.findall(r"\$(p\d+)\b", keys_query)}
+            keys = [row[0] for row in connection.execute(keys_query, used).fetchall()]
+            params[name] = to_files(keys)
+
+        return connection.execute(query, params)
+
+    def collect(self) -> polars.DataFrame:
+        """Run query and get result as polars.DataFrame."""
+        return self.__execute(self.sql).pl()
+
+    def to_arrow(self) -> pyarrow.Table:
+        """Run query and get result as pyarrow.Table."""
+        return sake._utils.fetch_arrow_table(self.__execute(self.sql))
+
+    def sink_parquet(self, path: pathlib.Path | str) -> None:
+        """Run query and write result in a parquet file."""
+        escape_path = str(path).replace("'", "''")
+        self.__execute(f"COPY ({self.sql}) TO '{escape_path}' (FORMAT parquet)")
@@ -0,0 +1,163 @@
+"""Define process wide cache of file and parquet metadata.
+
+Parquet metadata are keyed by (path, size, mtime), file is stat at each call so a rewrite invalidate them. File
+existence and size are kept STAT_TTL seconds, a file created or removed is seen after this delay.
+"""
+
+from __future__ import annotations
+
+# std import
+import collections
+import os
+import stat
+import threading
+import time
+import typing
+
+# 3rd party import
+import polars
+import pyarrow.parquet
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import pathlib
+
+__all__: list[str] = [
+    "LRUCache",
+    "clear",
+    "file_stat",
+    "is_file",
+    "parquet_metadata",
+    "parquet_schema",
+]
+
+# number of second a file stat is kept
+STAT_TTL = 5.0
+
+# maximal number of file in each cache
+MAX_SIZE = 4096
+
+
+class LRUCache:
+    """Thread safe mapping that drop least recently used element when maxsize is reached.
+
+    If max_weight is set, element are also drop when sum of element weight (compute by weigher) is upper than
+    max_weight, an element heavier than max_weight isn't store.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = MAX_SIZE,
+        max_weight: int | None = None,
+        weigher: collections.abc.Callable[[typing.Any], int] | None = None,
+    ):
+        """Create an empty cache."""
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.hits = 0
+        self.misses = 0
+        self.weight = 0
+        self.__data: collections.OrderedDict[typing.Hashable, tuple[typing.Any, int]] = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        """Get value associate to key and mark it as recently used."""
+        with self.__lock:
+            if key not in self.__data:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self.__data.move_to_end(key)
+            return self.__data[key][0]
+
+    def set(self, key: typing.Hashable, value: typing.Any) -> None:
+        """Associate value to key, least recently used element are drop if cache is full."""
+        weight = 0 if self.weigher is None else self.weigher(value)
+
+        with self.__lock:
+            if key in self.__data:
+                self.weight -= self.__data.pop(key)[1]
+            if self.max_weight is not None and weight > self.max_weight:
+                return
+
+            self.__data[key] = (value, weight)
+            self.weight += weight
+            while len(self.__data) > self.maxsize or (self.max_weight is not None and self.weight > self.max_weight):
+                self.weight -= self.__data.popitem(last=False)[1][1]
+
+    def clear(self) -> None:
+        """Remove all element and reset counter."""
+        with self.__lock:
+            self.__data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.weight = 0
+
+
+_STATS = LRUCache()
+_METADATA = LRUCache()
+_SCHEMAS = LRUCache()
+
+
+def clear() -> None:
+    """Empty all metadata cache."""
+    _STATS.clear()
+    _METADATA.clear()
+    _SCHEMAS.clear()
+
+
+def file_stat(path: pathlib.Path | str, max_age: float = STAT_TTL) -> tuple[int, int] | None:
+    """Get size and mtime (in ns) of a file.
+
+    Parameters:
+      path: path of file
+      max_age: a cached value older than max_age second isn't used
+
+    Return:
+      size and mtime, None if path isn't a file.
+    """
+    now = time.monotonic()
+    cached = _STATS.get(str(path))
+    if cached is not None and now - cached[0] < max_age:
+        return cached[1]
+
+    try:
+        result = os.stat(path)
+        key = (result.st_size, result.st_mtime_ns) if stat.S_ISREG(result.st_mode) else None
+    except OSError:
+        key = None
+
+    _STATS.set(str(path), (now, key))
+    return key
+
+
+def is_file(path: pathlib.Path | str) -> bool:
+    """Check if path is a file."""
+    return file_stat(path) is not None
+
+
+def parquet_metadata(path: pathlib.Path | str) -> pyarrow.parquet.FileMetaData:
+    """Get parquet footer of file."""
+    key = (str(path), file_stat(path, max_age=0))
+    metadata = _METADATA.get(key)
+    if metadata is None:
+        metadata = pyarrow.parquet.ParquetFile(path).metadata
+        _METADATA.set(key, metadata)
+
+    return metadata
+
+
+def parquet_schema(path: pathlib.Path | str) -> dict[str, polars.DataType]:
+    """Get polars schema of parquet file, result could be modified by caller."""
+    key = (str(path), file_stat(path, max_age=0))
+    schema = _SCHEMAS.get(key)
+    if schema is None:
+        schema = dict(polars.read_parquet_schema(path))
+        _SCHEMAS.set(key, schema)
+
+    return dict(schema)
@@ -2,20 +2,32 @@
 
 from __future__ import annotations
 
-import dataclasses
-
 # std import
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
+import inspect
+import json
 import multiprocessing
 import os
 import pathlib
+import threading
+import typing
+import weakref
 
 # 3rd party import
 import duckdb
 import polars
+import pyarrow
 
 # project import
 import sake
 
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import collections
+
 __all__: list[str] = ["Sake"]
 
 
@@ -23,6 +35,7 @@ DEFAULT_PATH = {
     "aggregations_path": "aggregations",
     "annotations_path": "annotations",
     "cnv_path": pathlib.Path("{target}") / "cnv",
+    "index_path": pathlib.Path("{target}") / "index",
     "partitions_path": pathlib.Path("{target}") / "genotypes" / "partitions",
     "prescriptions_path": pathlib.Path("{target}") / "genotypes" / "samples",
     "samples_path": pathlib.Path("samples") / "patients.parquet",
@@ -33,6 +46,103 @@ DEFAULT_PATH = {
 }
 
 
+OUTPUTS = ("polars", "arrow", "reader", "relation")
+RECURRENCE_SCHEMA = {
+    "id": polars.UInt64,
+    "sake_AC": polars.Int64,
+    "sake_nhomalt": polars.Int64,
+    "sake_carriers": polars.UInt32,
+}
+VARIANTS_SCHEMA = {
+    "id": polars.UInt64,
+    "chr": polars.String,
+    "pos": polars.UInt64,
+    "ref": polars.String,
+    "alt": polars.String,
+}
+EXECUTORS = ("thread", "process")
+
+
+def _estimated_size(value: typing.Any) -> int:
+    """Estimate memory size of in memory cache value."""
+    if isinstance(value, polars.DataFrame):
+        return int(value.estimated_size())
+    return 64
+
+
+def _input_rows(args: tuple[typing.Any, ...], kwargs: dict[str, typing.Any]) -> int | None:
+    """Get number of row of first DataFrame or Series in method arguments."""
+    for value in (*args, *kwargs.values()):
+        if isinstance(value, polars.DataFrame):
+            return value.height
+        if isinstance(value, polars.Series):
+            return value.len()
+    return None
+
+
+def _record_stats(method: collections.abc.Callable[..., typing.Any]) -> collections.abc.Callable[..., typing.Any]:
+    """Record statistics of a Sake method call in Sake.last_stats and send them to Sake.stats_callbacks.
+
+    Statistics are record even if method fail, method call by an other method is part of outer method statistics.
+    Statistics of a generator are record when it's exhausted or close.
+    """
+
+    def publish(self: Sake, stats: sake.stats.CallStats) -> None:
+        self.last_stats = stats
+        for callback in self.stats_callbacks:
+            callback(stats)
+
+    if inspect.isgeneratorfunction(method):
+
+        @functools.wraps(method)
+        def generator_wrapper(self: Sake, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            if self._call_stats() is not None:
+                yield from method(self, *args, **kwargs)
+                return
+
+            stats = sake.stats.CallStats(name=method.__name__, rows_in=_input_rows(args, kwargs))
+            rows = 0
+            generator = method(self, *args, **kwargs)
+            try:
+                while True:
+                    # generator could be consumed in other thread, statistics are only visible during next
+                    self._stats_local.call = stats
+                    try:
+                        value = next(generator)
+                    except StopIteration:
+                        break
+                    finally:
+                        self._stats_local.call = None
+                    rows += sake.stats.row_count(value) or 0
+                    yield value
+            finally:
+                generator.close()
+                stats.finish()
+                stats.rows_out = rows
+                publish(self, stats)
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self: Sake, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        if self._call_stats() is not None:
+            return method(self, *args, **kwargs)
+
+        stats = sake.stats.CallStats(name=method.__name__, rows_in=_input_rows(args, kwargs))
+        self._stats_local.call = stats
+        result = None
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            self._stats_local.call = None
+            stats.finish(result)
+            publish(self, stats)
+
+        return result
+
+    return wrapper
+
+
 @dataclasses.dataclass(kw_only=True)
 class Sake:
     """Class that help user to extract variants from sake."""
@@ -44,11 +154,14 @@ class Sake:
     # Optional member
     threads: int | None = dataclasses.field(default=os.cpu_count())
     activate_tqdm: bool | None = dataclasses.field(default=False)
+    output: str = dataclasses.field(default="polars")
+    executor: str = dataclasses.field(default="thread")
 
     # Optional member generate from sake_path
     aggregations_path: pathlib.Path | None = None
     annotations_path: pathlib.Path | None = None
     cnv_path: pathlib.Path | None = None
+    index_path: pathlib.Path | None = None
     partitions_path: pathlib.Path | None = None
     prescriptions_path: pathlib.Path | None = None
     samples_path: pathlib.Path | None = None
@@ -57,15 +170,105 @@ class Sake:
     variants_path: pathlib.Path | None = None
     genotype_columns: list[str] | None = None
 
+    # json manifest of catalog, if None catalog is build in memory at first use
+    catalog_path: pathlib.Path | None = None
+
+    # directory of persistent result cache, if None result aren't cached
+    cache_path: pathlib.Path | None = None
+    cache_max_size: int = 10 * 2**30
+
+    # size in bytes of in memory cache, if 0 nothing is kept in memory
+    memory_cache_size: int = 0
+
+    # function call with statistics of each method call, see sake.stats
+    stats_callbacks: list[collections.abc.Callable[[sake.stats.CallStats], None]] = dataclasses.field(
+        default_factory=list,
+    )
+    # add duckdb profile of query run by worker in statistics
+    profile: bool = False
+
+    # statistics of last method call
+    last_stats: sake.stats.CallStats | None = dataclasses.field(default=None, init=False, repr=False, compare=False)
+
     # duckdb connection
     db: duckdb.DuckDBPyConnection = dataclasses.field(init=False, repr=False)
 
+    # worker pool of each number of workers used when read_threads > 1, start at first parallel read
+    _executors: dict[int, tuple[concurrent.futures.Executor, weakref.finalize]] = dataclasses.field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    _executor_lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    # thread that create object use db, other threads use their own cursor
+    _owner_thread: int = dataclasses.field(default_factory=threading.get_ident, init=False, repr=False, compare=False)
+    _cursors: threading.local = dataclasses.field(
+        default_factory=threading.local,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    # variants id locator, load at first use
+    _locator: sake.index.Locator | None = dataclasses.field(default=None, init=False, repr=False, compare=False)
+
+    # samples information with integer key and file key, load at first use
+    _samples: tuple[tuple[int, int] | None, polars.DataFrame, polars.Series] | None = dataclasses.field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    # persistent result cache, create in __post_init__ if cache_path is set
+    _result_cache: sake.cache.ResultCache | None = dataclasses.field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    # in memory cache, create in __post_init__ if memory_cache_size is upper than 0
+    _memory_cache: sake.metadata.LRUCache | None = dataclasses.field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    # list of sake files, build at first use
+    _catalog: sake.catalog.SakeCatalog | None = dataclasses.field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    # statistics of method call in progress in each thread
+    _stats_local: threading.local = dataclasses.field(
+        default_factory=threading.local,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
     def __post_init__(self):
+        if self.output not in OUTPUTS:
+            raise ValueError(f"output must be one of {OUTPUTS} not {self.output}")
+        if self.executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS} not {self.executor}")
+
         self.db = duckdb.connect(
             ":memory:",
         )
-        self.db.query("SET enable_progress_bar = false;")
-        self.db.query(f"SET threads TO {self.threads};")
+        sake._utils.configure_connection(self.db, self.threads)
         os.environ["POLARS_MAX_THREADS"] = str(self.threads)
 
         for key, value in DEFAULT_PATH.items():
@@ -79,6 +282,470 @@ class Sake:
                 else:
                     self.__setattr__(key, value)
 
+        if self.cache_path is not None:
+            self._result_cache = sake.cache.ResultCache(self.cache_path, self.cache_max_size)
+        if self.memory_cache_size > 0:
+            self._memory_cache = sake.metadata.LRUCache(
+                max_weight=self.memory_cache_size,
+                weigher=_estimated_size,
+            )
+
+    def __enter__(self) -> Sake:  # noqa: PYI034
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shutdown worker pools.
+
+        Object stay usable, a new pool is started at next parallel read.
+        """
+        with self._executor_lock:
+            for _, finalizer in self._executors.values():
+                finalizer()
+
+            self._executors = {}
+
+    def _get_executor(self, workers: int) -> concurrent.futures.Executor:
+        """Get worker pool with workers threads or processes, pool is created at first call and reused after.
+
+        Thread workers query Sake database with their own cursor, data and result aren't copied, all cursors share
+        the `threads` duckdb threads of database. Process workers have their own database, data and result are
+        pickled between processes. There is one pool by number of workers, so call with different read_threads could
+        run at same time in different threads.
+        """
+        with self._executor_lock:
+            if workers not in self._executors:
+                executor: concurrent.futures.Executor
+                if self.executor == "thread":
+                    executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=workers,
+                        initializer=sake._utils.set_thread_cursor,
+                        initargs=(self.db,),
+                    )
+                else:
+                    executor = concurrent.futures.ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=sake._utils.get_connection,
+                        initargs=(self._worker_threads(workers),),
+                    )
+                # pool is shutdown when object is garbage collected or at interpreter exit
+                self._executors[workers] = (executor, weakref.finalize(self, executor.shutdown, wait=True))
+
+            return self._executors[workers][0]
+
+    def _worker_threads(self, workers: int) -> int:
+        """Get number of duckdb threads of each worker when workers read at same time.
+
+        Thread workers are cursors of db, duckdb thread pool is a database setting shared by all cursors, so they
+        get all threads. Process workers split threads, at least one by process, same value is used to warm their
+        connection and by queries, so queries reuse warmed connection.
+        """
+        if self.executor == "thread":
+            return self.threads  # type: ignore[return-value]
+        return max(self.threads // workers, 1)  # type: ignore[operator]
+
+    def _connection(self) -> duckdb.DuckDBPyConnection:
+        """Get duckdb connection of current thread.
+
+        A duckdb connection couldn't run queries of multiple threads at same time, thread that create object use db
+        and other threads use their own cursor on db, so methods could be call from multiple threads.
+        """
+        cursor = getattr(self._cursors, "override", None)
+        if cursor is not None:
+            return cursor
+
+        if threading.get_ident() == self._owner_thread:
+            return self.db
+
+        cursor = getattr(self._cursors, "cursor", None)
+        if cursor is None:
+            cursor = self._cursors.cursor = self.db.cursor()
+            sake._utils.configure_connection(cursor)
+
+        return cursor
+
+    @contextlib.contextmanager
+    def _use_connection(self, cursor: duckdb.DuckDBPyConnection) -> collections.abc.Generator[None, None, None]:
+        """Run queries of current thread on cursor during block.
+
+        Queries of method and queries run without worker pool (read_threads == 1) use cursor, queries run by worker
+        pool keep their own connection.
+        """
+        previous = getattr(self._cursors, "override", None)
+        self._cursors.override = cursor
+        try:
+            with sake._utils.use_cursor(cursor):
+                yield
+        finally:
+            self._cursors.override = previous
+
+    def _memory_key(
+        self,
+        name: str,
+        arguments: dict[str, typing.Any],
+        frames: collections.abc.Iterable[polars.DataFrame] = (),
+        paths: collections.abc.Iterable[pathlib.Path] = (),
+    ) -> tuple[typing.Any, ...] | None:
+        """Compute key of in memory cache, None if in memory cache isn't active.
+
+        Files size and mtime are part of key, a file change is seen after sake.metadata.STAT_TTL seconds.
+        """
+        if self._memory_cache is None:
+            return None
+
+        return (
+            name,
+            json.dumps(arguments, sort_keys=True, default=str),
+            tuple(sake.cache.frame_digest(frame) for frame in frames),
+            tuple((str(path), sake.metadata.file_stat(path)) for path in paths),
+        )
+
+    def _cached(
+        self,
+        name: str,
+        arguments: dict[str, typing.Any],
+        frames: collections.abc.Sequence[polars.DataFrame],
+        paths: collections.abc.Sequence[pathlib.Path] | collections.abc.Callable[[], list[pathlib.Path]],
+        function: collections.abc.Callable[[], polars.DataFrame | duckdb.DuckDBPyRelation],
+    ) -> polars.DataFrame | duckdb.DuckDBPyRelation:
+        """Get result of function from in memory cache or result cache, else run function and store its result.
+
+        Paths could be a function, it's call only if a cache is active.
+        """
+        if self._memory_cache is None and self._result_cache is None:
+            return function()
+
+        with self._stage("cache"):
+            if callable(paths):
+                paths = paths()
+
+            memory_key = self._memory_key(name, arguments, frames, paths)
+            if memory_key is not None:
+                result = self._memory_cache.get(memory_key)  # type: ignore[union-attr]
+                if result is not None:
+                    return result
+
+        result = None
+        if self._result_cache is not None:
+            with self._stage("cache"):
+                key = sake.cache.ResultCache.key(name, arguments, frames, paths)
+                result = self._result_cache.get(key)
+            if result is None:
+                computed = function()
+                result = computed if isinstance(computed, polars.DataFrame) else computed.pl()
+                with self._stage("cache"):
+                    self._result_cache.set(key, result)
+
+        if memory_key is None:
+            return function() if result is None else result
+
+        if result is None:
+            computed = function()
+            result = computed if isinstance(computed, polars.DataFrame) else computed.pl()
+        self._memory_cache.set(memory_key, result)  # type: ignore[union-attr]
+
+        return result
+
+    def cache_clear(self) -> None:
+        """Remove all results of in memory cache and result cache."""
+        if self._memory_cache is not None:
+            self._memory_cache.clear()
+        if self._result_cache is not None:
+            self._result_cache.clear()
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """Get hits, misses and size in bytes of in memory cache and result cache, only active cache are present."""
+        stats = {}
+        if self._memory_cache is not None:
+            stats["memory"] = {
+                "hits": self._memory_cache.hits,
+                "misses": self._memory_cache.misses,
+                "entries": len(self._memory_cache),
+                "size": self._memory_cache.weight,
+            }
+        if self._result_cache is not None:
+            stats["disk"] = {
+                "hits": self._result_cache.hits,
+                "misses": self._result_cache.misses,
+                "size": self._result_cache.size(),
+            }
+
+        return stats
+
+    def _call_stats(self) -> sake.stats.CallStats | None:
+        """Get statistics of method call in progress in current thread, None if no call is in progress."""
+        return getattr(self._stats_local, "call", None)
+
+    @contextlib.contextmanager
+    def _stage(self, name: str) -> collections.abc.Generator[None, None, None]:
+        """Record a stage in statistics of method call in progress."""
+        stats = self._call_stats()
+        if stats is None:
+            yield
+            return
+
+        with stats.stage(name):
+            yield
+
+    def _record_file(self, path: pathlib.Path | str, row_groups: list[int] | None = None) -> None:
+        """Record a parquet file read directly by a method in statistics of method call in progress."""
+        stats = self._call_stats()
+        if stats is not None and sake.metadata.is_file(path):
+            stats.add_file(path, sake.stats.parquet_bytes(path, row_groups))
+
+    def _target_template(self, key: str) -> str:
+        """Get default path of key (e.g. `variants_path`) for any preindication, `{}` is replaced by preindication."""
+        return str(self.sake_path / str(DEFAULT_PATH[key]).format(target="{}"))
+
+    def _preindications(self, preindications: str | list[str]) -> list[str]:
+        """Get list of preindications, `"*"` is all preindications with a variants directory in sake_path."""
+        if preindications == "*":
+            template = self._target_template("variants_path")
+            result = sorted(
+                entry.name
+                for entry in os.scandir(self.sake_path)
+                if entry.is_dir() and os.path.isdir(template.format(entry.name))
+            )
+        elif isinstance(preindications, str):
+            result = [preindications]
+        else:
+            result = list(preindications)
+
+        if not result:
+            raise ValueError(f"no preindication found for {preindications}")
+
+        return result
+
+    def _annotation_path(self, name: str, version: str, chrom_basename: str = "1") -> tuple[pathlib.Path, bool] | None:
+        """Find annotation path in catalog, result is kept in in memory cache."""
+        memory_key = self._memory_key(
+            "annotation_path",
+            {"name": name, "version": version, "chrom_basename": chrom_basename},
+        )
+        if memory_key is not None:
+            result = self._memory_cache.get(memory_key, False)  # type: ignore[union-attr]
+            if result is not False:
+                return result
+
+        result = self.get_catalog().fix_annotation_path(
+            self.annotations_path,  # type: ignore[arg-type]
+            name,
+            version,
+            self.preindication,
+            chrom_basename=chrom_basename,
+        )
+        if memory_key is not None:
+            self._memory_cache.set(memory_key, result)  # type: ignore[union-attr]
+
+        return result
+
+    def get_catalog(self) -> sake.catalog.SakeCatalog:
+        """Get catalog of sake files.
+
+        At first call catalog is read from catalog_path if it exist. Variants, annotations, genotypes partitions,
+        prescriptions and transmissions directories are walk at first lookup of a file inside them (and catalog is
+        save in catalog_path if set). Files existence and directory content are after answered from catalog, if sake
+        content change call [refresh_catalog][sake.Sake.refresh_catalog].
+        """
+        if self._catalog is None:
+            if self.catalog_path is not None and self.catalog_path.is_file():
+                self._catalog = sake.catalog.SakeCatalog.load(self.sake_path, self.catalog_path)
+                self._catalog.manifest = self.catalog_path
+            else:
+                self.__build_catalog()
+
+        return self._catalog  # type: ignore[return-value]
+
+    def refresh_catalog(self) -> sake.catalog.SakeCatalog:
+        """Build a new catalog, sake directories are walk again when needed and catalog is save in catalog_path if set.
+
+        In memory cache is cleared.
+        """
+        if self._memory_cache is not None:
+            self._memory_cache.clear()
+
+        return self.__build_catalog()
+
+    def __build_catalog(self) -> sake.catalog.SakeCatalog:
+        """Build an empty catalog of sake directories and save it in catalog_path if set."""
+        self._catalog = sake.catalog.SakeCatalog(
+            self.sake_path,
+            [
+                self.variants_path,  # type: ignore[list-item]
+                self.annotations_path,  # type: ignore[list-item]
+                self.partitions_path,  # type: ignore[list-item]
+                self.prescriptions_path,  # type: ignore[list-item]
+                self.transmissions_path,  # type: ignore[list-item]
+            ],
+            manifest=self.catalog_path,
+        )
+        if self.catalog_path is not None:
+            self._catalog.save(self.catalog_path)
+
+        return self._catalog
+
+    def _get_samples(self) -> tuple[polars.DataFrame, polars.Series]:
+        """Get samples information and list of samples, file is read again only if it change.
+
+        Samples information have a `__sample_key` column, index of sample in list of samples.
+        """
+        key = sake.metadata.file_stat(self.samples_path, max_age=0)  # type: ignore[arg-type]
+        if self._samples is None or self._samples[0] != key:
+            samples = polars.read_parquet(self.samples_path)  # type: ignore[arg-type]
+            names = samples.get_column("sample").unique(maintain_order=True)
+            samples = samples.with_columns(
+                polars.col("sample")
+                .replace_strict(names, polars.int_range(names.len(), dtype=polars.UInt32, eager=True))
+                .alias("__sample_key"),
+            )
+            self._samples = (key, samples, names)
+
+        return (self._samples[1], self._samples[2])
+
+    def _get_locator(self) -> sake.index.Locator | None:
+        """Get variants id locator, None if locator didn't exist or isn't up to date."""
+        directory = self.index_path / "locator"  # type: ignore[operator]
+        paths = self.get_catalog().get_chromosome_path(self.variants_path)  # type: ignore[arg-type]
+        if not sake.index.Locator.is_fresh(directory, paths):
+            self._locator = None
+            return None
+
+        if self._locator is None:
+            self._locator = sake.index.Locator(directory)
+
+        return self._locator
+
+    def _map(
+        self,
+        function: collections.abc.Callable[[typing.Any], typing.Any],
+        iterator: collections.abc.Iterable[typing.Any],
+        read_threads: int,
+    ) -> list[typing.Any]:
+        """Apply function on each element of iterator, in worker pool if read_threads > 1.
+
+        If function have a `run` method (QueryByGroupBy, QueryByParams), its statistics are added to method call in
+        progress.
+        """
+        run = getattr(function, "run", None)
+        if run is None:
+            with self._stage("queries"):
+                if read_threads == 1:
+                    return list(map(function, iterator))
+                return list(self._get_executor(read_threads).map(function, iterator))
+
+        with self._stage("queries"):
+            if read_threads == 1:
+                results = list(map(run, iterator))
+            else:
+                results = list(self._get_executor(read_threads).map(run, iterator))
+
+        stats = self._call_stats()
+        if stats is not None:
+            for _, query_stats in results:
+                stats.add_query(query_stats)
+
+        return [result for result, _ in results]
+
+    def _imap(
+        self,
+        function: collections.abc.Callable[[typing.Any], typing.Any],
+        iterator: collections.abc.Iterable[typing.Any],
+        read_threads: int,
+        *,
+        in_flight: int | None = None,
+    ) -> collections.abc.Generator[typing.Any, None, None]:
+        """Lazily apply function on each element of iterator, result are yield in order of completion.
+
+        At most in_flight (default read_threads) element are submit to worker pool and not yet yield. Like in
+        [_map][sake.Sake._map] statistics of function with a `run` method are added to method call in progress.
+        """
+        run = getattr(function, "run", None)
+        if run is not None:
+            for result, query_stats in self._imap(run, iterator, read_threads, in_flight=in_flight):
+                stats = self._call_stats()
+                if stats is not None:
+                    stats.add_query(query_stats)
+                yield result
+            return
+
+        if read_threads == 1:
+            yield from map(function, iterator)
+            return
+
+        executor = self._get_executor(read_threads)
+        in_flight = read_threads if in_flight is None else max(in_flight, 1)
+
+        pending: set[concurrent.futures.Future] = set()
+        try:
+            for element in iterator:
+                pending.add(executor.submit(function, element))
+                while len(pending) >= in_flight:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            # generator is close before end, didn't run remaining element
+            for future in pending:
+                future.cancel()
+
+    def _output(
+        self,
+        result: polars.DataFrame | duckdb.DuckDBPyRelation,
+        output: str | None,
+    ) -> sake._utils.Output:
+        """Convert result of a method in output format, if output is None Sake.output is used."""
+        output = self.output if output is None else output
+        if output not in OUTPUTS:
+            raise ValueError(f"output must be one of {OUTPUTS} not {output}")
+
+        with self._stage("output"):
+            return self.__convert(result, output)
+
+    def __convert(
+        self,
+        result: polars.DataFrame | duckdb.DuckDBPyRelation,
+        output: str,
+    ) -> sake._utils.Output:
+        """Convert result in output format."""
+        if isinstance(result, polars.DataFrame):
+            if output == "polars":
+                return result
+
+            table = result.to_arrow()
+            if output == "arrow":
+                return table
+            if output == "reader":
+                return pyarrow.RecordBatchReader.from_batches(table.schema, table.to_batches())
+            return self._connection().from_arrow(table)
+
+        if output == "polars":
+            return result.pl()
+        if output == "arrow":
+            return sake._utils.fetch_arrow_table(result)
+        if output == "reader":
+            return sake._utils.fetch_arrow_reader(result)
+        return result
+
+    def query(self, data: polars.DataFrame | None = None) -> sake.LazyQuery:
+        """Start a lazy query, see [LazyQuery][sake.LazyQuery].
+
+        Parameters:
+          data: DataFrame use as query source, if None query must start by a source step (get_interval, all_variants, ...)
+
+        Return:
+          A lazy query, nothing is read before `collect`, `to_arrow` or `sink_parquet` is call.
+        """
+        return sake.LazyQuery(self, data=data)
+
+    @_record_stats
     def add_annotations(
         self,
         variants: polars.DataFrame,
@@ -89,7 +756,8 @@ class Sake:
         select_columns: list[str] | None = None,
         read_threads: int = 1,
         chrom_basename: str | None = None,
-    ) -> polars.DataFrame:
+        output: str | None = None,
+    ) -> sake._utils.Output:
         """Add annotations to variants.
 
         Require `id` column in variants value.
@@ -101,6 +769,7 @@ class Sake:
           rename_column: prefix annotations column name with annotations name
           select_columns: name of annotations column (same as is in annotations file) you want add to your DataFrame, if None all column are added
           chrom_basename: basename of annotation filename use to detect format annotation file directory struct. If value is not set, function try to detect it automagicly.
+          output: format of result (polars, arrow, reader or relation), if None Sake.output is used
 
         Return:
           DataFrame with annotations column.
@@ -110,63 +779,162 @@ class Sake:
             # chromosome column is present get first value or try default value
             chrom_basename = str(variants.get_column("chr").first()) if "chr" in variants.schema else "1"
 
-        annotation_path_result = sake._utils.fix_annotation_path(
-            self.annotations_path,  # type: ignore[arg-type]
-            name,
-            version,
-            self.preindication,
-            chrom_basename=chrom_basename,
-        )
+        annotation_path_result = self._annotation_path(name, version, chrom_basename)
         if annotation_path_result is not None:
             (annotation_path, split_by_chr) = annotation_path_result
         else:
             # No annotations path return input
-            return variants
+            return self._output(variants, output)
 
-        schema = polars.read_parquet_schema(annotation_path)
+        schema = sake.metadata.parquet_schema(annotation_path)
         if "id" in schema:
             del schema["id"]
-        columns = ",".join([f"a.{col}" for col in schema if select_columns is None or col in select_columns])
+        columns = ",".join(
+            [
+                f"a.{sake._utils.quote_identifier(col)} as {sake._utils.quote_identifier(f'{name}_{col}')}"
+                if rename_column
+                else f"a.{sake._utils.quote_identifier(col)}"
+                for col in schema
+                if select_columns is None or col in select_columns
+            ],
+        )
 
         if split_by_chr:
+            annotation_path = annotation_path.parent
+
+            # annotations of each chromosome group could be in in memory cache
+            all_annotations = []
+            jobs = []
+            for (chrom,), data in variants.group_by(["chr"]):
+                memory_key = self._memory_key(
+                    "add_annotations",
+                    {"name": name, "version": version, "columns": columns},
+                    [data],
+                    [annotation_path / f"{chrom}.parquet"],
+                )
+                result = None if memory_key is None else self._memory_cache.get(memory_key)  # type: ignore[union-attr]
+                if result is None:
+                    jobs.append((memory_key, ((chrom,), data)))
+                else:
+                    all_annotations.append(result)
+
             iterator = sake._utils.wrap_iterator(
                 self.activate_tqdm,  # type: ignore[arg-type]
-                variants.group_by(["chr"]),
-                total=variants.get_column("chr").unique().len(),
+                [job for _, job in jobs],
             )
-            annotation_path = annotation_path.parent
-
             query_obj = sake._utils.QueryByGroupBy(
-                self.threads // read_threads,  # type: ignore[operator]
+                self._worker_threads(read_threads),
                 f"{annotation_path}/{{}}.parquet",
                 "add_annotations",
                 {"columns": columns},
-                select_columns,
+                profile=self.profile,
             )
-            if read_threads == 1:
-                all_annotations = list(map(query_obj, iterator))
-            else:
-                with multiprocessing.get_context("spawn").Pool(processes=read_threads) as pool:
-                    all_annotations = list(pool.imap(query_obj, iterator))
+            for (memory_key, _), result in zip(jobs, self._map(query_obj, iterator, read_threads)):
+                if memory_key is not None and result is not None:
+                    self._memory_cache.set(memory_key, result)  # type: ignore[union-attr]
+                all_annotations.append(result)
+
+            with self._stage("concat"):
+                result = polars.concat([df for df in all_annotations if df is not None])
+            return self._output(result, output)
+
+        _data = variants  # used by duckdb replacement scan
+        query_str = sake.QUERY["add_annotations"].format(columns=columns)
+        self._record_file(annotation_path)
 
-            result = polars.concat([df for df in all_annotations if df is not None])
+        return self._output(self._connection().sql(query_str, params={"path": str(annotation_path)}), output)
+
+    def __genotypes_query(
+        self,
+        variants: polars.DataFrame,
+        *,
+        keep_id_part: bool,
+        select_columns: list[str] | None,
+        number_of_bits: int,
+        read_threads: int,
+        preindications: list[str] | None = None,
+    ) -> tuple[sake._utils.QueryByGroupBy, collections.abc.Iterable[typing.Any]]:
+        """Build query and iterator over partitions group use by add_genotypes and iter_genotypes.
+
+        If preindications is set, partitions of each preindication (in default sake layout) are in iterator and
+        query add a preindication column.
+        """
+        if select_columns is None:
+            select_columns = [
+                *variants.schema.names(),
+                "sample",
+                *self.genotype_columns,  # type: ignore[misc]
+            ]
         else:
-            query_str = sake.QUERY["add_annotations"].format(columns=columns)
+            select_columns = [*variants.schema.names(), "sample", *select_columns]
 
-            result = self.db.execute(
-                query_str,
-                {
-                    "path": annotation_path,
-                },
-            ).pl()
+        variants = sake.utils.add_id_part(variants, number_of_bits=number_of_bits)
+
+        if keep_id_part:
+            select_columns.append("id_part")
 
-        if rename_column:
-            result = result.rename(
-                {col: f"{name}_{col}" for col in schema if select_columns is None or col in select_columns},
+        expressions = [
+            polars.col("ad").cast(polars.List(polars.String)).list.join(",").alias("ad"),
+        ]
+
+        if preindications is not None:
+            # partitions of all preindications are read in same pool, group parameter is (preindication, id_part)
+            partitions_template = self._target_template("partitions_path")
+            # variants with a preindication column (e.g. get_interval result) are search only in their preindication
+            by_preindication = "preindication" in variants.columns
+            jobs = [
+                (
+                    (preindication, id_part),
+                    data.filter(polars.col("preindication") == preindication) if by_preindication else data,
+                )
+                for (id_part,), data in variants.group_by(["id_part"])
+                for preindication in preindications
+                if sake.metadata.file_stat(f"{partitions_template.format(preindication)}/id_part={id_part}/0.parquet")
+            ]
+            jobs = [job for job in jobs if not job[1].is_empty()]
+
+            return (
+                sake._utils.QueryByGroupBy(
+                    self._worker_threads(read_threads),
+                    f"{partitions_template}/id_part={{}}/0.parquet",
+                    "genotype_query",
+                    select_columns=select_columns,
+                    expressions=expressions,
+                    bloom_template=f"{self._target_template('index_path')}/bloom/partitions/id_part={{}}.npz",
+                    parameter_columns=None if by_preindication else {"preindication": 0},
+                    profile=self.profile,
+                ),
+                sake._utils.wrap_iterator(self.activate_tqdm, jobs),  # type: ignore[arg-type]
             )
 
-        return result
+        # skip partitions without file
+        catalog = self.get_catalog()
+        id_parts = [
+            id_part
+            for id_part in variants.get_column("id_part").unique().to_list()
+            if catalog.size(self.partitions_path / f"id_part={id_part}" / "0.parquet")  # type: ignore[operator]
+        ]
+        variants = variants.filter(polars.col("id_part").is_in(id_parts))
+
+        iterator = sake._utils.wrap_iterator(
+            self.activate_tqdm,  # type: ignore[arg-type]
+            variants.group_by(["id_part"]),
+            total=variants.get_column("id_part").unique().len(),
+        )
 
+        query = sake._utils.QueryByGroupBy(
+            self._worker_threads(read_threads),
+            f"{self.partitions_path}/id_part={{}}/0.parquet",
+            "genotype_query",
+            select_columns=select_columns,
+            expressions=expressions,
+            bloom_template=f"{self.index_path}/bloom/partitions/id_part={{}}.npz",
+            profile=self.profile,
+        )
+
+        return (query, iterator)
+
+    @_record_stats
     def add_genotypes(
         self,
         variants: polars.DataFrame,
@@ -175,10 +943,12 @@ class Sake:
         select_columns: list[str] | None = None,
         number_of_bits: int = 8,
         read_threads: int = 1,
-    ) -> polars.DataFrame:
+        preindications: str | list[str] | None = None,
+        output: str | None = None,
+    ) -> sake._utils.Output:
         """Add genotype information to variants DataFrame.
 
-        Require `id` column in variants value.
+        Require `id` column in variants value. Partitions of other preindications are found in default sake layout.
 
         Parameters:
           variants: DataFrame you wish to add genotypes
@@ -186,90 +956,167 @@ class Sake:
           select_columns: name of genotype column you want add to your DataFrame, if None all column are added
           number_of_bits: number of bits use to compute partitions
           read_threads: number of partitions file read in parallel
+          preindications: if set, genotypes of these preindications (a list or `"*"` for all) are read in same pool and a `preindication` column is added, if variants have a `preindication` column each variant is search in its preindication
+          output: format of result (polars, arrow, reader or relation), if None Sake.output is used
 
         Return:
           DataFrame with genotype information.
         """
-        if select_columns is None:
-            select_columns = [
-                *variants.schema.names(),
-                "sample",
-                *self.genotype_columns,  # type: ignore[misc]
+        targets = None if preindications is None else self._preindications(preindications)
+
+        def compute() -> polars.DataFrame:
+            with self._stage("prepare"):
+                query, iterator = self.__genotypes_query(
+                    variants,
+                    keep_id_part=keep_id_part,
+                    select_columns=select_columns,
+                    number_of_bits=number_of_bits,
+                    read_threads=read_threads,
+                    preindications=targets,
+                )
+
+            all_genotypes = self._map(query, iterator, read_threads)
+
+            with self._stage("concat"):
+                return polars.concat([df for df in all_genotypes if df is not None])
+
+        def paths() -> list[pathlib.Path]:
+            id_parts = sake.utils.add_id_part(variants.select("id"), number_of_bits=number_of_bits)
+            partitions_paths = (
+                [self.partitions_path]
+                if targets is None
+                else [pathlib.Path(self._target_template("partitions_path").format(target)) for target in targets]
+            )
+            return [
+                partitions_path / f"id_part={id_part}" / "0.parquet"  # type: ignore[operator]
+                for partitions_path in partitions_paths
+                for id_part in id_parts.get_column("id_part").unique().to_list()
             ]
-        else:
-            select_columns = [*variants.schema.names(), "sample", *select_columns]
 
-        variants = sake.utils.add_id_part(variants, number_of_bits=number_of_bits)
+        result = self._cached(
+            "add_genotypes",
+            {
+                "keep_id_part": keep_id_part,
+                # columns really selected, genotype_columns could be different between Sake that share a cache
+                "select_columns": [*variants.columns, *self.genotype_columns]  # type: ignore[misc]
+                if select_columns is None
+                else select_columns,
+                "number_of_bits": number_of_bits,
+                "preindications": targets,
+            },
+            [variants],
+            paths,
+            compute,
+        )
 
-        if keep_id_part:
-            select_columns.append("id_part")
+        return self._output(result, output)
 
-        all_genotypes: list[polars.DataFrame | None] = []
-        iterator = sake._utils.wrap_iterator(
-            self.activate_tqdm,  # type: ignore[arg-type]
-            variants.group_by(["id_part"]),
-            total=variants.get_column("id_part").unique().len(),
-        )
+    @_record_stats
+    def iter_genotypes(
+        self,
+        variants: polars.DataFrame,
+        *,
+        keep_id_part: bool = False,
+        select_columns: list[str] | None = None,
+        number_of_bits: int = 8,
+        read_threads: int = 1,
+        in_flight: int | None = None,
+        max_rows: int | None = None,
+        preindications: str | list[str] | None = None,
+        output: str | None = None,
+    ) -> collections.abc.Generator[sake._utils.Output, None, None]:
+        """Iterate over genotype information of variants, partition by partition.
 
-        query = sake._utils.QueryByGroupBy(
-            self.threads // read_threads,  # type: ignore[operator]
-            f"{self.partitions_path}/id_part={{}}/0.parquet",
-            "genotype_query",
+        Same as [add_genotypes][sake.Sake.add_genotypes] but result of each partition is yield as soon as it's read,
+        in order of completion, so memory use is bounded by in_flight partitions result.
+
+        Parameters:
+          variants: DataFrame you wish to add genotypes
+          keep_id_part: method add id_part column, set to True to keep_it
+          select_columns: name of genotype column you want add to your DataFrame, if None all column are added
+          number_of_bits: number of bits use to compute partitions
+          read_threads: number of partitions file read in parallel
+          in_flight: maximal number of partitions read but not yet yield, default is read_threads
+          max_rows: if set, result of a partition is split in DataFrame of at most max_rows rows
+          preindications: if set, genotypes of these preindications (a list or `"*"` for all) are read in same pool and a `preindication` column is added, if variants have a `preindication` column each variant is search in its preindication
+          output: format of each result (polars, arrow, reader or relation), if None Sake.output is used
+
+        Return:
+          Generator of DataFrame with genotype information.
+        """
+        query, iterator = self.__genotypes_query(
+            variants,
+            keep_id_part=keep_id_part,
             select_columns=select_columns,
-            expressions=[
-                polars.col("ad").cast(polars.List(polars.String)).list.join(",").alias("ad"),
-            ],
+            number_of_bits=number_of_bits,
+            read_threads=read_threads,
+            preindications=None if preindications is None else self._preindications(preindications),
         )
 
-        if read_threads == 1:
-            all_genotypes = list(map(query, iterator))
-        else:
-            with multiprocessing.get_context("spawn").Pool(processes=read_threads) as pool:
-                all_genotypes = list(pool.imap(query, iterator))
+        for result in self._imap(query, iterator, read_threads, in_flight=in_flight):
+            if result is None:
+                continue
 
-        return polars.concat([df for df in all_genotypes if df is not None])
+            if max_rows is None:
+                yield self._output(result, output)
+            else:
+                for chunk in result.iter_slices(max_rows):
+                    yield self._output(chunk, output)
 
+    @_record_stats
     def add_sample_info(
         self,
         _variants: polars.DataFrame,
         *,
         select_columns: list[str] | None = None,
-    ) -> polars.DataFrame:
+        output: str | None = None,
+    ) -> sake._utils.Output:
         """Add sample information.
 
-        Required sample column in polars.DataFrame.
+        Required sample column in polars.DataFrame. Samples information are load once and kept until file change,
+        sample are join on integer key.
 
         Parameters:
           _variants: DataFrame you wish to add sample information
           select_columns: name of sample information column you want add to your DataFrame, if None all column are added
+          output: format of result (polars, arrow, reader or relation), if None Sake.output is used
 
         Return:
           DataFrame with sample information.
         """
-        # sampless_path are set in __post_init__
-        schema = polars.read_parquet_schema(self.samples_path)  # type: ignore[arg-type]
+        samples, names = self._get_samples()
 
         if select_columns is None:
-            select_columns = [col for col in schema if col != "sample"]
-
-        columns = ",".join([f"s.{col}" for col in schema if col in select_columns])
-
-        query = sake.QUERY["add_sample_info"].format(columns=columns)
+            select_columns = [col for col in samples.columns if col not in ("sample", "__sample_key")]
+
+        columns = [col for col in samples.columns if col in select_columns and col not in ("sample", "__sample_key")]
+
+        result = (
+            _variants.with_columns(
+                polars.col("sample")
+                .replace_strict(
+                    names,
+                    polars.int_range(names.len(), dtype=polars.UInt32, eager=True),
+                    default=None,
+                    return_dtype=polars.UInt32,
+                )
+                .alias("__sample_key"),
+            )
+            .join(samples.select("__sample_key", *columns), on="__sample_key", how="left", maintain_order="left")
+            .drop("__sample_key")
+        )
 
-        return self.db.execute(
-            query,
-            {
-                "path": str(self.samples_path),
-            },
-        ).pl()
+        return self._output(result, output)
 
+    @_record_stats
     def add_transmissions(
         self,
         variants: polars.DataFrame,
         *,
         select_columns: list[str] | None = None,
         read_threads: int = 1,
-    ) -> polars.DataFrame:
+        output: str | None = None,
+    ) -> sake._utils.Output:
         """Add transmissions information.
 
         Required pid_crc column in polars.DataFrame.
@@ -279,6 +1126,7 @@ class Sake:
           variants: DataFrame you wish to add genotypes
           select_columns: name of transmissions column you want add to your DataFrame, if None all column are added
           read_threads: number of partitions file read in parallel
+          output: format of result (polars, arrow, reader or relation), if None Sake.output is used
 
         Return:
           DataFrame with genotype information.
@@ -301,7 +1149,7 @@ class Sake:
             total=variants.get_column("pid_crc").unique().len(),
         )
         query = sake._utils.QueryByGroupBy(
-            self.threads // read_threads,  # type: ignore[operator]
+            self._worker_threads(read_threads),
             f"{self.transmissions_path}/{{}}.parquet",
             "add_transmissions",
             select_columns=select_columns,
@@ -319,44 +1167,305 @@ class Sake:
                 polars.col("index_ad").cast(polars.List(polars.String)).list.join(",").alias("index_ad"),
                 polars.col("mother_ad").cast(polars.List(polars.String)).list.join(",").alias("mother_ad"),
             ],
+            bloom_template=f"{self.index_path}/bloom/transmissions/{{}}.npz",
+            profile=self.profile,
         )
 
-        if read_threads == 1:
-            all_transmissions = list(map(query, iterator))
-        else:
-            with multiprocessing.get_context("spawn").Pool(processes=read_threads) as pool:
-                all_transmissions = list(pool.imap(query, iterator))
+        all_transmissions = self._map(query, iterator, read_threads)
 
-        return polars.concat([df for df in all_transmissions if df is not None])
+        with self._stage("concat"):
+            result = polars.concat([df for df in all_transmissions if df is not None])
+        return self._output(result, output)
 
-    def __add_all_variants(self, name: str, _data: polars.DataFrame | None = None) -> polars.DataFrame:
-        """Merge add and all variants code."""
+    def __add_all_variants(self, name: str) -> polars.DataFrame:
+        """Run query on each variants file."""
         iterator = sake._utils.wrap_iterator(
             self.activate_tqdm,  # type: ignore[arg-type]
-            sake._utils.get_chromosome_path(self.variants_path),  # type: ignore[arg-type]
+            self.get_catalog().get_chromosome_path(self.variants_path),  # type: ignore[arg-type]
         )
 
         all_variants = []
         for path in iterator:
-            all_variants.append(
-                self.db.execute(
-                    sake.QUERY[name],
-                    {
-                        "path": str(path),
-                    },
-                ).pl(),
-            )
+            self._record_file(path)
+            with self._stage("scan"):
+                all_variants.append(
+                    self._connection()
+                    .execute(
+                        sake.QUERY[name],
+                        {
+                            "path": str(path),
+                        },
+                    )
+                    .pl(),
+                )
+
+        with self._stage("concat"):
+            return polars.concat(all_variants)
+
+    @_record_stats
+    def add_variants(
+        self,
+        _data: polars.DataFrame,
+        *,
+        read_threads: int = 1,
+        output: str | None = None,
+    ) -> sake._utils.Output:
+        """Use id of column polars.DataFrame to get variant information.
 
-        return polars.concat(all_variants)
+        If an up to date locator exist (see [build_locator][sake.Sake.build_locator]) it's used instead of variants
+        files. Else only chromosomes files that could contains ids are read: if `chr` column is present data is split
+        by chromosome, rows without chromosome or with a chromosome without file use id min and max of each variants
+        file to skip file.
 
-    def add_variants(self, _data: polars.DataFrame) -> polars.DataFrame:
-        """Use id of column polars.DataFrame to get variant information."""
-        return self.__add_all_variants("add_variants", _data)
+        Parameters:
+          _data: DataFrame with an `id` column
+          read_threads: number of chromosomes files read in parallel
+          output: format of result (polars, arrow, reader or relation), if None Sake.output is used
 
-    def all_variants(self) -> polars.DataFrame:
+        Return:
+          DataFrame with variants information.
+        """
+        locator = self._get_locator()
+        if locator is not None:
+            variants = locator.locate(_data.get_column("id").unique())
+            data = _data.rename({col: f"{col}_1" for col in ["chr", "pos", "ref", "alt"] if col in _data.schema})
+            return self._output(variants.join(data, on="id").select("chr", "pos", "ref", "alt", *data.columns), output)
+
+        jobs = []
+        # rows without chromosome or with a chromosome without file
+        rest = _data
+        if "chr" in _data.schema:
+            routed = []
+            for (chrom,), data in _data.filter(polars.col("chr").is_not_null()).group_by(["chr"]):
+                path = self.variants_path / f"{chrom}.parquet"  # type: ignore[operator]
+                if self.get_catalog().is_file(path):
+                    jobs.append(({"path": str(path)}, data))
+                    routed.append(chrom)
+            rest = _data.filter(polars.col("chr").is_null() | ~polars.col("chr").is_in(routed))
+
+        if rest.height != 0:
+            for path in self.get_catalog().get_chromosome_path(self.variants_path):  # type: ignore[arg-type]
+                min_max = sake.index.column_min_max(path, "id")
+                data = rest if min_max is None else rest.filter(polars.col("id").is_between(*min_max))
+                if data.height != 0:
+                    jobs.append(({"path": str(path)}, data))
+
+        if not jobs:
+            # no file could contains variants, run query on one file to get an empty result with good schema
+            path = next(self.get_catalog().get_chromosome_path(self.variants_path), None)  # type: ignore[arg-type]
+            if path is None:
+                data = _data.rename({col: f"{col}_1" for col in ["chr", "pos", "ref", "alt"] if col in _data.schema})
+                schema = {col: VARIANTS_SCHEMA[col] for col in ["chr", "pos", "ref", "alt"]}
+                return self._output(polars.DataFrame(schema={**schema, **data.schema}), output)
+            jobs.append(({"path": str(path)}, _data.clear()))
+
+        iterator = sake._utils.wrap_iterator(self.activate_tqdm, jobs)  # type: ignore[arg-type]
+        query = sake._utils.QueryByParams(
+            self._worker_threads(read_threads),
+            "add_variants",
+            profile=self.profile,
+        )
+
+        all_variants = self._map(query, iterator, read_threads)
+
+        with self._stage("concat"):
+            result = polars.concat(all_variants)
+        return self._output(result, output)
+
+    @_record_stats
+    def all_variants(self, *, output: str | None = None) -> sake._utils.Output:
         """Get all variants of a target in present in Sake."""
-        return self.__add_all_variants("all_variants")
+        return self._output(self.__add_all_variants("all_variants"), output)
+
+    def build_locator(self) -> sake.index.Locator:
+        """Build variants id locator.
+
+        Locator is a sorted and memory mapped index of variants id, when it's up to date `add_variants` and
+        `get_variant_of_prescription` use it instead of variants files. A locator is ignored if a variants file change
+        after it build.
+        """
+        self._locator = sake.index.Locator.build(
+            sake._utils.get_chromosome_path(self.variants_path),  # type: ignore[arg-type]
+            self.index_path / "locator",  # type: ignore[operator]
+        )
+        return self._locator
+
+    def build_recurrence(self) -> None:
+        """Precompute recurrence of each variants of genotypes partitions.
+
+        For each partition, sake_AC (sum of genotype), sake_nhomalt (number of homozygous) and sake_carriers (number
+        of sample) of each id are write sorted by id in aggregations_path / preindication / recurrence, with same
+        partitioning as genotypes. [add_recurrence][sake.Sake.add_recurrence] read it.
+        """
+        directory = self.aggregations_path / self.preindication / "recurrence"  # type: ignore[operator]
+
+        paths = sorted(self.partitions_path.glob("id_part=*/0.parquet"))  # type: ignore[union-attr]
+        sources = {}
+        for path in sake._utils.wrap_iterator(self.activate_tqdm, paths):  # type: ignore[arg-type]
+            stat = sake.metadata.file_stat(path, max_age=0)
+            if stat is None or stat[0] == 0:
+                continue
+
+            output = directory / path.parent.name / "0.parquet"
+            output.parent.mkdir(parents=True, exist_ok=True)
+            escape_path = str(output).replace("'", "''")
+            self._connection().execute(sake.QUERY["build_recurrence"].format(output=escape_path), {"path": str(path)})
+            sources[path.parent.name] = stat
+
+        # source of each partition, let us detect partition change after build
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / "meta.json", "w") as fh_out:
+            json.dump(sources, fh_out)
+
+    def __recurrence_is_fresh(self, id_parts: list[int]) -> bool:
+        """Check recurrence store of partitions exist and was build from current version of partitions."""
+        meta_path = self.aggregations_path / self.preindication / "recurrence" / "meta.json"  # type: ignore[operator]
+        if not meta_path.is_file():
+            return False
+
+        with open(meta_path) as fh_in:
+            sources = json.load(fh_in)
+
+        for id_part in id_parts:
+            name = f"id_part={id_part}"
+            stat = sake.metadata.file_stat(self.partitions_path / name / "0.parquet")  # type: ignore[operator]
+            if stat is None or stat[0] == 0:
+                if name in sources:
+                    return False
+            elif sources.get(name) != list(stat):
+                return False
+
+        return True
+
+    @_record_stats
+    def add_recurrence(
+        self,
+        variants: polars.DataFrame,
+        *,
+        number_of_bits: int = 8,
+        read_threads: int = 1,
+        output: str | None = None,
+    ) -> sake._utils.Output:
+        """Add recurrence of variants in preindication, precomputed by [build_recurrence][sake.Sake.build_recurrence].
+
+        Require `id` column in variants, sake_AC, sake_nhomalt and sake_carriers columns are added, they are null if
+        variants isn't present in preindication. If precomputed recurrence of a partition is missing or older than
+        partition, recurrence is count from genotypes with [count_recurrence][sake.Sake.count_recurrence].
+
+        Parameters:
+          variants: DataFrame you wish to add recurrence
+          number_of_bits: number of bits use to compute partitions
+          read_threads: number of partitions file read in parallel
+          output: format of result (polars, arrow, reader or relation), if None Sake.output is used
+
+        Return:
+          DataFrame with recurrence information.
+        """
+        ids = sake.utils.add_id_part(variants.select("id").unique(), number_of_bits=number_of_bits)
+
+        if not self.__recurrence_is_fresh(ids.get_column("id_part").unique().to_list()):
+            recurrence = self.count_recurrence(
+                ids.get_column("id"),
+                number_of_bits=number_of_bits,
+                read_threads=read_threads,
+            )
+            return self._output(variants.join(recurrence, on="id", how="left", maintain_order="left"), output)
+
+        iterator = sake._utils.wrap_iterator(
+            self.activate_tqdm,  # type: ignore[arg-type]
+            ids.group_by(["id_part"]),
+            total=ids.get_column("id_part").unique().len(),
+        )
+
+        query = sake._utils.QueryByGroupBy(
+            self._worker_threads(read_threads),
+            f"{self.aggregations_path}/{self.preindication}/recurrence/id_part={{}}/0.parquet",
+            "get_recurrence",
+            profile=self.profile,
+        )
+
+        all_recurrence = self._map(query, iterator, read_threads)
+
+        with self._stage("concat"):
+            recurrence = polars.concat(
+                [
+                    polars.DataFrame(schema=RECURRENCE_SCHEMA),
+                    *(df for df in all_recurrence if df is not None),
+                ],
+            )
+
+        return self._output(variants.join(recurrence, on="id", how="left", maintain_order="left"), output)
+
+    @_record_stats
+    def count_recurrence(
+        self,
+        ids: polars.Series | list[int],
+        group_by: list[str] | None = None,
+        *,
+        number_of_bits: int = 8,
+        read_threads: int = 1,
+    ) -> polars.DataFrame:
+        """Count recurrence of variants in genotypes partitions.
+
+        Each partition that contains ids is aggregate in duckdb, only one row by id (and group) is return.
+
+        Parameters:
+          ids: id of variants
+          group_by: samples information columns (see [add_sample_info][sake.Sake.add_sample_info]) use to split count, e.g. `["affected"]`, an unknown column raise ValueError
+          number_of_bits: number of bits use to compute partitions
+          read_threads: number of partitions file read in parallel
+
+        Return:
+          DataFrame with id, group_by columns, sake_AC, sake_nhomalt and sake_carriers, variants not present in
+          partitions are absent.
+        """
+        data = sake.utils.add_id_part(
+            polars.DataFrame({"id": ids}, schema={"id": polars.UInt64}).unique(),
+            number_of_bits=number_of_bits,
+        )
+
+        samples_schema = sake.metadata.parquet_schema(self.samples_path) if group_by else {}  # type: ignore[arg-type]
+        unknown = [column for column in group_by or [] if column not in samples_schema]
+        if unknown:
+            raise ValueError(f"group_by columns {unknown} aren't in samples information")
+
+        query_params = {"group_columns": "", "samples_join": ""}
+        if group_by:
+            escape_path = str(self.samples_path).replace("'", "''")
+            query_params["group_columns"] = "".join(
+                f", s.{sake._utils.quote_identifier(column)}" for column in group_by
+            )
+            query_params["samples_join"] = f"left join read_parquet('{escape_path}') as s on g.sample == s.sample"
+
+        iterator = sake._utils.wrap_iterator(
+            self.activate_tqdm,  # type: ignore[arg-type]
+            data.group_by(["id_part"]),
+            total=data.get_column("id_part").unique().len(),
+        )
 
+        query = sake._utils.QueryByGroupBy(
+            self._worker_threads(read_threads),
+            f"{self.partitions_path}/id_part={{}}/0.parquet",
+            "count_recurrence",
+            query_params,
+            bloom_template=f"{self.index_path}/bloom/partitions/id_part={{}}.npz",
+            profile=self.profile,
+        )
+
+        empty = polars.DataFrame(
+            schema={
+                "id": polars.UInt64,
+                **{column: samples_schema[column] for column in group_by or []},
+                **{name: dtype for name, dtype in RECURRENCE_SCHEMA.items() if name != "id"},
+            },
+        )
+
+        all_recurrence = self._map(query, iterator, read_threads)
+
+        with self._stage("concat"):
+            return polars.concat([empty, *(df for df in all_recurrence if df is not None)])
+
+    @_record_stats
     def get_annotations(
         self,
         name: str,
@@ -364,7 +1473,8 @@ class Sake:
         *,
         rename_column: bool = True,
         select_columns: list[str] | None = None,
-    ) -> polars.DataFrame | None:
+        output: str | None = None,
+    ) -> sake._utils.Output | None:
         """Get all variants of an annotations.
 
         Parameters:
@@ -372,65 +1482,87 @@ class Sake:
           version: version of annotations you want add to your variants
           rename_column: prefix annotations column name with annotations name
           select_columns: name of annotations column (same as is in annotations file) you want add to your DataFrame, if None all column are added
+          output: format of result (polars, arrow, reader or relation), if None Sake.output is used
 
         Return:
           DataFrame with annotations column.
         """
-        annotation_path_result = sake._utils.fix_annotation_path(
-            self.annotations_path,  # type: ignore[arg-type]
-            name,
-            version,
-            self.preindication,
-        )
+        annotation_path_result = self._annotation_path(name, version)
         if annotation_path_result is not None:
             (annotation_path, split_by_chr) = annotation_path_result
         else:
             # No annotations path return input
             return None
 
-        schema = polars.read_parquet_schema(annotation_path)
+        schema = sake.metadata.parquet_schema(annotation_path)
         if "id" in schema:
             del schema["id"]
-        columns = ",".join([f"a.{col}" for col in schema if select_columns is None or col in select_columns])
+        columns = ",".join(
+            [
+                f"a.{sake._utils.quote_identifier(col)} as {sake._utils.quote_identifier(f'{name}_{col}')}"
+                if rename_column
+                else f"a.{sake._utils.quote_identifier(col)}"
+                for col in schema
+                if select_columns is None or col in select_columns
+            ],
+        )
 
         query = sake.QUERY["get_annotations"].format(columns=columns)
-        if split_by_chr:
-            annotations_path = sake._utils.get_chromosome_path(annotation_path.parent)
-            variants_path = sake._utils.get_chromosome_path(self.variants_path)  # type: ignore[arg-type]
-            iterator = sake._utils.wrap_iterator(
-                self.activate_tqdm,  # type: ignore[arg-type]
-                zip(annotations_path, variants_path),
-            )
-
-            all_annotations = []
-            for annotation_path, variant_path in iterator:
-                chrom_result = self.db.execute(
-                    query,
-                    {
-                        "annotation_path": str(annotation_path),
-                        "variant_path": str(variant_path),
-                    },
-                ).pl()
-
-                all_annotations.append(chrom_result)
+        variants_path = list(self.get_catalog().get_chromosome_path(self.variants_path))  # type: ignore[arg-type]
+        annotations_path = (
+            list(self.get_catalog().get_chromosome_path(annotation_path.parent)) if split_by_chr else [annotation_path]
+        )
 
-            result = polars.concat([df for df in all_annotations if df is not None])
-        else:
-            result = self.db.execute(
+        def compute() -> polars.DataFrame | duckdb.DuckDBPyRelation:
+            if split_by_chr:
+                iterator = sake._utils.wrap_iterator(
+                    self.activate_tqdm,  # type: ignore[arg-type]
+                    zip(annotations_path, variants_path),
+                )
+
+                all_annotations = []
+                for chrom_annotation_path, variant_path in iterator:
+                    self._record_file(chrom_annotation_path)
+                    self._record_file(variant_path)
+                    with self._stage("scan"):
+                        chrom_result = (
+                            self._connection()
+                            .execute(
+                                query,
+                                {
+                                    "annotation_path": str(chrom_annotation_path),
+                                    "variant_path": str(variant_path),
+                                },
+                            )
+                            .pl()
+                        )
+
+                    all_annotations.append(chrom_result)
+
+                with self._stage("concat"):
+                    return polars.concat([df for df in all_annotations if df is not None])
+
+            for path in [annotation_path, *variants_path]:
+                self._record_file(path)
+            return self._connection().sql(
                 query,
-                {
-                    "annotation_path": annotation_path,
+                params={
+                    "annotation_path": str(annotation_path),
                     "variant_path": f"{self.variants_path}/*.parquet",
                 },
-            ).pl()
-
-        if rename_column:
-            result = result.rename(
-                {col: f"{name}_{col}" for col in schema if select_columns is None or col in select_columns},
             )
 
-        return result
+        result = self._cached(
+            "get_annotations",
+            {"name": name, "version": version, "rename_column": rename_column, "select_columns": select_columns},
+            [],
+            [*annotations_path, *variants_path],
+            compute,
+        )
 
+        return self._output(result, output)
+
+    @_record_stats
     def get_cnv(
         self,
         chrom: str,
@@ -440,106 +1572,365 @@ class Sake:
         sv_type: str,
         *,
         exact: bool = True,
-    ) -> polars.DataFrame:
+        output: str | None = None,
+    ) -> sake._utils.Output:
         """Get cnv from chromosome between start and stop."""
         start_comp = "==" if exact else ">"
         stop_comp = "==" if exact else "<"
+        path = self.cnv_path / "groupby" / tools / sv_type / f"{chrom}.parquet"  # type: ignore[operator]
+        self._record_file(path)
+
+        return self._output(
+            self._connection().sql(
+                sake.QUERY["get_cnv"].format(start_comp=start_comp, stop_comp=stop_comp),
+                params={
+                    "path": str(path),
+                    "start": start,
+                    "stop": stop,
+                },
+            ),
+            output,
+        )
 
-        return self.db.execute(
-            sake.QUERY["get_cnv"].format(start_comp=start_comp, stop_comp=stop_comp),
-            {
-                "path": str(self.cnv_path / "groupby" / tools / sv_type / f"{chrom}.parquet"),  # type: ignore[operator]
-                "start": start,
-                "stop": stop,
-            },
-        ).pl()
-
-    def get_cnv_by_sample(self, sample: str, tools: str) -> polars.DataFrame:
+    @_record_stats
+    def get_cnv_by_sample(self, sample: str, tools: str, *, output: str | None = None) -> sake._utils.Output:
         """Get cnv by sample."""
-        return polars.read_parquet(self.cnv_path / "samples" / sample / f"{tools}.parquet")  # type: ignore[operator]
+        path = self.cnv_path / "samples" / sample / f"{tools}.parquet"  # type: ignore[operator]
+        self._record_file(path)
+
+        return self._output(self._connection().read_parquet(str(path)), output)
+
+    def build_interval_index(self, chroms: list[str] | None = None) -> None:
+        """Build zonemap of position for variants file.
+
+        Index store min and max position of each row group, `get_interval` and `get_intervals` use it to read only
+        row group that overlap region. An index is ignored if variants file change after it build. Files with row
+        group statistics didn't need index, their statistics are used and no index is write.
 
+        Parameters:
+          chroms: chromosomes indexed, if None all chromosomes are indexed
+        """
+        iterator = sake._utils.wrap_iterator(
+            self.activate_tqdm,  # type: ignore[arg-type]
+            sake._utils.get_chromosome_path(self.variants_path, chroms),  # type: ignore[arg-type]
+        )
+        for path in iterator:
+            sake.index.build_zonemap(path, self.index_path / "zonemap" / f"{path.stem}.json")  # type: ignore[operator]
+
+    def build_bloom_filters(self, bits_per_value: int = 16) -> None:
+        """Build id bloom filter of genotypes partitions and transmissions files.
+
+        Filter store for each row group a bloom filter of id, `add_genotypes`, `iter_genotypes` and
+        `add_transmissions` use it to skip partitions and row groups that didn't contains requested ids. A filter is
+        ignored if file change after it build.
+
+        Parameters:
+          bits_per_value: size of filter by id, with 16 bits false positive rate is around 0.1%
+        """
+        paths = [
+            (path, self.index_path / "bloom" / "partitions" / f"{path.parent.name}.npz")  # type: ignore[operator]
+            for path in sorted(self.partitions_path.glob("id_part=*/0.parquet"))  # type: ignore[union-attr]
+        ]
+        paths += [
+            (path, self.index_path / "bloom" / "transmissions" / f"{path.stem}.npz")  # type: ignore[operator]
+            for path in sake._utils.get_chromosome_path(self.transmissions_path)  # type: ignore[arg-type]
+        ]
+
+        for path, index in sake._utils.wrap_iterator(self.activate_tqdm, paths):  # type: ignore[arg-type]
+            if path.stat().st_size != 0:
+                sake.index.build_bloom_filter(path, index, bits_per_value=bits_per_value)
+
+    @_record_stats
     def get_interval(
         self,
         chrom: str,
         start: int,
         stop: int,
         comment: polars.typing.IntoExpr | None = None,
-    ) -> polars.DataFrame:
-        """Get variants from chromosome between start and stop."""
-        df = self.db.execute(
-            sake.QUERY["get_interval"],
-            {
-                "path": str(self.variants_path / f"{chrom}.parquet"),  # type: ignore[operator]
-                "chrom": chrom,
-                "start": start,
-                "stop": stop,
-            },
-        ).pl()
+        *,
+        preindications: str | list[str] | None = None,
+        output: str | None = None,
+    ) -> sake._utils.Output:
+        """Get variants from chromosome between start and stop.
+
+        If file have row group statistics or an up to date interval index (see
+        [build_interval_index][sake.Sake.build_interval_index]) only row group that overlap region are read. Without comment result isn't materialized before output conversion.
+
+        If preindications is set (a list or `"*"` for all), chromosome file of each preindication (in default sake
+        layout) is read in one duckdb scan and a `preindication` column is added, interval index isn't used.
+        """
+        if preindications is not None:
+            return self.__get_interval_preindications(
+                chrom,
+                start,
+                stop,
+                comment=comment,
+                preindications=self._preindications(preindications),
+                output=output,
+            )
+
+        path = self.variants_path / f"{chrom}.parquet"  # type: ignore[operator]
+        params = {
+            "chrom": chrom,
+            "start": start,
+            "stop": stop,
+        }
+
+        def compute() -> duckdb.DuckDBPyRelation:
+            zonemap = sake.index.read_zonemap(path, self.index_path / "zonemap" / f"{chrom}.json")  # type: ignore[operator]
+            if zonemap is None:
+                self._record_file(path)
+                return self._connection().sql(sake.QUERY["get_interval"], params={"path": str(path), **params})
+
+            row_groups = sake.index.overlap_row_groups(zonemap, start, stop)
+            self._record_file(path, row_groups)
+            _slice = sake.index.read_row_groups(path, row_groups, ["id", "chr", "pos", "ref", "alt"])
+            return self._connection().sql(sake.QUERY["get_interval_slice"], params=params)
+
+        result = self._cached("get_interval", params, [], [path], compute)
+
+        if comment is None:
+            return self._output(result, output)
+        if not isinstance(result, polars.DataFrame):
+            result = result.pl()
+        return self._output(result.with_columns(comment), output)
+
+    def __get_interval_preindications(
+        self,
+        chrom: str,
+        start: int,
+        stop: int,
+        *,
+        comment: typing.Any,
+        preindications: list[str],
+        output: str | None,
+    ) -> sake._utils.Output:
+        """Get variants from chromosome between start and stop in multiple preindications."""
+        template = self._target_template("variants_path")
+        targets = [(target, pathlib.Path(template.format(target)) / f"{chrom}.parquet") for target in preindications]
+        # preindication without this chromosome are skip, if no file exist duckdb raise same error as one preindication
+        targets = [(target, path) for target, path in targets if sake.metadata.is_file(path)] or targets
+        params = {
+            "chrom": chrom,
+            "start": start,
+            "stop": stop,
+            "paths": [str(path) for _, path in targets],
+            "preindications": [target for target, _ in targets],
+        }
+
+        def compute() -> duckdb.DuckDBPyRelation:
+            for _, path in targets:
+                self._record_file(path)
+            return self._connection().sql(sake.QUERY["get_interval_preindications"], params=params)
+
+        result = self._cached("get_interval", params, [], [path for _, path in targets], compute)
 
         if comment is None:
-            return df
-        return df.with_columns(comment)
+            return self._output(result, output)
+        if not isinstance(result, polars.DataFrame):
+            result = result.pl()
+        return self._output(result.with_columns(comment), output)
 
+    @_record_stats
     def get_intervals(
         self,
         chroms: list[str],
         starts: list[int],
         stops: list[int],
         comments: list[polars.typing.IntoExpr] | None = None,
-    ) -> polars.DataFrame:
-        """Get variants in multiple intervals."""
-        all_variants = []
+        *,
+        read_threads: int = 1,
+        output: str | None = None,
+    ) -> sake._utils.Output:
+        """Get variants in multiple intervals.
+
+        Comments must be expressions that could be evaluated without column (e.g. `polars.lit`), they are added to
+        interval as data, see [get_intervals_from][sake.Sake.get_intervals_from].
+        """
         minimal_length = min(len(chroms), len(starts), len(stops))
-        if comments is None:
-            iterator = sake._utils.wrap_iterator(
-                self.activate_tqdm,  # type: ignore[arg-type]
-                zip(chroms, zip(starts, stops)),
-                total=minimal_length,
-            )
-        else:
-            iterator = sake._utils.wrap_iterator(
-                self.activate_tqdm,  # type: ignore[arg-type]
-                zip(chroms, zip(starts, zip(stops, comments))),
-                total=minimal_length,
-            )
+        intervals = polars.DataFrame(
+            {
+                "chr": chroms[:minimal_length],
+                "start": starts[:minimal_length],
+                "stop": stops[:minimal_length],
+            },
+            schema={"chr": polars.String, "start": polars.Int64, "stop": polars.Int64},
+        )
 
-        for multi_value in iterator:
-            tmp = list(
-                sake._utils.flatten_tuples(multi_value),
-            )
-            chrom, start, stop, *comment = tmp
-            all_variants.append(
-                self.get_interval(chrom, start, stop, comment),
+        if comments is not None:
+            intervals = polars.concat(
+                [
+                    intervals,
+                    polars.concat(
+                        [polars.select(comment) for comment in comments[:minimal_length]],
+                        how="diagonal_relaxed",
+                    ),
+                ],
+                how="horizontal",
             )
 
-        return polars.concat(all_variants)
+        return self.get_intervals_from(intervals, read_threads=read_threads, output=output)
+
+    @_record_stats
+    def get_intervals_from(
+        self,
+        intervals: polars.DataFrame | pathlib.Path | str,
+        *,
+        read_threads: int = 1,
+        output: str | None = None,
+    ) -> sake._utils.Output:
+        """Get variants in multiple intervals.
+
+        Intervals are join with each chromosome variants file in one query, chromosome are process in parallel if
+        read_threads > 1. Like in [get_interval][sake.Sake.get_interval] position of DataFrame intervals must be
+        strictly between start and stop. BED intervals are 0-based and half-open, position must be in ]start, stop].
+        Result order follow intervals order.
+
+        Parameters:
+          intervals: DataFrame with chr, start and stop column, other column are added to variants of interval. Or a path to a BED file, column after stop are name, score, strand, ...
+          read_threads: number of chromosomes read in parallel
+          output: format of result (polars, arrow, reader or relation), if None Sake.output is used
+
+        Return:
+          DataFrame with variants of each intervals.
+        """
+        if not isinstance(intervals, polars.DataFrame):
+            intervals = polars.read_csv(intervals, separator="\t", has_header=False, comment_prefix="#")
+            bed_names = ["chr", "start", "stop", "name", "score", "strand"]
+            intervals = intervals.rename(dict(zip(intervals.columns, bed_names)))
+            # last base of bed interval is stop, it must be keep by strict comparison
+            intervals = intervals.with_columns(polars.col("stop") + 1)
+
+        # cast position in variants type to let duckdb use range join
+        intervals = intervals.with_columns(
+            polars.col("chr").cast(polars.String),
+            polars.col("start").clip(lower_bound=0).cast(polars.UInt64),
+            polars.col("stop").clip(lower_bound=0).cast(polars.UInt64),
+        ).with_row_index("__interval")
+
+        iterator = sake._utils.wrap_iterator(
+            self.activate_tqdm,  # type: ignore[arg-type]
+            intervals.group_by(["chr"]),
+            total=intervals.get_column("chr").unique().len(),
+        )
+
+        query = sake._utils.QueryByGroupBy(
+            self._worker_threads(read_threads),
+            f"{self.variants_path}/{{}}.parquet",
+            "get_intervals",
+            {"source": "read_parquet($path, file_row_number = true)"},
+            zonemap_template=f"{self.index_path}/zonemap/{{}}.json",
+            profile=self.profile,
+        )
+
+        all_variants = self._map(query, iterator, read_threads)
 
-    def get_variant_of_prescription(self, prescription: str) -> polars.DataFrame:
+        with self._stage("concat"):
+            all_variants = [df for df in all_variants if df is not None]
+            if all_variants:
+                result = (
+                    polars.concat(all_variants)
+                    .sort("__interval", "file_row_number")
+                    .drop("__interval", "file_row_number")
+                )
+            else:
+                # no chromosome file match intervals
+                result = polars.DataFrame(
+                    schema={**VARIANTS_SCHEMA, **intervals.drop("__interval", "chr", "start", "stop").schema},
+                )
+        return self._output(result, output)
+
+    @_record_stats
+    def get_variant_of_prescription(self, prescription: str, *, output: str | None = None) -> sake._utils.Output:
         """Get all variants of a prescription."""
-        return self.db.execute(
-            sake.QUERY["get_variant_of_prescription"],
-            {
-                "sample_path": str(
-                    self.prescriptions_path / f"{prescription}.parquet",  # type: ignore[operator]
-                ),
-                "variant_path": f"{self.variants_path}/*.parquet",
-            },
-        ).pl()
+        if self._get_locator() is not None:
+            return self.add_variants(
+                polars.read_parquet(self.prescriptions_path / f"{prescription}.parquet"),  # type: ignore[operator]
+                output=output,
+            )
 
-    def get_variant_of_prescriptions(self, prescriptions: list[str]) -> polars.DataFrame:
-        """Get all variants of multiple prescriptions."""
-        iterator = sake._utils.wrap_iterator(self.activate_tqdm, prescriptions)  # type: ignore[arg-type]
+        sample_path = self.prescriptions_path / f"{prescription}.parquet"  # type: ignore[operator]
+        for path in [sample_path, *self.get_catalog().get_chromosome_path(self.variants_path)]:  # type: ignore[arg-type]
+            self._record_file(path)
 
-        all_variants = []
-        for pid in iterator:
-            all_variants.append(
-                self.db.execute(
-                    sake.QUERY["get_variant_of_prescription"],
+        return self._output(
+            self._connection().sql(
+                sake.QUERY["get_variant_of_prescription"],
+                params={
+                    "sample_path": str(sample_path),
+                    "variant_path": f"{self.variants_path}/*.parquet",
+                },
+            ),
+            output,
+        )
+
+    @_record_stats
+    def get_variant_of_prescriptions(
+        self,
+        prescriptions: list[str],
+        *,
+        chunk_size: int = 100,
+        read_threads: int = 1,
+        preindications: str | list[str] | None = None,
+        output: str | None = None,
+    ) -> sake._utils.Output:
+        """Get all variants of multiple prescriptions.
+
+        Prescriptions are read by chunk, variants are join only once by chunk.
+
+        Parameters:
+          prescriptions: list of prescription
+          chunk_size: number of prescriptions read in same query
+          read_threads: number of chunk read in parallel
+          preindications: if set, prescriptions of these preindications (a list or `"*"` for all) are read in same pool and a `preindication` column is added, prescription absent of a preindication is skip
+          output: format of result (polars, arrow, reader or relation), if None Sake.output is used
+
+        Return:
+          DataFrame with variants and genotypes of all prescriptions.
+        """
+        targets: list[tuple[str | None, pathlib.Path, pathlib.Path | str]]
+        if preindications is None:
+            targets = [(None, self.prescriptions_path, self.variants_path)]  # type: ignore[list-item]
+        else:
+            prescriptions_template = self._target_template("prescriptions_path")
+            variants_template = self._target_template("variants_path")
+            targets = [
+                (target, pathlib.Path(prescriptions_template.format(target)), variants_template.format(target))
+                for target in self._preindications(preindications)
+            ]
+
+        chunks: list[tuple[str | None, dict[str, typing.Any]]] = []
+        for target, prescriptions_path, variants_path in targets:
+            paths = [prescriptions_path / f"{pid}.parquet" for pid in prescriptions]
+            if target is not None:
+                paths = [path for path in paths if sake.metadata.is_file(path)]
+            chunks.extend(
+                (
+                    target,
                     {
-                        "sample_path": str(self.prescriptions_path / f"{pid}.parquet"),  # type: ignore[operator]
-                        "variant_path": f"{self.variants_path}/*.parquet",
+                        "sample_paths": [str(path) for path in paths[i : i + chunk_size]],
+                        "variant_path": f"{variants_path}/*.parquet",
                     },
-                ).pl(),
+                )
+                for i in range(0, len(paths), chunk_size)
             )
+        if not chunks and preindications is not None:
+            raise ValueError(f"no prescription of {prescriptions} in preindications {preindications}")
+
+        iterator = sake._utils.wrap_iterator(self.activate_tqdm, [chunk for _, chunk in chunks])  # type: ignore[arg-type]
+
+        query = sake._utils.QueryByParams(
+            self._worker_threads(read_threads),
+            "get_variant_of_prescriptions",
+            profile=self.profile,
+        )
+
+        all_variants = self._map(query, iterator, read_threads)
 
-        return polars.concat(all_variants)
+        with self._stage("concat"):
+            if preindications is not None:
+                all_variants = [
+                    df.with_columns(preindication=polars.lit(target)) for (target, _), df in zip(chunks, all_variants)
+                ]
+            result = polars.concat(all_variants)
+        return self._output(result, output)
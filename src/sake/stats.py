@@ -0,0 +1,149 @@
+"""Define structured statistics of Sake method call and of query run by workers.
+
+Time are in nanoseconds since epoch (`time.time_ns`) so statistics build in different processes could be put on same
+timeline, durations are in seconds.
+"""
+
+from __future__ import annotations
+
+# std import
+import contextlib
+import dataclasses
+import os
+import threading
+import time
+import typing
+
+# 3rd party import
+import polars
+import pyarrow
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import collections
+    import pathlib
+
+__all__: list[str] = ["CallStats", "QueryStats", "Stats", "parquet_bytes", "row_count", "worker_id"]
+
+
+def worker_id() -> str:
+    """Get identifier of current worker, process id and thread name."""
+    return f"{os.getpid()}:{threading.current_thread().name}"
+
+
+def parquet_bytes(path: pathlib.Path | str, row_groups: collections.abc.Iterable[int] | None = None) -> int:
+    """Get number of bytes read in a parquet file.
+
+    Parameters:
+      path: parquet file
+      row_groups: index of row groups read, if None whole file is read
+
+    Return:
+      compressed size of row groups read, size of file if row_groups is None and 0 if file didn't exist
+    """
+    if row_groups is None:
+        stat = sake.metadata.file_stat(path)
+        return 0 if stat is None else stat[0]
+
+    metadata = sake.metadata.parquet_metadata(path)
+    return sum(
+        metadata.row_group(row_group).column(column).total_compressed_size
+        for row_group in row_groups
+        for column in range(metadata.num_columns)
+    )
+
+
+def row_count(value: typing.Any) -> int | None:
+    """Get number of row of a Sake method result, None if it's unknown without run query."""
+    if isinstance(value, polars.DataFrame):
+        return value.height
+    if isinstance(value, pyarrow.Table):
+        return value.num_rows
+    return None
+
+
+@dataclasses.dataclass(kw_only=True)
+class Stats:
+    """Statistics common to method call and query."""
+
+    # name of method or query
+    name: str
+    # begin and end of run
+    start: int = dataclasses.field(default_factory=time.time_ns)
+    end: int | None = None
+    # name, begin and end of each stage, a stage could be present multiple time
+    stages: list[tuple[str, int, int]] = dataclasses.field(default_factory=list)
+    rows_in: int | None = None
+    rows_out: int | None = None
+    # parquet files read and number of bytes read in them, only row groups selected by an index or by id statistics
+    # are count
+    files: list[str] = dataclasses.field(default_factory=list)
+    bytes_read: int = 0
+    worker: str = dataclasses.field(default_factory=worker_id)
+
+    @property
+    def duration(self) -> float:
+        """Wall time of run in seconds, 0 if run isn't finish."""
+        return 0.0 if self.end is None else (self.end - self.start) / 1e9
+
+    def durations(self) -> dict[str, float]:
+        """Get wall time in seconds of each stage, time of stage present multiple time are sum."""
+        result: dict[str, float] = {}
+        for name, start, end in self.stages:
+            result[name] = result.get(name, 0.0) + (end - start) / 1e9
+        return result
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> collections.abc.Generator[None, None, None]:
+        """Record begin and end of a stage."""
+        start = time.time_ns()
+        try:
+            yield
+        finally:
+            self.stages.append((name, start, time.time_ns()))
+
+    def add_file(self, path: pathlib.Path | str, bytes_read: int) -> None:
+        """Record a file read, bytes are count each time file is read."""
+        if str(path) not in self.files:
+            self.files.append(str(path))
+        self.bytes_read += bytes_read
+
+    def finish(self, result: typing.Any = None) -> None:
+        """Record end of run and number of row of result."""
+        self.end = time.time_ns()
+        self.rows_out = row_count(result)
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Convert statistics in json serializable dict, with duration and durations of stages."""
+        return {**dataclasses.asdict(self), "duration": self.duration, "durations": self.durations()}
+
+
+@dataclasses.dataclass(kw_only=True)
+class QueryStats(Stats):
+    """Statistics of one query run by [QueryByGroupBy][sake._utils.QueryByGroupBy] or [QueryByParams][sake._utils.QueryByParams]."""
+
+    # partition key of query, e.g. id_part, chromosome or pid_crc
+    key: tuple[typing.Any, ...] = ()
+    # duckdb profile of query (same information as EXPLAIN ANALYZE), only if profile is activate
+    profile: dict[str, typing.Any] | None = None
+
+
+@dataclasses.dataclass(kw_only=True)
+class CallStats(Stats):
+    """Statistics of a Sake method call.
+
+    Files and bytes of queries are added to call files and bytes.
+    """
+
+    queries: list[QueryStats] = dataclasses.field(default_factory=list)
+
+    def add_query(self, query: QueryStats) -> None:
+        """Record statistics of a query run by this call."""
+        self.queries.append(query)
+        for path in query.files:
+            if path not in self.files:
+                self.files.append(path)
+        self.bytes_read += query.bytes_read
@@ -0,0 +1,559 @@
+"""Generate synthetic sake, use to test and benchmark sake at scale without patient data.
+
+Generated sake follow sake layout:
+
+- `{preindication}/variants/{chr}.parquet` with variantplaner like id
+- `{preindication}/genotypes/partitions/id_part={id_part}/0.parquet`
+- `{preindication}/genotypes/samples/{pid_crc}.parquet` and `{preindication}/genotypes/transmissions/{pid_crc}.parquet`
+- `annotations/snpeff/4.3t/{preindication}/{chr}.parquet` (split by chromosome)
+  and `annotations/nvp/1.0/{preindication}.parquet` (not split)
+- `samples/patients.parquet`
+- `{preindication}/cnv/groupby/wisecondor/{type}/{chr}.parquet` and `{preindication}/cnv/samples/{pid_crc}/wisecondor.parquet`
+
+Allele frequency of variants follow a beta law, founders genotypes are draw from allele frequency and children inherit
+one allele of each parent (missing parent allele is draw from allele frequency), plus some de novo variants. Each
+chromosome is generate by a different process with its own random generator, result depend only of seed.
+"""
+
+from __future__ import annotations
+
+# std import
+import concurrent.futures
+import functools
+import multiprocessing
+import os
+import pathlib
+import tempfile
+import typing
+
+# 3rd party import
+import duckdb
+import numpy
+import polars
+
+# project import
+import sake
+
+__all__: list[str] = [
+    "CHROMOSOMES",
+    "OFFSETS",
+    "generate",
+    "generate_patients",
+]
+
+# length of GRCh38 chromosomes
+CHROMOSOMES = {
+    "1": 248_956_422,
+    "2": 242_193_529,
+    "3": 198_295_559,
+    "4": 190_214_555,
+    "5": 181_538_259,
+    "6": 170_805_979,
+    "7": 159_345_973,
+    "8": 145_138_636,
+    "9": 138_394_717,
+    "10": 133_797_422,
+    "11": 135_086_622,
+    "12": 133_275_309,
+    "13": 114_364_328,
+    "14": 107_043_718,
+    "15": 101_991_189,
+    "16": 90_338_345,
+    "17": 83_257_441,
+    "18": 80_373_285,
+    "19": 58_617_616,
+    "20": 64_444_167,
+    "21": 46_709_983,
+    "22": 50_818_468,
+    "X": 156_040_895,
+    "Y": 57_227_415,
+}
+
+# position of chromosome start in variantplaner id, chromosomes are concatenate
+OFFSETS = dict(zip(CHROMOSOMES, numpy.cumsum([0, *CHROMOSOMES.values()])[:-1].tolist()))
+
+# maximal length of indel encode in id, longer variants have an hashed id
+MAX_INDEL = 10
+LONG_INDEL = 50
+
+NUCLEOTIDES = ["A", "C", "G", "T"]
+EFFECTS = ["intron_variant", "missense_variant", "synonymous_variant", "stop_gained", "intergenic_region"]
+IMPACTS = {
+    "intron_variant": "MODIFIER",
+    "missense_variant": "MODERATE",
+    "synonymous_variant": "LOW",
+    "stop_gained": "HIGH",
+    "intergenic_region": "MODIFIER",
+}
+ROLES = ("patient", "mere", "pere")
+
+
+def generate_patients(
+    samples: int,
+    families: tuple[float, float, float] = (0.1, 0.1, 0.8),
+    seed: int = 42,
+) -> polars.DataFrame:
+    """Generate samples information.
+
+    Each family have a patient (index) and could have a mother and a father. Sample name is pid_crc follow by 0 for
+    index, 1 for mother and 2 for father.
+
+    Parameters:
+      samples: number of samples
+      families: fraction of singleton, duo (index and mother) and trio families
+      seed: seed of random generator
+
+    Return:
+      DataFrame with sample, kindex, gender, link, affected, pid_crc and preindication columns.
+    """
+    if samples < 1:
+        raise ValueError(f"samples must be upper than 0 not {samples}")
+    if len(families) != len(ROLES) or any(fraction < 0 for fraction in families) or sum(families) <= 0:
+        raise ValueError(f"families must be three positive fraction not {families}")
+
+    rng = numpy.random.default_rng(seed)
+    probabilities = numpy.array(families, dtype=numpy.float64) / sum(families)
+
+    patients: dict[str, list[typing.Any]] = {
+        "sample": [],
+        "kindex": [],
+        "gender": [],
+        "link": [],
+        "affected": [],
+        "pid_crc": [],
+    }
+    family = 0
+    while len(patients["sample"]) < samples:
+        size = min(int(rng.choice(len(ROLES), p=probabilities)) + 1, samples - len(patients["sample"]))
+        pid = f"{family:06X}"
+        for member in range(size):
+            patients["sample"].append(f"{pid}{member}")
+            patients["kindex"].append(member == 0)
+            patients["gender"].append(("F" if rng.random() < 0.5 else "M", "F", "M")[member])  # noqa: PLR2004
+            patients["link"].append(ROLES[member])
+            patients["affected"].append(member == 0 or bool(rng.random() < 0.1))  # noqa: PLR2004
+            patients["pid_crc"].append(pid)
+        family += 1
+
+    return polars.DataFrame(patients).with_columns(preindication=polars.lit("p1"))
+
+
+def _sequences(codes: numpy.ndarray, lengths: numpy.ndarray) -> polars.Series:
+    """Convert nucleotides code (one row by sequence) in string, only lengths first nucleotides are used."""
+    if codes.shape[1] == 0:
+        return polars.Series([""] * len(lengths), dtype=polars.String)
+
+    frame = polars.DataFrame({f"b{i}": codes[:, i] for i in range(codes.shape[1])}).with_columns(
+        length=polars.Series(lengths),
+    )
+    return frame.select(
+        polars.concat_str(
+            [
+                polars.when(polars.col("length") > i).then(
+                    polars.col(f"b{i}").replace_strict(range(4), NUCLEOTIDES, return_dtype=polars.String),
+                )
+                for i in range(codes.shape[1])
+            ],
+            ignore_nulls=True,
+        ),
+    ).to_series()
+
+
+def _variants(
+    rng: numpy.random.Generator,
+    chrom: str,
+    variants: int,
+    indel_rate: float,
+    long_rate: float,
+) -> polars.DataFrame:
+    """Generate variants of a chromosome sorted by id.
+
+    Variants are snv, insertion or deletion. Id is chromosome offset plus position shift of 31 bits with a code of
+    alleles in lower bits, like in variantplaner, long indel have an id with higher bit set.
+    """
+    positions = rng.integers(1, CHROMOSOMES[chrom], variants, dtype=numpy.uint64)
+    kind = rng.choice(3, variants, p=[1 - indel_rate, indel_rate / 2, indel_rate / 2]).astype(numpy.uint64)
+    is_long = (kind != 0) & (rng.random(variants) < long_rate)
+    length = numpy.where(
+        is_long,
+        rng.integers(MAX_INDEL + 1, LONG_INDEL + 1, variants),
+        numpy.where(kind == 0, 0, rng.integers(1, MAX_INDEL + 1, variants)),
+    ).astype(numpy.uint64)
+
+    anchor = rng.integers(0, 4, variants, dtype=numpy.uint64)
+    snv = (anchor + rng.integers(1, 4, variants, dtype=numpy.uint64)) % 4
+    extra = rng.integers(0, 4, (variants, LONG_INDEL if is_long.any() else MAX_INDEL), dtype=numpy.uint8)
+
+    # kind (2 bits), length (4 bits), anchor (2 bits), snv alternative (2 bits) and extra nucleotides (20 bits)
+    packed = numpy.zeros(variants, dtype=numpy.uint64)
+    for i in range(MAX_INDEL):
+        packed |= extra[:, i].astype(numpy.uint64) << numpy.uint64(2 * i)
+    packed &= (numpy.uint64(1) << (numpy.uint64(2) * numpy.minimum(length, MAX_INDEL))) - numpy.uint64(1)
+    code = (kind << numpy.uint64(28)) | (length << numpy.uint64(24)) | (anchor << numpy.uint64(22))
+    code |= (numpy.where(kind == 0, snv, 0).astype(numpy.uint64) << numpy.uint64(20)) | packed
+
+    ids = ((positions + numpy.uint64(OFFSETS[chrom])) << numpy.uint64(31)) | code
+    ids[is_long] = rng.integers(0, 2**63, int(is_long.sum()), dtype=numpy.uint64) | numpy.uint64(2**63)
+
+    ids, index = numpy.unique(ids, return_index=True)
+    anchor_str = polars.Series(numpy.array(NUCLEOTIDES)[anchor[index]])
+    extra_str = _sequences(extra[index], length[index])
+    kind = kind[index]
+
+    return polars.DataFrame(
+        {
+            "id": ids,
+            "chr": polars.Series([chrom] * len(ids), dtype=polars.String),
+            "pos": positions[index],
+            "ref": polars.select(
+                polars.when(polars.Series(kind == 2))  # noqa: PLR2004
+                .then(anchor_str + extra_str)
+                .otherwise(anchor_str),
+            ).to_series(),
+            "alt": polars.select(
+                polars.when(polars.Series(kind == 0))
+                .then(polars.Series(numpy.array(NUCLEOTIDES)[snv[index]]))
+                .when(polars.Series(kind == 1))
+                .then(anchor_str + extra_str)
+                .otherwise(anchor_str),
+            ).to_series(),
+        },
+    )
+
+
+def _genotypes(
+    rng: numpy.random.Generator,
+    *,
+    allele_frequency: numpy.ndarray,
+    founders: numpy.ndarray,
+    children: numpy.ndarray,
+    parents: numpy.ndarray,
+    de_novo_rate: float,
+) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """Draw genotypes of samples.
+
+    Parameters:
+      allele_frequency: frequency of each variant
+      founders: index of samples without parents
+      children: index of samples with at least one parent
+      parents: index of mother and father of each children, -1 if parent is missing
+
+    Return:
+      variant index, sample index and gt of each genotype
+    """
+    n_samples = int(max(founders.max(initial=-1), children.max(initial=-1))) + 1
+
+    # each allele of founders is draw from allele frequency
+    alleles = rng.binomial(2 * len(founders), allele_frequency)
+    variant = numpy.repeat(numpy.arange(len(allele_frequency)), alleles)
+    sample = founders[rng.integers(0, 2 * len(founders), len(variant)) // 2]
+    keys = [variant * n_samples + sample]
+
+    # each parent transmit one of his alleles, missing parent allele is draw from allele frequency
+    for column in range(parents.shape[1]):
+        child_of = numpy.full(n_samples, -1)
+        present = parents[:, column] >= 0
+        child_of[parents[present, column]] = children[present]
+
+        founder_keys, founder_gt = numpy.unique(keys[0], return_counts=True)
+        founder_gt = numpy.minimum(founder_gt, 2)
+        child = child_of[founder_keys % n_samples]
+        transmit = (child >= 0) & (rng.random(len(child)) < founder_gt / 2)
+        keys.append(founder_keys[transmit] // n_samples * n_samples + child[transmit])
+
+        orphans = children[~present]
+        if len(orphans):
+            alleles = rng.binomial(len(orphans), allele_frequency)
+            variant = numpy.repeat(numpy.arange(len(allele_frequency)), alleles)
+            keys.append(variant * n_samples + orphans[rng.integers(0, len(orphans), len(variant))])
+
+    if len(children):
+        variant = numpy.flatnonzero(rng.random(len(allele_frequency)) < de_novo_rate)
+        keys.append(variant * n_samples + children[rng.integers(0, len(children), len(variant))])
+
+    keys_all, gt = numpy.unique(numpy.concatenate(keys), return_counts=True)
+    return keys_all // n_samples, keys_all % n_samples, numpy.minimum(gt, 2).astype(numpy.uint8)
+
+
+def _generate_chromosome(
+    *,
+    path: pathlib.Path,
+    tmp_path: pathlib.Path,
+    chrom: str,
+    variants: int,
+    patients: polars.DataFrame,
+    preindication: str,
+    seed: numpy.random.SeedSequence,
+    allele_frequency: tuple[float, float],
+    indel_rate: float,
+    long_rate: float,
+    de_novo_rate: float,
+) -> None:
+    """Generate variants, annotations and genotypes of a chromosome.
+
+    Genotypes and not split annotations are write in tmp_path, they are merged after all chromosomes generation.
+    """
+    rng = numpy.random.default_rng(seed)
+
+    data = _variants(rng, chrom, variants, indel_rate, long_rate)
+    data.write_parquet(path / preindication / "variants" / f"{chrom}.parquet")
+
+    effects = numpy.array(EFFECTS)[rng.integers(0, len(EFFECTS), data.height)]
+    data.select(
+        "id",
+        effect=polars.Series(effects),
+        impact=polars.Series(effects).replace_strict(IMPACTS, return_dtype=polars.String),
+        gene_name=polars.format("GENE{}_{}", polars.col("chr"), polars.col("pos") // 100_000),
+    ).write_parquet(path / "annotations" / "snpeff" / "4.3t" / preindication / f"{chrom}.parquet")
+    data.select(
+        "id",
+        score=polars.Series(rng.random(data.height)),
+        pathogenic=polars.Series(rng.random(data.height) < 0.05),  # noqa: PLR2004
+    ).write_parquet(tmp_path / "nvp" / f"{chrom}.parquet")
+
+    samples = patients.get_column("sample")
+    index = {name: i for i, name in enumerate(samples)}
+    children = patients.filter(polars.col("link") == "patient", polars.col("pid_crc").is_duplicated())
+    parents = numpy.array(
+        [
+            [index.get(f"{pid}{member}", -1) for member in range(1, len(ROLES))]
+            for pid in children.get_column("pid_crc")
+        ],
+        dtype=numpy.int64,
+    ).reshape(-1, len(ROLES) - 1)
+    children_index = numpy.array([index[name] for name in children.get_column("sample")], dtype=numpy.int64)
+    founders = numpy.setdiff1d(numpy.arange(len(samples)), children_index)
+
+    frequency = rng.beta(*allele_frequency, data.height)
+    variant, sample, gt = _genotypes(
+        rng,
+        allele_frequency=frequency,
+        founders=founders,
+        children=children_index,
+        parents=parents,
+        de_novo_rate=de_novo_rate,
+    )
+
+    dp = rng.poisson(30, len(gt)).astype(numpy.uint32) + 1
+    alt_depth = rng.binomial(dp, numpy.where(gt == 1, 0.5, 0.98)).astype(numpy.uint32)
+    genotypes = polars.DataFrame(
+        {
+            "id": data.get_column("id").gather(variant),
+            "sample": samples.gather(sample),
+            "gt": gt,
+            "ad": numpy.stack([dp - alt_depth, alt_depth], axis=1),
+            "dp": dp,
+            "gq": numpy.where(rng.random(len(gt)) < 0.8, 99, rng.integers(10, 99, len(gt))).astype(numpy.uint32),  # noqa: PLR2004
+        },
+        schema_overrides={"ad": polars.Array(polars.UInt32, 2)},
+    ).with_columns(polars.col("ad").cast(polars.List(polars.UInt32)))
+
+    sake.utils.add_id_part(genotypes).with_columns(polars.col("id_part").cast(polars.UInt64)).write_parquet(
+        tmp_path / "genotypes" / f"{chrom}.parquet",
+    )
+
+
+def _generate_cnv(
+    rng: numpy.random.Generator,
+    path: pathlib.Path,
+    patients: polars.DataFrame,
+    per_sample: int,
+) -> None:
+    """Write wisecondor cnv group by type and chromosome and by prescription."""
+    samples = numpy.repeat(patients.get_column("sample").to_numpy(), per_sample)
+    chroms = numpy.array(list(CHROMOSOMES))[rng.integers(0, len(CHROMOSOMES), len(samples))]
+    starts = rng.integers(1, 40_000, len(samples)) * 1_000 + 2
+    types = numpy.where(rng.random(len(samples)) < 0.5, "DEL", "DUP")  # noqa: PLR2004
+    sign = numpy.where(types == "DEL", -1, 1)
+
+    cnv = polars.DataFrame(
+        {
+            "chr": chroms,
+            "start": starts,
+            "end": starts + rng.integers(10, 5_000, len(samples)) * 1_000,
+            "type": types,
+            "tool": ["wisecondor"] * len(samples),
+            "sample": samples,
+            "gt": numpy.ones(len(samples), dtype=numpy.uint32),
+            "zs": sign * rng.uniform(5, 100, len(samples)),
+            "rt": sign * rng.uniform(0, 1, len(samples)),
+        },
+    ).join(patients.select("sample", "pid_crc"), on="sample", maintain_order="left")
+
+    # each file is write even if empty, get_cnv fail on missing file
+    for sv_type in ("DEL", "DUP"):
+        (path / "groupby" / "wisecondor" / sv_type).mkdir(parents=True, exist_ok=True)
+        for chrom in CHROMOSOMES:
+            cnv.filter(polars.col("type") == sv_type, polars.col("chr") == chrom).drop("pid_crc").write_parquet(
+                path / "groupby" / "wisecondor" / sv_type / f"{chrom}.parquet",
+            )
+
+    for (pid,), data in cnv.group_by(["pid_crc"]):
+        (path / "samples" / str(pid)).mkdir(parents=True, exist_ok=True)
+        data.drop("pid_crc").write_parquet(path / "samples" / str(pid) / "wisecondor.parquet")
+
+
+def generate(
+    path: pathlib.Path,
+    *,
+    variants: int = 10_000,
+    samples: int = 30,
+    preindication: str = "germline",
+    seed: int = 42,
+    allele_frequency: tuple[float, float] = (0.2, 20.0),
+    families: tuple[float, float, float] = (0.1, 0.1, 0.8),
+    indel_rate: float = 0.1,
+    long_rate: float = 0.01,
+    de_novo_rate: float = 0.001,
+    cnv_per_sample: int = 5,
+    threads: int = 1,
+) -> None:
+    """Write a synthetic sake in path.
+
+    Parameters:
+      path: directory of sake
+      variants: number of variants (a few could be drop if two variants get same id)
+      samples: number of samples
+      preindication: name of sake target
+      seed: seed of random generators, same seed generate same sake
+      allele_frequency: alpha and beta parameter of beta law of variants allele frequency
+      families: fraction of singleton, duo and trio families
+      indel_rate: fraction of insertion and deletion
+      long_rate: fraction of indel longer than 10 nucleotides, with an hashed id
+      de_novo_rate: probability of a variant to be a de novo variant of a child
+      cnv_per_sample: number of cnv of each sample
+      threads: number of chromosomes generate in parallel
+    """
+    if variants < 0:
+        raise ValueError(f"variants must be positive not {variants}")
+    if not 0 <= indel_rate <= 1 or not 0 <= long_rate <= 1 or not 0 <= de_novo_rate <= 1:
+        raise ValueError("indel_rate, long_rate and de_novo_rate must be between 0 and 1")
+
+    seeds = numpy.random.SeedSequence(seed).spawn(len(CHROMOSOMES) + 1)
+    rng = numpy.random.default_rng(seeds[-1])
+
+    target = path / preindication
+    for directory in (
+        target / "variants",
+        target / "genotypes" / "partitions",
+        target / "genotypes" / "samples",
+        target / "genotypes" / "transmissions",
+        path / "annotations" / "snpeff" / "4.3t" / preindication,
+        path / "annotations" / "nvp" / "1.0",
+        path / "samples",
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    patients = generate_patients(samples, families, seed)
+    patients.write_parquet(path / "samples" / "patients.parquet")
+
+    lengths = numpy.array(list(CHROMOSOMES.values()), dtype=numpy.float64)
+    counts = rng.multinomial(variants, lengths / lengths.sum())
+    jobs = list(zip(CHROMOSOMES, counts.tolist(), seeds))
+
+    # scratch files are removed even if generation fail
+    with tempfile.TemporaryDirectory(dir=path) as tmp_dir:
+        tmp_path = pathlib.Path(tmp_dir)
+        (tmp_path / "genotypes").mkdir()
+        (tmp_path / "nvp").mkdir()
+
+        worker = functools.partial(
+            _generate_chromosome,
+            path=path,
+            tmp_path=tmp_path,
+            patients=patients,
+            preindication=preindication,
+            allele_frequency=allele_frequency,
+            indel_rate=indel_rate,
+            long_rate=long_rate,
+            de_novo_rate=de_novo_rate,
+        )
+        if threads > 1:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=threads,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = [
+                    executor.submit(worker, chrom=chrom, variants=count, seed=chrom_seed)
+                    for chrom, count, chrom_seed in jobs
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            for chrom, count, chrom_seed in jobs:
+                worker(chrom=chrom, variants=count, seed=chrom_seed)
+
+        _merge_genotypes(path, tmp_path, target, preindication, threads)
+
+    _generate_cnv(rng, target / "cnv", patients, cnv_per_sample)
+
+
+def _merge_genotypes(
+    path: pathlib.Path,
+    tmp_path: pathlib.Path,
+    target: pathlib.Path,
+    preindication: str,
+    threads: int,
+) -> None:
+    """Write genotypes partitions, samples genotypes, transmissions and not split annotations with duckdb."""
+    genotypes_path = f"{tmp_path / 'genotypes'}/*.parquet"
+    patients_path = str(path / "samples" / "patients.parquet")
+
+    db = duckdb.connect()
+    db.execute(f"SET threads = {max(threads, 1)}")
+    db.execute(f"SET temp_directory = '{tmp_path / 'duckdb'}'")
+
+    db.execute(
+        f"""COPY (
+            SELECT * FROM read_parquet('{tmp_path / "nvp"}/*.parquet') ORDER BY id
+        ) TO '{path / "annotations" / "nvp" / "1.0" / f"{preindication}.parquet"}' (FORMAT parquet)""",  # noqa: S608
+    )
+
+    # partition by a copy of id_part, PARTITION_BY remove its column from files (WRITE_PARTITION_COLUMNS is too
+    # recent for duckdb 1.1)
+    db.execute(
+        f"""COPY (
+            SELECT *, id_part AS part FROM read_parquet('{genotypes_path}') ORDER BY id, sample
+        ) TO '{tmp_path / "partitions"}' (FORMAT parquet, PARTITION_BY (part), FILENAME_PATTERN '{{i}}')""",  # noqa: S608
+    )
+
+    db.execute(
+        f"""COPY (
+            SELECT g.id, g.sample, g.gt, g.ad, g.dp, g.gq, p.pid_crc
+            FROM read_parquet('{genotypes_path}') AS g JOIN read_parquet('{patients_path}') AS p ON g.sample = p.sample
+            ORDER BY g.id, g.sample
+        ) TO '{tmp_path / "samples"}' (FORMAT parquet, PARTITION_BY (pid_crc), FILENAME_PATTERN '{{i}}')""",  # noqa: S608
+    )
+
+    role = f"""(
+        SELECT g.id, g.gt, g.ad, g.dp, g.gq, p.pid_crc
+        FROM read_parquet('{genotypes_path}') AS g JOIN read_parquet('{patients_path}') AS p ON g.sample = p.sample
+        WHERE p.link = '{{link}}'
+    )"""  # noqa: S608
+    db.execute(
+        f"""COPY (
+            SELECT
+                i.id,
+                i.gt AS index_gt, i.ad AS index_ad, i.dp AS index_dp, i.gq AS index_gq,
+                m.gt AS mother_gt, m.ad AS mother_ad, m.dp AS mother_dp, m.gq AS mother_gq,
+                f.gt AS father_gt, f.ad AS father_ad, f.dp AS father_dp, f.gq AS father_gq,
+                chr(33 + i.gt) || chr(33 + coalesce(m.gt, 0)) || chr(33 + coalesce(f.gt, 0)) AS origin,
+                i.pid_crc
+            FROM {role.format(link="patient")} AS i
+            LEFT JOIN {role.format(link="mere")} AS m ON i.id = m.id AND i.pid_crc = m.pid_crc
+            LEFT JOIN {role.format(link="pere")} AS f ON i.id = f.id AND i.pid_crc = f.pid_crc
+            ORDER BY i.id
+        ) TO '{tmp_path / "transmissions"}' (FORMAT parquet, PARTITION_BY (pid_crc), FILENAME_PATTERN '{{i}}')""",  # noqa: S608
+    )
+    db.close()
+
+    if (tmp_path / "partitions").is_dir():
+        for partition in (tmp_path / "partitions").iterdir():
+            os.replace(partition, target / "genotypes" / "partitions" / partition.name.replace("part=", "id_part="))
+
+    for name in ("samples", "transmissions"):
+        if not (tmp_path / name).is_dir():
+            continue
+        for partition in (tmp_path / name).iterdir():
+            pid = partition.name.removeprefix("pid_crc=")
+            os.replace(partition / "0.parquet", target / "genotypes" / name / f"{pid}.parquet")
@@ -0,0 +1,121 @@
+"""Define Tracer, an export of Sake method call statistics in Chrome trace format.
+
+Trace could be open offline in [Perfetto](https://ui.perfetto.dev) or `chrome://tracing`. Each method call, stage of
+call (`queries`, `concat`, ...), query run by a worker and stage of query (`prune`, `scan`, ...) is a slice on timeline
+of thread that run it.
+"""
+
+from __future__ import annotations
+
+# std import
+import json
+import os
+import threading
+import typing
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import pathlib
+
+    # project import
+    import sake
+
+__all__: list[str] = ["Tracer"]
+
+
+class Tracer:
+    """Collect statistics of Sake method call as Chrome trace events.
+
+    Tracer is a statistics callback, activate it with `Sake(..., stats_callbacks=[tracer])` and write trace with
+    [save][sake.trace.Tracer.save].
+    """
+
+    def __init__(self) -> None:
+        """Create an empty tracer."""
+        self.events: list[dict[str, typing.Any]] = []
+        self.__threads: dict[tuple[int, str], int] = {}
+        self.__lock = threading.Lock()
+
+    def __call__(self, stats: sake.stats.CallStats) -> None:
+        """Add events of a method call."""
+        with self.__lock:
+            thread = self.__thread(stats.worker)
+            args: dict[str, typing.Any] = {
+                "rows_in": stats.rows_in,
+                "rows_out": stats.rows_out,
+                "files": len(stats.files),
+                "bytes_read": stats.bytes_read,
+                "queries": len(stats.queries),
+            }
+            self.__add(stats.name, "call", thread, (stats.start, stats.end), args)
+            for name, start, end in stats.stages:
+                self.__add(name, "stage", thread, (start, end), {"method": stats.name})
+
+            for query in stats.queries:
+                thread = self.__thread(query.worker)
+                query_args: dict[str, typing.Any] = {
+                    "method": stats.name,
+                    "worker": query.worker,
+                    "partition": list(query.key),
+                    "rows_in": query.rows_in,
+                    "rows_out": query.rows_out,
+                    "files": query.files,
+                    "bytes_read": query.bytes_read,
+                }
+                self.__add(query.name, "query", thread, (query.start, query.end), query_args)
+                for name, start, end in query.stages:
+                    self.__add(name, "query_stage", thread, (start, end), query_args)
+
+    def __thread(self, worker: str) -> tuple[int, int]:
+        """Get process and thread id of a worker, thread id is a number in order of apparition."""
+        pid_str, _, thread_name = worker.partition(":")
+        pid = int(pid_str)
+        if (pid, thread_name) not in self.__threads:
+            if all(key[0] != pid for key in self.__threads):
+                process_name = "main" if pid == os.getpid() else f"worker {pid}"
+                self.events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": process_name}})
+            tid = self.__threads[(pid, thread_name)] = len(self.__threads)
+            self.events.append(
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}},
+            )
+
+        return (pid, self.__threads[(pid, thread_name)])
+
+    def __add(
+        self,
+        name: str,
+        category: str,
+        thread: tuple[int, int],
+        span: tuple[int, int | None],
+        args: dict[str, typing.Any],
+    ) -> None:
+        """Add a complete event (begin and duration) on thread, time in nanoseconds are convert in microseconds."""
+        start, end = span
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "pid": thread[0],
+                "tid": thread[1],
+                "ts": start / 1e3,
+                "dur": 0.0 if end is None else (end - start) / 1e3,
+                "args": args,
+            },
+        )
+
+    def clear(self) -> None:
+        """Remove all events."""
+        with self.__lock:
+            self.events = []
+            self.__threads = {}
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        """Get trace in Chrome trace format."""
+        with self.__lock:
+            return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def save(self, path: pathlib.Path | str) -> None:
+        """Write trace in a json file."""
+        with open(path, "w") as fh_out:
+            json.dump(self.to_dict(), fh_out)
@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 # std import
+import concurrent.futures
 import pathlib
+import typing
 
 # 3rd party import
+import duckdb
+import polars
+import pytest
 from tqdm.auto import tqdm
 
 # project import
@@ -67,3 +72,95 @@ def test_fix_annotation_path() -> None:
     assert result is not None
     assert result[0] == path / "nc" / "1.parquet"
     assert result[1]
+
+
+def test_id_filter(tmp_path: pathlib.Path) -> None:
+    """Check id filter condition."""
+    assert sake._utils.id_filter(polars.Series("id", [], dtype=polars.UInt64)) == "false"
+    assert sake._utils.id_filter(polars.Series("id", [3, 1, None, 3], dtype=polars.UInt64)) == (
+        "id in (1::UBIGINT, 3::UBIGINT)"
+    )
+    assert sake._utils.id_filter(polars.Series("id", [2, 1], dtype=polars.UInt64), "g.id") == (
+        "g.id in (1::UBIGINT, 2::UBIGINT)"
+    )
+
+    ids = polars.Series("id", range(sake._utils.ID_LIST_MAX + 1), dtype=polars.UInt64)
+    assert sake._utils.id_filter(ids) == f"id between 0::UBIGINT and {sake._utils.ID_LIST_MAX}::UBIGINT"
+
+    assert sake._utils.id_filter(polars.Series("id", [2**63 + 1, 2, 2**63 + 5], dtype=polars.UInt64)) == (
+        f"(id in (2::UBIGINT) or id between {2**63 + 1}::UBIGINT and {2**63 + 5}::UBIGINT)"
+    )
+
+    # condition could be push in scan of a joined DataFrame
+    _data = polars.DataFrame({"id": [1, 2, 2**63 + 5]}, schema={"id": polars.UInt64})
+    condition = sake._utils.id_filter(polars.Series("id", [2, 2**63 + 5, 2**63 + 7], dtype=polars.UInt64))
+    assert duckdb.sql(f"select id from _data where {condition} order by id").fetchall() == [(2,), (2**63 + 5,)]  # noqa: S608
+
+    # id with bit 63 set must be compare as unsigned
+    path = tmp_path / "ids.parquet"
+    polars.DataFrame({"id": [1, 2**63 + 5, 2**64 - 1]}, schema={"id": polars.UInt64}).write_parquet(
+        path,
+        row_group_size=1,
+    )
+    for values in ([2**63 + 5, 2**64 - 1], [*range(10, sake._utils.ID_LIST_MAX + 10), 2**63 + 5, 2**64 - 1]):
+        condition = sake._utils.id_filter(polars.Series("id", values, dtype=polars.UInt64))
+        result = duckdb.sql(f"select id from read_parquet('{path}') where {condition} order by id").fetchall()  # noqa: S608
+        assert result == [(2**63 + 5,), (2**64 - 1,)]
+
+
+def test_set_thread_cursor() -> None:
+    """Check thread worker cursor get connection settings."""
+    database = duckdb.connect(":memory:")
+
+    def setting() -> typing.Any:
+        connection = sake._utils.get_connection(1)
+        return connection.sql("select current_setting('parquet_metadata_cache')").fetchall()[0][0]
+
+    with concurrent.futures.ThreadPoolExecutor(
+        1,
+        initializer=sake._utils.set_thread_cursor,
+        initargs=(database,),
+    ) as pool:
+        assert pool.submit(setting).result() is True
+
+
+def test_disable_join_in_filter() -> None:
+    """Check dynamic filter is disable only during query on hashed ids."""
+    connection = duckdb.connect(":memory:")
+
+    def setting() -> typing.Any:
+        return connection.sql("select current_setting('dynamic_or_filter_threshold')").fetchall()[0][0]
+
+    default = setting()
+    assert default != 0
+
+    with sake._utils.disable_join_in_filter(connection, polars.Series("id", [1, 2], dtype=polars.UInt64)):
+        assert setting() == default
+
+    with sake._utils.disable_join_in_filter(connection, polars.Series("id", [1, 2**63 + 5], dtype=polars.UInt64)):
+        assert setting() == 0
+    assert setting() == default
+
+
+def test_quote_identifier() -> None:
+    """Check identifier quote."""
+    assert sake._utils.quote_identifier("gnomad-v3_AF") == '"gnomad-v3_AF"'
+    assert sake._utils.quote_identifier('a"b') == '"a""b"'
+
+    name = sake._utils.quote_identifier('1st.col "x"')
+    assert duckdb.sql(f"select 1 as {name}").columns == ['1st.col "x"']
+
+
+def test_query_parameter_columns() -> None:
+    """Check parameter columns are added to result and never overwrite a column."""
+    path = "tests/data/germline/genotypes/partitions/id_part={}/0.parquet"
+    data = polars.read_parquet(path.format(0), hive_partitioning=False).select("id").unique()
+
+    query = sake._utils.QueryByGroupBy(1, path, "genotype_query", parameter_columns={"part": 0})
+    result = query(((0,), data))
+    assert result is not None
+    assert result.get_column("part").unique().to_list() == [0]
+
+    query = sake._utils.QueryByGroupBy(1, path, "genotype_query", parameter_columns={"sample": 0})
+    with pytest.raises(ValueError, match="already in result"):
+        query(((0,), data))
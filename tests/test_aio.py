@@ -0,0 +1,168 @@
+"""Test aio submodule."""
+
+from __future__ import annotations
+
+# std import
+import asyncio
+import pathlib
+import threading
+import time
+import typing
+
+# 3rd party import
+import polars
+import polars.testing
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # 3rd party import
+    import pytest
+
+SAKE_PATH = pathlib.Path("tests/data")
+
+
+def test_async_sake() -> None:
+    """Check awaitable methods give same result than Sake."""
+    database = sake.Sake(SAKE_PATH, "germline", threads=2)
+    variants = database.get_interval("X", 47115191, 99009863)
+    genotypes = database.add_genotypes(variants)
+
+    async def run() -> list[polars.DataFrame]:
+        async with sake.aio.AsyncSake(database, max_workers=3) as async_database:
+            results = await asyncio.gather(
+                async_database.get_interval("X", 47115191, 99009863),
+                async_database.add_genotypes(variants, read_threads=2),
+                async_database.add_genotypes(variants, read_threads=1),
+                async_database.get_variant_of_prescription("AAAA"),
+            )
+            results.append(polars.concat([df async for df in async_database.iter_genotypes(variants)]))
+
+            return results
+
+    interval, parallel, serial, prescription, iterated = asyncio.run(run())
+
+    polars.testing.assert_frame_equal(interval, variants)
+    polars.testing.assert_frame_equal(parallel, genotypes, check_row_order=False)
+    polars.testing.assert_frame_equal(serial, genotypes, check_row_order=False)
+    polars.testing.assert_frame_equal(iterated, genotypes, check_row_order=False)
+    assert prescription.height > 0
+
+
+def test_single_flight() -> None:
+    """Check identical call in progress are run once."""
+    calls: list[sake.stats.CallStats] = []
+    database = sake.Sake(SAKE_PATH, "germline", threads=2, stats_callbacks=[calls.append])
+    variants = database.get_interval("X", 47115191, 99009863)
+    calls.clear()
+
+    async def run() -> list[polars.DataFrame]:
+        async_database = sake.aio.AsyncSake(database, max_workers=2)
+        results = await asyncio.gather(*(async_database.add_genotypes(variants) for _ in range(5)))
+        # finished call isn't reused
+        results.append(await async_database.add_genotypes(variants))
+        # other arguments or input aren't shared
+        results.append(await async_database.add_genotypes(variants.head(2)))
+        # reader couldn't be shared
+        await asyncio.gather(*(async_database.get_interval("X", 47115191, 99009863, output="reader") for _ in range(2)))
+        # argument that isn't a json scalar or a polars frame couldn't be part of key
+        comment = polars.lit("a").alias("comment")
+        await asyncio.gather(*(async_database.get_interval("X", 47115191, 99009863, comment) for _ in range(2)))
+        await async_database.close()
+        return results
+
+    results = asyncio.run(run())
+
+    assert all(result is results[0] for result in results[:5])
+    assert results[5] is not results[0]
+    polars.testing.assert_frame_equal(results[5], results[0], check_row_order=False)
+    assert results[6].height < results[0].height
+    assert [call.name for call in calls] == ["add_genotypes"] * 3 + ["get_interval"] * 4
+
+
+def test_cancel() -> None:
+    """Check cancelled call."""
+    calls: list[str] = []
+    release = threading.Event()
+
+    def callback(stats: sake.stats.CallStats) -> None:
+        calls.append(stats.name)
+        if stats.name == "get_interval":
+            release.wait(10)
+
+    database = sake.Sake(SAKE_PATH, "germline", threads=1, stats_callbacks=[callback])
+    release.set()
+    variants = database.get_interval("X", 47115191, 99009863)
+    calls.clear()
+    release.clear()
+
+    async def run() -> tuple[polars.DataFrame, polars.DataFrame]:
+        async_database = sake.aio.AsyncSake(database, max_workers=1)
+        # block the only worker
+        blocker = asyncio.ensure_future(async_database.get_interval("X", 47115191, 99009863))
+        await asyncio.sleep(0.1)
+
+        # call cancelled by its only caller isn't run
+        cancelled = asyncio.ensure_future(async_database.add_variants(variants.select("id")))
+        # call cancelled by one of its callers is run for other caller
+        first = asyncio.ensure_future(async_database.add_genotypes(variants))
+        second = asyncio.ensure_future(async_database.add_genotypes(variants))
+        await asyncio.sleep(0.1)
+        cancelled.cancel()
+        first.cancel()
+        await asyncio.sleep(0.1)
+
+        release.set()
+        result = await second
+        await asyncio.gather(cancelled, first, return_exceptions=True)
+        assert cancelled.cancelled()
+        assert first.cancelled()
+
+        await async_database.close()
+        return (await blocker, result)
+
+    interval, genotypes = asyncio.run(run())
+
+    polars.testing.assert_frame_equal(interval, variants)
+    assert genotypes.height > 0
+    assert calls == ["get_interval", "add_genotypes"]
+
+
+def test_cancel_running(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check running call cancelled by all its callers is interrupted."""
+    database = sake.Sake(SAKE_PATH, "germline", threads=2)
+    variants = database.get_interval("X", 47115191, 99009863)
+    prescription = database.get_variant_of_prescription("AAAA")
+    genotypes = database.add_genotypes(variants)
+
+    # queries that run during minutes
+    slow = "(select count(*) from range(100000000000)) as slow"
+    for name in ("get_interval", "get_interval_slice", "genotype_query"):
+        monkeypatch.setitem(sake.QUERY, name, sake.QUERY[name].replace("as v", f"as v, {slow}"))
+
+    async def run() -> polars.DataFrame:
+        async_database = sake.aio.AsyncSake(database, max_workers=3)
+        interval = asyncio.ensure_future(async_database.get_interval("X", 47115191, 99009863))
+        partitions = asyncio.ensure_future(async_database.add_genotypes(variants))
+        other = asyncio.ensure_future(async_database.get_variant_of_prescription("AAAA"))
+        await asyncio.sleep(0.5)
+
+        interval.cancel()
+        partitions.cancel()
+        await asyncio.gather(interval, partitions, return_exceptions=True)
+        assert interval.cancelled()
+        assert partitions.cancelled()
+
+        # close wait end of calls in progress, call of other caller isn't interrupted
+        await async_database.close()
+        return await other
+
+    begin = time.monotonic()
+    result = asyncio.run(run())
+    assert time.monotonic() - begin < 30
+    polars.testing.assert_frame_equal(result, prescription, check_row_order=False)
+
+    # database stay usable
+    monkeypatch.undo()
+    polars.testing.assert_frame_equal(database.add_genotypes(variants), genotypes, check_row_order=False)
@@ -0,0 +1,94 @@
+"""Test cache submodule."""
+
+from __future__ import annotations
+
+# std import
+import os
+import shutil
+import typing
+
+# 3rd party import
+import polars
+import polars.testing
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import pathlib
+
+
+def test_key(tmp_path: pathlib.Path) -> None:
+    """Check key change with arguments, input and files."""
+    path = tmp_path / "file.parquet"
+    data = polars.DataFrame({"id": [1, 2, 3]})
+    data.write_parquet(path)
+
+    key = sake.cache.ResultCache.key("method", {"a": 1, "b": [1, 2]}, [data], [path])
+    assert key == sake.cache.ResultCache.key("method", {"b": [1, 2], "a": 1}, [data.clone()], [path])
+    assert key != sake.cache.ResultCache.key("other", {"a": 1, "b": [1, 2]}, [data], [path])
+    assert key != sake.cache.ResultCache.key("method", {"a": 2, "b": [1, 2]}, [data], [path])
+    assert key != sake.cache.ResultCache.key("method", {"a": 1, "b": [1, 2]}, [data.head(2)], [path])
+
+    os.utime(path, ns=(0, 0))
+    assert key != sake.cache.ResultCache.key("method", {"a": 1, "b": [1, 2]}, [data], [path])
+
+
+def test_result_cache(tmp_path: pathlib.Path) -> None:
+    """Check get, set and eviction."""
+    cache = sake.cache.ResultCache(tmp_path / "cache")
+    data = polars.DataFrame({"id": list(range(1000))})
+
+    assert cache.get("a") is None
+    cache.set("a", data)
+    polars.testing.assert_frame_equal(cache.get("a"), data)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    entry_size = cache.size()
+    cache.max_size = 2 * entry_size
+    cache.set("b", data)
+    os.utime(tmp_path / "cache" / "a.parquet", ns=(0, 0))
+    cache.set("c", data)
+
+    # a is least recently used
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.size() <= 2 * entry_size
+
+    cache.clear()
+    assert cache.size() == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_sake_cache(tmp_path: pathlib.Path) -> None:
+    """Check Sake use cache and invalidate it when file change."""
+    sake_path = tmp_path / "sake"
+    shutil.copytree("tests/data", sake_path)
+    database = sake.Sake(sake_path, "germline", cache_path=tmp_path / "cache")
+    cache = database._result_cache
+    assert cache is not None
+
+    variants = database.get_interval("X", 47115191, 99009863)
+    assert cache.misses == 1
+    polars.testing.assert_frame_equal(database.get_interval("X", 47115191, 99009863), variants)
+    assert cache.hits == 1
+
+    genotypes = database.add_genotypes(variants)
+    polars.testing.assert_frame_equal(database.add_genotypes(variants), genotypes)
+    assert cache.hits == 2
+
+    annotations = database.get_annotations("snpeff", "4.3t")
+    polars.testing.assert_frame_equal(database.get_annotations("snpeff", "4.3t"), annotations)
+    assert cache.hits == 3
+
+    # Sake with other genotype columns share cache but not result
+    other = sake.Sake(sake_path, "germline", cache_path=tmp_path / "cache", genotype_columns=["gt"])
+    assert other.add_genotypes(variants).columns == [*variants.columns, "sample", "gt"]
+    assert other._result_cache.hits == 0  # type: ignore[union-attr]
+
+    # variants file change, result is compute again
+    path = sake_path / "germline" / "variants" / "X.parquet"
+    polars.read_parquet(path).head(0).write_parquet(path)
+    assert database.get_interval("X", 47115191, 99009863).height == 0
+    assert cache.hits == 3
@@ -0,0 +1,68 @@
+"""Test catalog submodule."""
+
+from __future__ import annotations
+
+# std import
+import pathlib
+import shutil
+
+# 3rd party import
+import polars
+import polars.testing
+
+# project import
+import sake
+
+
+def test_catalog() -> None:
+    """Check catalog answer like filesystem."""
+    root = pathlib.Path("tests/data")
+    variants_path = root / "germline" / "variants"
+    catalog = sake.catalog.SakeCatalog(root, [variants_path, root / "annotations"])
+
+    # directory is walk only when a path inside it is requested
+    assert catalog.walked == []
+    assert catalog.is_file(variants_path / "X.parquet")
+    assert catalog.walked == ["germline/variants"]
+
+    assert len(catalog) > 0
+    assert catalog.walked == ["germline/variants", "annotations"]
+    assert list(catalog.get_chromosome_path(variants_path)) == sorted(
+        sake._utils.get_chromosome_path(variants_path),
+    )
+    assert list(catalog.get_chromosome_path(variants_path, ["X", "Z", "1"])) == [
+        variants_path / "X.parquet",
+        variants_path / "1.parquet",
+    ]
+    assert catalog.size(variants_path / "X.parquet") == (variants_path / "X.parquet").stat().st_size
+    assert catalog.size(variants_path / "Z.parquet") is None
+    assert not catalog.is_file(root / "samples" / "patients.parquet")
+
+    for name, version in [("snpeff", "4.3t"), ("nvp", "1.0"), ("gnomad", "3.1.2"), ("nc", "1.0"), ("none", "1")]:
+        assert catalog.fix_annotation_path(root / "annotations", name, version, "germline") == (
+            sake._utils.fix_annotation_path(root / "annotations", name, version, "germline")
+        )
+
+
+def test_catalog_manifest(tmp_path: pathlib.Path) -> None:
+    """Check catalog save, load and refresh."""
+    shutil.copytree("tests/data/germline/variants", tmp_path / "germline" / "variants")
+
+    database = sake.Sake(tmp_path, "germline", catalog_path=tmp_path / "catalog.json")
+    truth = database.all_variants()
+    assert (tmp_path / "catalog.json").is_file()
+    assert database.get_catalog().walked == ["germline/variants"]
+
+    catalog = sake.catalog.SakeCatalog.load(tmp_path, tmp_path / "catalog.json")
+    assert catalog.files == database.get_catalog().files
+
+    # new file is ignored until refresh
+    polars.read_parquet(tmp_path / "germline" / "variants" / "X.parquet").write_parquet(
+        tmp_path / "germline" / "variants" / "X2.parquet",
+    )
+    database = sake.Sake(tmp_path, "germline", catalog_path=tmp_path / "catalog.json")
+    polars.testing.assert_frame_equal(database.all_variants(), truth, check_row_order=False)
+
+    database.refresh_catalog()
+    assert database.all_variants().height > truth.height
+    assert sake.catalog.SakeCatalog.load(tmp_path, tmp_path / "catalog.json").files == database.get_catalog().files
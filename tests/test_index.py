@@ -0,0 +1,223 @@
+"""Test index submodule."""
+
+from __future__ import annotations
+
+# std import
+import os
+import pathlib
+
+# 3rd party import
+import numpy
+import polars
+import polars.testing
+
+# project import
+import sake
+
+
+def __write_variants(path: pathlib.Path) -> pathlib.Path:
+    """Write chromosome X variants sorted by position with small row group."""
+    variants = path / "variants" / "X.parquet"
+    variants.parent.mkdir(parents=True)
+    polars.read_parquet("tests/data/germline/variants/X.parquet").sort("pos").write_parquet(
+        variants,
+        row_group_size=4,
+        statistics=False,
+    )
+    return variants
+
+
+def test_zonemap(tmp_path: pathlib.Path) -> None:
+    """Check zonemap build and read."""
+    variants = __write_variants(tmp_path)
+    index = tmp_path / "index" / "X.json"
+
+    assert sake.index.read_zonemap(variants, index) is None
+
+    zonemap = sake.index.build_zonemap(variants, index)
+    positions = polars.read_parquet(variants).get_column("pos").to_list()
+    assert zonemap == [(min(positions[i : i + 4]), max(positions[i : i + 4])) for i in range(0, len(positions), 4)]
+    assert sake.index.read_zonemap(variants, index) == zonemap
+
+    assert sake.index.overlap_row_groups(zonemap, 0, zonemap[0][0]) == []
+    assert sake.index.overlap_row_groups(zonemap, zonemap[0][1] - 1, zonemap[1][0] + 1) == [0, 1]
+
+    # index is stale if file change
+    os.utime(variants, ns=(0, 0))
+    assert sake.index.read_zonemap(variants, index) is None
+    assert os.listdir(index.parent) == ["X.json"]
+
+
+def test_zonemap_statistics(tmp_path: pathlib.Path) -> None:
+    """Check zonemap of file with statistics isn't write."""
+    variants = tmp_path / "X.parquet"
+    polars.read_parquet("tests/data/germline/variants/X.parquet").sort("pos").write_parquet(variants, row_group_size=4)
+    index = tmp_path / "index" / "X.json"
+
+    zonemap = sake.index.build_zonemap(variants, index)
+    positions = polars.read_parquet(variants).get_column("pos").to_list()
+    assert zonemap == [(min(positions[i : i + 4]), max(positions[i : i + 4])) for i in range(0, len(positions), 4)]
+    assert not index.exists()
+    assert sake.index.read_zonemap(variants, index) == zonemap
+
+
+def test_column_min_max(tmp_path: pathlib.Path) -> None:
+    """Check min max from statistics."""
+    variants = tmp_path / "X.parquet"
+    data = polars.read_parquet("tests/data/germline/variants/X.parquet")
+    data.write_parquet(variants, row_group_size=4)
+
+    assert sake.index.column_min_max(variants, "id") == (data.get_column("id").min(), data.get_column("id").max())
+
+    data.write_parquet(variants, statistics=False)
+    assert sake.index.column_min_max(variants, "id") is None
+
+
+def test_statistics_row_groups(tmp_path: pathlib.Path) -> None:
+    """Check row groups selected by statistics."""
+    path = tmp_path / "ids.parquet"
+    polars.DataFrame({"id": [1, 2, 10, 11, 2**63 + 1, 2**63 + 2]}, schema={"id": polars.UInt64}).write_parquet(
+        path,
+        row_group_size=2,
+    )
+
+    assert sake.index.statistics_row_groups(path, numpy.array([], dtype=numpy.uint64)) == []
+    assert sake.index.statistics_row_groups(path, numpy.array([2, 2**63 + 2], dtype=numpy.uint64)) == [0, 2]
+    assert sake.index.statistics_row_groups(path, numpy.array([5, 12], dtype=numpy.uint64)) == []
+    assert sake.index.statistics_row_groups(path, numpy.array([11], dtype=numpy.uint64)) == [1]
+
+    path = tmp_path / "no_statistics.parquet"
+    polars.DataFrame({"id": [1, 2]}, schema={"id": polars.UInt64}).write_parquet(path, statistics=False)
+    assert sake.index.statistics_row_groups(path, numpy.array([5], dtype=numpy.uint64)) == [0]
+
+
+def test_read_row_groups(tmp_path: pathlib.Path) -> None:
+    """Check read of row groups."""
+    variants = __write_variants(tmp_path)
+
+    assert sake.index.read_row_groups(variants, [0, 2]).num_rows == 8
+    empty = sake.index.read_row_groups(variants, [], ["id", "pos"])
+    assert empty.num_rows == 0
+    assert empty.column_names == ["id", "pos"]
+
+
+def test_get_interval_with_index(tmp_path: pathlib.Path) -> None:
+    """Check get_interval use zonemap."""
+    __write_variants(tmp_path / "germline")
+    database = sake.Sake(tmp_path, "germline")
+
+    truth = database.get_interval("X", 47115191, 99009863)
+
+    database.build_interval_index()
+    assert (tmp_path / "germline" / "index" / "zonemap" / "X.json").is_file()
+
+    polars.testing.assert_frame_equal(database.get_interval("X", 47115191, 99009863), truth)
+    assert database.get_interval("X", 0, 10).height == 0
+
+
+def test_get_intervals_with_index(tmp_path: pathlib.Path) -> None:
+    """Check get_intervals use zonemap."""
+    __write_variants(tmp_path / "germline")
+    database = sake.Sake(tmp_path, "germline")
+
+    truth = database.get_intervals(["X", "X"], [47115191, 0], [99009863, 10])
+
+    database.build_interval_index(["X"])
+
+    polars.testing.assert_frame_equal(database.get_intervals(["X", "X"], [47115191, 0], [99009863, 10]), truth)
+
+
+def test_locator(tmp_path: pathlib.Path) -> None:
+    """Check locator build and locate."""
+    paths = list(sake._utils.get_chromosome_path(pathlib.Path("tests/data/germline/variants")))
+    variants = polars.concat([polars.read_parquet(path) for path in paths])
+
+    assert not sake.index.Locator.is_fresh(tmp_path, paths)
+    locator = sake.index.Locator.build(paths, tmp_path)
+    assert sake.index.Locator.is_fresh(tmp_path, paths)
+    assert len(locator) == variants.height
+
+    ids = variants.get_column("id").gather(list(range(0, variants.height, 7)))
+    result = locator.locate(polars.concat([ids, polars.Series([1], dtype=polars.UInt64)]))
+    polars.testing.assert_frame_equal(
+        result,
+        variants.filter(polars.col("id").is_in(ids.implode())),
+        check_row_order=False,
+    )
+    assert locator.locate(ids.clear()).height == 0
+
+    assert not sake.index.Locator.is_fresh(tmp_path, paths[1:])
+
+    # rebuild replace files, locator already open keep its data
+    truth = locator.locate(ids)
+    new_locator = sake.index.Locator.build(paths[1:], tmp_path)
+    assert sake.index.Locator.is_fresh(tmp_path, paths[1:])
+    assert len(new_locator) < len(locator)
+    polars.testing.assert_frame_equal(locator.locate(ids), truth)
+    assert not any(path.name.startswith(".") for path in tmp_path.iterdir())
+
+
+def test_sake_locator(tmp_path: pathlib.Path) -> None:
+    """Check Sake use locator."""
+    database = sake.Sake(pathlib.Path("tests/data"), "germline", index_path=tmp_path)
+
+    variants = database.get_interval("X", 47115191, 99009863)
+    data = database.add_genotypes(variants).select("id", "sample", "gt")
+    add_truth = database.add_variants(data)
+    pid_truth = database.get_variant_of_prescription("AAAA")
+
+    database.build_locator()
+    assert database._get_locator() is not None
+
+    polars.testing.assert_frame_equal(database.add_variants(data), add_truth, check_row_order=False)
+    polars.testing.assert_frame_equal(database.get_variant_of_prescription("AAAA"), pid_truth, check_row_order=False)
+
+
+def test_bloom_filter(tmp_path: pathlib.Path) -> None:
+    """Check bloom filter build and read."""
+    path = tmp_path / "partition.parquet"
+    ids = polars.Series("id", range(0, 2**40, 2**25), dtype=polars.UInt64)
+    polars.DataFrame({"id": ids}).write_parquet(path, row_group_size=10_000)
+    index = tmp_path / "bloom.npz"
+
+    assert sake.index.read_bloom_filter(path, index) is None
+
+    bloom = sake.index.build_bloom_filter(path, index)
+    assert len(bloom) == 4
+
+    contains = bloom.might_contain(ids.to_numpy())
+    for i in range(4):
+        assert contains[i, i * 10_000 : (i + 1) * 10_000].all()
+
+    # absent values are rejected except few false positive
+    absent = bloom.might_contain((ids + 1).to_numpy())
+    assert absent.mean() < 0.01
+
+    read = sake.index.read_bloom_filter(path, index)
+    assert read is not None
+    assert (read.might_contain(ids.to_numpy()) == contains).all()
+
+    # index is stale if file change
+    os.utime(path, ns=(0, 0))
+    assert sake.index.read_bloom_filter(path, index) is None
+
+
+def test_sake_bloom_filter(tmp_path: pathlib.Path) -> None:
+    """Check Sake use bloom filter."""
+    database = sake.Sake(pathlib.Path("tests/data"), "germline", index_path=tmp_path)
+
+    variants = database.get_interval("X", 47115191, 99009863)
+    absent = variants.head(1).with_columns(polars.col("id") + 1)
+    genotypes_truth = database.add_genotypes(variants)
+    samples = database.add_sample_info(genotypes_truth)
+    transmissions_truth = database.add_transmissions(samples)
+
+    database.build_bloom_filters()
+    assert (tmp_path / "bloom" / "partitions").is_dir()
+    assert (tmp_path / "bloom" / "transmissions").is_dir()
+
+    polars.testing.assert_frame_equal(database.add_genotypes(variants), genotypes_truth, check_row_order=False)
+    polars.testing.assert_frame_equal(database.add_transmissions(samples), transmissions_truth, check_row_order=False)
+
+    assert database.add_genotypes(polars.concat([variants, absent])).height == genotypes_truth.height
+    assert database.add_genotypes(absent).height == 0
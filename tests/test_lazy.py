@@ -0,0 +1,112 @@
+"""Test lazy submodule."""
+
+from __future__ import annotations
+
+# std import
+import pathlib
+import shutil
+
+# 3rd party import
+import polars
+import polars.testing
+import pytest
+
+# project import
+from sake import Sake, utils
+
+
+def test_no_source() -> None:
+    """Check query without source raise error."""
+    sake = Sake(pathlib.Path("tests/data"), "germline")
+
+    with pytest.raises(ValueError, match="no source"):
+        sake.query().add_genotypes().collect()
+
+
+def test_chain() -> None:
+    """Check lazy chain produce same result than eager method."""
+    sake = Sake(pathlib.Path("tests/data"), "germline")
+
+    variants = sake.get_interval("X", 47115191, 99009863)
+    genotyped = sake.add_genotypes(variants)
+    samples_info = sake.add_sample_info(genotyped)
+    transmissions = sake.add_transmissions(samples_info)
+    truth = sake.add_annotations(transmissions, "snpeff", "4.3t", select_columns=["effect", "impact"])
+
+    result = (
+        sake.query()
+        .get_interval("X", 47115191, 99009863)
+        .add_genotypes()
+        .add_sample_info()
+        .add_transmissions()
+        .add_annotations("snpeff", "4.3t", select_columns=["effect", "impact"], chrom_basename="X")
+    )
+
+    polars.testing.assert_frame_equal(result.collect(), truth, check_row_order=False, check_column_order=False)
+    assert result.to_arrow().num_rows == truth.height
+
+
+def test_from_data() -> None:
+    """Check lazy query start from DataFrame."""
+    sake = Sake(pathlib.Path("tests/data"), "germline")
+
+    variants = sake.get_interval("X", 47115191, 99009863)
+    data = sake.add_genotypes(variants).select("id", "sample", "gt")
+
+    result = sake.query(data).add_variants().filter("gt == 2").select("id", "chr", "sample").collect()
+    truth = sake.add_variants(data).filter(polars.col("gt") == 2).select("id", "chr", "sample")
+
+    polars.testing.assert_frame_equal(result, truth, check_row_order=False, check_column_order=False)
+
+
+def test_read_only_needed_files(tmp_path: pathlib.Path) -> None:
+    """Check only partitions and transmissions of previous steps are read."""
+    shutil.copytree("tests/data", tmp_path, dirs_exist_ok=True)
+    sake = Sake(tmp_path, "germline")
+
+    variants = sake.get_interval("X", 47115191, 99009863)
+    samples_info = sake.add_sample_info(sake.add_genotypes(variants))
+    truth = sake.add_transmissions(samples_info)
+
+    # partition of id doesn't exist, a file is read but nothing match
+    partitions = tmp_path / "germline" / "genotypes" / "partitions"
+    missing = next(id_part for id_part in range(255) if not (partitions / f"id_part={id_part}").exists())
+    data = polars.DataFrame({"id": [missing << 55]}, schema={"id": polars.UInt64})
+    assert sake.query(data).add_genotypes().collect().height == 0
+
+    # other files are corrupted, query fail if they are read
+    id_parts = set(utils.add_id_part(variants).get_column("id_part").to_list())
+    for path in partitions.glob("*/0.parquet"):
+        if int(path.parent.name.removeprefix("id_part=")) not in id_parts:
+            path.write_bytes(b"corrupted")
+    pids = set(samples_info.get_column("pid_crc").to_list())
+    for path in (tmp_path / "germline" / "genotypes" / "transmissions").glob("*.parquet"):
+        if path.stem not in pids:
+            path.write_bytes(b"corrupted")
+
+    result = sake.query().get_interval("X", 47115191, 99009863).add_genotypes().add_sample_info().add_transmissions()
+
+    polars.testing.assert_frame_equal(result.collect(), truth, check_row_order=False, check_column_order=False)
+
+
+def test_sink_parquet(tmp_path: pathlib.Path) -> None:
+    """Check lazy query could be write in parquet."""
+    sake = Sake(pathlib.Path("tests/data"), "germline")
+
+    path = tmp_path / "result.parquet"
+    sake.query().get_variant_of_prescription("AAAA").sink_parquet(path)
+
+    polars.testing.assert_frame_equal(
+        polars.read_parquet(path),
+        sake.get_variant_of_prescription("AAAA"),
+        check_row_order=False,
+    )
+
+
+def test_unknow_annotations() -> None:
+    """Check unknow annotations didn't change query."""
+    sake = Sake(pathlib.Path("tests/data"), "germline")
+
+    query = sake.query().all_variants()
+
+    assert query.add_annotations("unknow", "0.0").sql == query.sql
@@ -0,0 +1,95 @@
+"""Test metadata submodule."""
+
+from __future__ import annotations
+
+# std import
+import os
+import typing
+
+# 3rd party import
+import polars
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import pathlib
+
+
+def test_lru_cache() -> None:
+    """Check least recently used element is drop."""
+    cache = sake.metadata.LRUCache(2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_lru_cache_weight() -> None:
+    """Check element are drop when cache is too heavy."""
+    cache = sake.metadata.LRUCache(max_weight=10, weigher=len)
+
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    assert cache.weight == 8
+    cache.set("c", "cccc")
+
+    assert cache.get("a") is None
+    assert cache.weight == 8
+
+    # too heavy element isn't store
+    cache.set("d", "d" * 11)
+    assert cache.get("d") is None
+    assert cache.get("b") == "bbbb"
+
+    cache.set("b", "b")
+    assert cache.weight == 5
+
+
+def test_file_stat(tmp_path: pathlib.Path) -> None:
+    """Check file stat cache."""
+    path = tmp_path / "file.parquet"
+
+    assert sake.metadata.file_stat(path) is None
+    assert not sake.metadata.is_file(tmp_path)
+
+    polars.DataFrame({"id": [1, 2]}).write_parquet(path)
+    # absence is kept in cache
+    assert not sake.metadata.is_file(path)
+    assert sake.metadata.file_stat(path, max_age=0) == (path.stat().st_size, path.stat().st_mtime_ns)
+    assert sake.metadata.is_file(path)
+
+
+def test_parquet_metadata(tmp_path: pathlib.Path) -> None:
+    """Check parquet metadata are invalidate when file change."""
+    path = tmp_path / "file.parquet"
+    polars.DataFrame({"id": [1, 2], "value": ["a", "b"]}).write_parquet(path)
+
+    schema = sake.metadata.parquet_schema(path)
+    assert schema == {"id": polars.Int64, "value": polars.String}
+    del schema["id"]
+    assert sake.metadata.parquet_schema(path) == {"id": polars.Int64, "value": polars.String}
+
+    metadata = sake.metadata.parquet_metadata(path)
+    assert metadata.num_rows == 2
+    assert sake.metadata.parquet_metadata(path) is metadata
+
+    polars.DataFrame({"id": [1, 2, 3]}).write_parquet(path)
+    os.utime(path, ns=(0, 0))
+    assert sake.metadata.parquet_schema(path) == {"id": polars.Int64}
+    assert sake.metadata.parquet_metadata(path).num_rows == 3
+
+    sake.metadata.clear()
+    assert sake.metadata.parquet_metadata(path) is not metadata
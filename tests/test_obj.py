@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 # std import
+import concurrent.futures
+import json
 import os
 import pathlib
+import shutil
 
 # 3rd party import
+import duckdb
 import polars
 import polars.testing
+import pyarrow
+import pytest
 
 # project import
 import sake as sake_module
@@ -639,6 +645,67 @@ def test_get_intervals() -> None:
     ]
 
 
+def test_get_intervals_with_comment() -> None:
+    """Check get intervals with comment."""
+    sake_path = pathlib.Path("tests/data")
+    sake = Sake(sake_path, "germline")
+
+    result = sake.get_intervals(
+        ["X", "10"],
+        [47115191, 47115191],
+        [99009863, 99009863],
+        [polars.lit("x").alias("name"), polars.lit("10").alias("name")],
+    )
+
+    truth = polars.concat(
+        [
+            sake.get_interval("X", 47115191, 99009863, polars.lit("x").alias("name")),
+            sake.get_interval("10", 47115191, 99009863, polars.lit("10").alias("name")),
+        ],
+    )
+
+    polars.testing.assert_frame_equal(result, truth)
+
+
+def test_get_intervals_from(tmp_path: pathlib.Path) -> None:
+    """Check get intervals from DataFrame and bed file."""
+    sake_path = pathlib.Path("tests/data")
+    sake = Sake(sake_path, "germline", threads=2)
+
+    intervals = polars.DataFrame(
+        {
+            "chr": ["10", "X", "X", "Y"],
+            "start": [47115191, 47115191, 91089367, 0],
+            "stop": [99009863, 66569343, 91133486, 10],
+            "name": ["a", "b", "c", "d"],
+        },
+    )
+    truth = polars.concat(
+        [
+            sake.get_interval(chrom, start, stop, polars.lit(name).alias("name"))
+            for chrom, start, stop, name in intervals.iter_rows()
+        ],
+    )
+
+    polars.testing.assert_frame_equal(sake.get_intervals_from(intervals), truth)
+    polars.testing.assert_frame_equal(sake.get_intervals_from(intervals, read_threads=2), truth)
+
+    bed_path = tmp_path / "intervals.bed"
+    intervals.write_csv(bed_path, separator="\t", include_header=False)
+    polars.testing.assert_frame_equal(sake.get_intervals_from(bed_path), truth)
+
+    # bed interval is 0-based and half-open, a 1-bp region contains variant on its last base
+    bed_path.write_text("X\t31233959\t31233960\tsnv\nX\t31233960\t31233961\tafter\n")
+    result = sake.get_intervals_from(bed_path)
+    assert result.get_column("pos").to_list() == [31233960]
+    assert result.get_column("name").to_list() == ["snv"]
+
+    # no chromosome file match intervals
+    result = sake.get_intervals_from(intervals.with_columns(chr=polars.lit("unknown")))
+    assert result.is_empty()
+    assert result.schema == truth.schema
+
+
 def test_get_cnv() -> None:
     """Check get cnv."""
     sake_path = pathlib.Path("tests/data")
@@ -945,6 +1012,26 @@ def test_pid_variants() -> None:
     ]
 
 
+def test_pid_variants_chunk() -> None:
+    """Check get variant of prescriptions by chunk."""
+    sake_path = pathlib.Path("tests/data")
+    sake = Sake(sake_path, "germline", threads=2)
+
+    prescriptions = ["AAAA", "BBBB", "CCCC", "EEEE", "FFFF"]
+    truth = polars.concat([sake.get_variant_of_prescription(pid) for pid in prescriptions])
+
+    polars.testing.assert_frame_equal(
+        sake.get_variant_of_prescriptions(prescriptions),
+        truth,
+        check_row_order=False,
+    )
+    polars.testing.assert_frame_equal(
+        sake.get_variant_of_prescriptions(prescriptions, chunk_size=2, read_threads=2),
+        truth,
+        check_row_order=False,
+    )
+
+
 def test_get_annotations() -> None:
     """Check get annotations."""
     sake_path = pathlib.Path("tests/data")
@@ -970,6 +1057,64 @@ def test_add_variants() -> None:
     polars.testing.assert_frame_equal(result, truth, check_row_order=False, check_column_order=False)
 
 
+def test_add_variants_pruning() -> None:
+    """Check add variant read only usefull chromosome."""
+    sake_path = pathlib.Path("tests/data")
+    sake = Sake(sake_path, "germline", threads=2)
+
+    data = TRUTH.select("id", "sample", "gt")
+    truth = TRUTH.select("id", "chr", "pos", "ref", "alt", "sample", "gt")
+
+    polars.testing.assert_frame_equal(
+        sake.add_variants(data, read_threads=2),
+        truth,
+        check_row_order=False,
+        check_column_order=False,
+    )
+
+    result = sake.add_variants(TRUTH.select("id", "chr", "sample", "gt"))
+    polars.testing.assert_frame_equal(
+        result.drop("chr_1"),
+        truth,
+        check_row_order=False,
+        check_column_order=False,
+    )
+
+    result = sake.add_variants(data.clear())
+    assert result.height == 0
+    assert result.columns == ["chr", "pos", "ref", "alt", "id", "sample", "gt"]
+
+    # chromosome without file use id min and max
+    result = sake.add_variants(TRUTH.select("id", "sample", "gt", chr=polars.format("chr{}", "chr")))
+    polars.testing.assert_frame_equal(
+        result.drop("chr_1"),
+        truth,
+        check_row_order=False,
+        check_column_order=False,
+    )
+
+
+def test_add_variants_no_file(tmp_path: pathlib.Path) -> None:
+    """Check add variant without variants file return an empty DataFrame."""
+    (tmp_path / "germline" / "variants").mkdir(parents=True)
+    sake = Sake(tmp_path, "germline")
+
+    result = sake.add_variants(TRUTH.select("id", "chr", "sample"))
+
+    assert result.height == 0
+    assert result.schema == polars.Schema(
+        {
+            "chr": polars.String,
+            "pos": polars.UInt64,
+            "ref": polars.String,
+            "alt": polars.String,
+            "id": polars.UInt64,
+            "chr_1": polars.String,
+            "sample": polars.String,
+        },
+    )
+
+
 def test_add_genotypes() -> None:
     """Check add genotype."""
     sake_path = pathlib.Path("tests/data")
@@ -989,6 +1134,88 @@ def test_add_genotypes() -> None:
     polars.testing.assert_frame_equal(result, truth, check_row_order=False, check_column_order=False)
 
 
+def test_iter_genotypes() -> None:
+    """Check iterate over genotype."""
+    sake_path = pathlib.Path("tests/data")
+    sake = Sake(sake_path, "germline", threads=2)
+
+    variants = sake.get_interval("X", 47115191, 99009863)
+    truth = sake.add_genotypes(variants)
+
+    results = list(sake.iter_genotypes(variants))
+    assert len(results) == variants.pipe(sake_module.utils.add_id_part).get_column("id_part").n_unique()
+    polars.testing.assert_frame_equal(polars.concat(results), truth, check_row_order=False)
+
+    results = list(sake.iter_genotypes(variants, read_threads=2, in_flight=1, max_rows=2))
+    assert all(result.height <= 2 for result in results)
+    polars.testing.assert_frame_equal(polars.concat(results), truth, check_row_order=False)
+
+    iterator = sake.iter_genotypes(variants, read_threads=2)
+    assert next(iterator).height > 0
+    iterator.close()
+
+
+def test_preindications(tmp_path: pathlib.Path) -> None:
+    """Check query of multiple preindications."""
+    shutil.copytree("tests/data", tmp_path, dirs_exist_ok=True)
+    shutil.copytree(tmp_path / "germline", tmp_path / "other")
+    sake = Sake(tmp_path, "germline")
+
+    variants = sake.get_interval("X", 47115191, 99009863)
+    result = sake.get_interval("X", 47115191, 99009863, preindications="*")
+    truth = polars.concat(
+        [variants.with_columns(preindication=polars.lit(target)) for target in ["germline", "other"]],
+    )
+    polars.testing.assert_frame_equal(result, truth, check_row_order=False, check_column_order=False)
+    polars.testing.assert_frame_equal(
+        sake.get_interval("X", 47115191, 99009863, preindications="other"),
+        variants.with_columns(preindication=polars.lit("other")),
+        check_row_order=False,
+        check_column_order=False,
+    )
+
+    genotypes = sake.add_genotypes(variants)
+    result = sake.add_genotypes(variants, preindications=["germline", "other"])
+    truth = polars.concat(
+        [genotypes.with_columns(preindication=polars.lit(target)) for target in ["germline", "other"]],
+    )
+    polars.testing.assert_frame_equal(result, truth, check_row_order=False, check_column_order=False)
+    polars.testing.assert_frame_equal(
+        polars.concat(sake.iter_genotypes(variants, preindications="*")),
+        truth,
+        check_row_order=False,
+        check_column_order=False,
+    )
+
+    # variants of each preindication are search in their preindication
+    all_variants = sake.get_interval("X", 47115191, 99009863, preindications="*")
+    result = sake.add_genotypes(all_variants.filter(polars.col("preindication") == "other"), preindications="*")
+    polars.testing.assert_frame_equal(
+        result,
+        truth.filter(polars.col("preindication") == "other"),
+        check_row_order=False,
+        check_column_order=False,
+    )
+    polars.testing.assert_frame_equal(
+        sake.add_genotypes(all_variants, preindications="*"),
+        truth,
+        check_row_order=False,
+        check_column_order=False,
+    )
+
+    prescriptions = sake.get_variant_of_prescriptions(["EEEE", "FFFF"])
+    result = sake.get_variant_of_prescriptions(["EEEE", "FFFF"], preindications="*")
+    truth = polars.concat(
+        [prescriptions.with_columns(preindication=polars.lit(target)) for target in ["germline", "other"]],
+    )
+    polars.testing.assert_frame_equal(result, truth, check_row_order=False, check_column_order=False)
+
+    with pytest.raises(ValueError, match="preindication"):
+        sake.add_genotypes(variants, preindications=[])
+    with pytest.raises(ValueError, match="preindication"):
+        sake.get_variant_of_prescriptions(["ZZZZ"], preindications="*")
+
+
 def test_add_samples_info() -> None:
     """Check add samples_info."""
     sake_path = pathlib.Path("tests/data")
@@ -1035,6 +1262,28 @@ def test_add_samples_info() -> None:
     polars.testing.assert_frame_equal(result, truth, check_row_order=False, check_column_order=False)
 
 
+def test_add_samples_info_cache(tmp_path: pathlib.Path) -> None:
+    """Check samples information are reload only when file change."""
+    samples_path = tmp_path / "patients.parquet"
+    samples = polars.read_parquet("tests/data/samples/patients.parquet")
+    samples.write_parquet(samples_path)
+    sake = Sake(pathlib.Path("tests/data"), "germline", samples_path=samples_path)
+
+    data = polars.DataFrame({"sample": ["BBB0", "unknow", "AAA0", None]})
+    result = sake.add_sample_info(data, select_columns=["pid_crc", "kindex"])
+    assert result.columns == ["sample", "kindex", "pid_crc"]
+    assert result.get_column("pid_crc").to_list() == ["BBBB", None, "AAAA", None]
+
+    cached = sake._samples
+    sake.add_sample_info(data)
+    assert sake._samples is cached
+
+    samples.with_columns(polars.col("pid_crc") + "_new").write_parquet(samples_path)
+    os.utime(samples_path, ns=(0, 0))
+    result = sake.add_sample_info(data, select_columns=["pid_crc"])
+    assert result.get_column("pid_crc").to_list() == ["BBBB_new", None, "AAAA_new", None]
+
+
 def test_add_transmissions() -> None:
     """Check add transmissions."""
     sake_path = pathlib.Path("tests/data")
@@ -1181,3 +1430,293 @@ def test_add_annotations() -> None:
     )
 
     polars.testing.assert_frame_equal(annotations, truth, check_row_order=False, check_column_order=False)
+
+
+def test_add_annotations_identifier(tmp_path: pathlib.Path) -> None:
+    """Check annotation and column name that aren't sql identifier."""
+    shutil.copytree("tests/data", tmp_path, dirs_exist_ok=True)
+    sake = Sake(tmp_path, "germline")
+    variants = sake.get_interval("X", 47115191, 99009863)
+
+    values = {"AF popmax": [0.5] * variants.height, "1st.score": [1] * variants.height, 'a"b': ["x"] * variants.height}
+    (tmp_path / "annotations" / "gnomad-v3" / "1.0").mkdir(parents=True)
+    variants.select("id").with_columns(**{name: polars.Series(value) for name, value in values.items()}).write_parquet(
+        tmp_path / "annotations" / "gnomad-v3" / "1.0" / "germline.parquet",
+    )
+
+    result = sake.add_annotations(variants, "gnomad-v3", "1.0")
+    truth = variants.with_columns(**{f"gnomad-v3_{name}": polars.Series(value) for name, value in values.items()})
+    polars.testing.assert_frame_equal(result, truth, check_row_order=False)
+
+    result = sake.add_annotations(variants, "gnomad-v3", "1.0", rename_column=False, select_columns=["1st.score"])
+    polars.testing.assert_frame_equal(
+        result,
+        truth.drop("gnomad-v3_AF popmax", 'gnomad-v3_a"b').rename(lambda x: x.replace("gnomad-v3_", "")),
+        check_row_order=False,
+    )
+
+    annotations = sake.get_annotations("gnomad-v3", "1.0")
+    assert annotations is not None
+    assert annotations.columns[-3:] == truth.columns[-3:]
+
+    result = sake.query().get_interval("X", 47115191, 99009863).add_annotations("gnomad-v3", "1.0").collect()
+    polars.testing.assert_frame_equal(result, truth, check_row_order=False, check_column_order=False)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_worker_pool(executor: str) -> None:
+    """Check worker pool is reused between call and shutdown by close."""
+    sake_path = pathlib.Path("tests/data")
+
+    with Sake(sake_path, "germline", threads=2, executor=executor) as sake:
+        variants = sake.get_interval("X", 47115191, 99009863)
+
+        result = sake.add_genotypes(variants, read_threads=2)
+        executor = sake._get_executor(2)
+        assert list(sake._executors) == [2]
+
+        truth = TRUTH.select("id", "chr", "pos", "ref", "alt", "sample", "gt", "ad", "dp", "gq")
+        polars.testing.assert_frame_equal(result, truth, check_row_order=False, check_column_order=False)
+
+        result = sake.add_genotypes(variants, read_threads=2)
+        assert sake._get_executor(2) is executor
+        polars.testing.assert_frame_equal(result, truth, check_row_order=False, check_column_order=False)
+
+    assert sake._executors == {}
+
+
+def test_output() -> None:
+    """Check output format."""
+    sake_path = pathlib.Path("tests/data")
+    sake = Sake(sake_path, "germline")
+
+    truth = TRUTH.select("id", "chr", "pos", "ref", "alt").unique("id")
+
+    result = sake.get_interval("X", 47115191, 99009863, output="arrow")
+    assert isinstance(result, pyarrow.Table)
+    polars.testing.assert_frame_equal(polars.from_arrow(result), truth, check_row_order=False, check_column_order=False)
+
+    result = sake.get_interval("X", 47115191, 99009863, output="reader")
+    assert isinstance(result, pyarrow.RecordBatchReader)
+    polars.testing.assert_frame_equal(
+        polars.from_arrow(result.read_all()),
+        truth,
+        check_row_order=False,
+        check_column_order=False,
+    )
+
+    result = sake.get_interval("X", 47115191, 99009863, output="relation")
+    assert isinstance(result, duckdb.DuckDBPyRelation)
+    polars.testing.assert_frame_equal(result.pl(), truth, check_row_order=False, check_column_order=False)
+
+    variants = sake.get_interval("X", 47115191, 99009863)
+    truth = sake.add_genotypes(variants)
+    for output in ["arrow", "reader"]:
+        result = sake.add_genotypes(variants, output=output)
+        table = result if isinstance(result, pyarrow.Table) else result.read_all()
+        polars.testing.assert_frame_equal(polars.from_arrow(table), truth, check_row_order=False)
+
+    result = sake.add_genotypes(variants, output="relation")
+    polars.testing.assert_frame_equal(result.pl(), truth, check_row_order=False)
+
+    with pytest.raises(ValueError, match="output must be one of"):
+        sake.get_interval("X", 47115191, 99009863, output="pandas")
+
+
+def test_default_output() -> None:
+    """Check output format set at object level."""
+    sake_path = pathlib.Path("tests/data")
+
+    sake = Sake(sake_path, "germline", output="arrow")
+    assert isinstance(sake.get_interval("X", 47115191, 99009863), pyarrow.Table)
+    assert isinstance(sake.get_interval("X", 47115191, 99009863, output="polars"), polars.DataFrame)
+
+    with pytest.raises(ValueError, match="output must be one of"):
+        Sake(sake_path, "germline", output="pandas")
+
+
+def test_executor() -> None:
+    """Check executor type."""
+    sake_path = pathlib.Path("tests/data")
+
+    with Sake(sake_path, "germline", threads=2) as sake:
+        variants = sake.get_interval("X", 47115191, 99009863)
+        truth = sake.add_genotypes(variants)
+        polars.testing.assert_frame_equal(sake.add_genotypes(variants, read_threads=2), truth, check_row_order=False)
+        assert isinstance(sake._get_executor(2), concurrent.futures.ThreadPoolExecutor)
+        # cursors share duckdb threads of database
+        assert sake._worker_threads(2) == 2
+
+    with Sake(sake_path, "germline", threads=2, executor="process") as sake:
+        polars.testing.assert_frame_equal(sake.add_genotypes(variants, read_threads=2), truth, check_row_order=False)
+        assert isinstance(sake._get_executor(2), concurrent.futures.ProcessPoolExecutor)
+
+    # more workers than threads, each worker use one duckdb thread
+    with Sake(sake_path, "germline", threads=1, executor="process") as sake:
+        assert sake._worker_threads(2) == 1
+        polars.testing.assert_frame_equal(sake.add_genotypes(variants, read_threads=2), truth, check_row_order=False)
+
+    with pytest.raises(ValueError, match="executor must be one of"):
+        Sake(sake_path, "germline", executor="fork")
+
+
+def test_add_recurrence(tmp_path: pathlib.Path) -> None:
+    """Check precomputed recurrence."""
+    sake = Sake(pathlib.Path("tests/data"), "germline", aggregations_path=tmp_path)
+
+    sake.build_recurrence()
+    assert (tmp_path / "germline" / "recurrence" / "meta.json").is_file()
+
+    variants = sake.all_variants()
+    genotypes = sake.add_genotypes(variants)
+    truth = sake_module.utils.add_recurrence(genotypes).select("id", "sake_AC", "sake_nhomalt").unique()
+    truth = truth.join(genotypes.group_by("id").agg(sake_carriers=polars.col("sample").n_unique()), on="id")
+
+    result = sake.add_recurrence(variants, read_threads=2)
+    assert result.columns == [*variants.columns, "sake_AC", "sake_nhomalt", "sake_carriers"]
+    polars.testing.assert_frame_equal(
+        result.select(truth.columns).drop_nulls(),
+        truth,
+        check_row_order=False,
+    )
+
+    absent = polars.DataFrame({"id": [1]}, schema={"id": polars.UInt64})
+    result = sake.add_recurrence(absent)
+    assert result.get_column("sake_AC").to_list() == [None]
+
+
+def test_count_recurrence(tmp_path: pathlib.Path) -> None:
+    """Check recurrence count from partitions."""
+    sake = Sake(pathlib.Path("tests/data"), "germline", aggregations_path=tmp_path)
+
+    variants = sake.all_variants()
+    genotypes = sake.add_genotypes(variants)
+    truth = sake_module.utils.add_recurrence(genotypes).select("id", "sake_AC", "sake_nhomalt").unique()
+    truth = truth.join(genotypes.group_by("id").agg(sake_carriers=polars.col("sample").n_unique()), on="id")
+
+    result = sake.count_recurrence(variants.get_column("id"), read_threads=2)
+    polars.testing.assert_frame_equal(result, truth, check_row_order=False)
+
+    result = sake.count_recurrence(variants.get_column("id"), ["affected"])
+    assert result.columns == ["id", "affected", "sake_AC", "sake_nhomalt", "sake_carriers"]
+    polars.testing.assert_frame_equal(
+        result.group_by("id").agg(polars.col("sake_AC").sum(), polars.col("sake_carriers").sum()),
+        truth.select("id", "sake_AC", "sake_carriers"),
+        check_row_order=False,
+    )
+
+    assert sake.count_recurrence([1]).height == 0
+
+    with pytest.raises(ValueError, match="aren't in samples information"):
+        sake.count_recurrence(variants.get_column("id"), ["affected, s.sample"])
+
+    # without store or with an old store add_recurrence count recurrence
+    expected = variants.join(truth, on="id", how="left")
+    polars.testing.assert_frame_equal(sake.add_recurrence(variants), expected, check_row_order=False)
+
+    sake.build_recurrence()
+    meta_path = tmp_path / "germline" / "recurrence" / "meta.json"
+    with open(meta_path) as fh_in:
+        sources = json.load(fh_in)
+    with open(meta_path, "w") as fh_out:
+        json.dump({name: [0, 0] for name in sources}, fh_out)
+    for path in (tmp_path / "germline" / "recurrence").glob("*/0.parquet"):
+        path.write_bytes(b"")
+
+    polars.testing.assert_frame_equal(sake.add_recurrence(variants), expected, check_row_order=False)
+
+
+def test_memory_cache() -> None:
+    """Check in memory cache."""
+    sake_path = pathlib.Path("tests/data")
+    sake = Sake(sake_path, "germline", memory_cache_size=2**30)
+
+    variants = sake.get_interval("1", 4813834, 237555877)
+    assert sake.get_interval("1", 4813834, 237555877) is variants
+    assert sake.cache_stats()["memory"]["hits"] == 1
+
+    annotations = sake.add_annotations(variants, "snpeff", "4.3t")
+    polars.testing.assert_frame_equal(sake.add_annotations(variants, "snpeff", "4.3t"), annotations)
+    stats = sake.cache_stats()
+    assert annotations.width > variants.width
+    assert stats["memory"]["hits"] == 3
+    assert stats["memory"]["size"] > 0
+    assert "disk" not in stats
+
+    sake.cache_clear()
+    assert sake.cache_stats()["memory"] == {"hits": 0, "misses": 0, "entries": 0, "size": 0}
+    polars.testing.assert_frame_equal(sake.get_interval("1", 4813834, 237555877), variants)
+
+    assert Sake(sake_path, "germline").cache_stats() == {}
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_stats(executor: str) -> None:
+    """Check statistics of method call."""
+    sake_path = pathlib.Path("tests/data")
+    calls = []
+    sake = Sake(sake_path, "germline", threads=2, executor=executor, stats_callbacks=[calls.append])
+    assert sake.last_stats is None
+
+    variants = sake.get_interval("X", 47115191, 99009863)
+    stats = sake.last_stats
+    assert stats is not None
+    assert stats.name == "get_interval"
+    assert stats.rows_out == variants.height
+    assert stats.files == [str(sake_path / "germline" / "variants" / "X.parquet")]
+    assert stats.bytes_read > 0
+
+    genotypes = sake.add_genotypes(variants, read_threads=2)
+    stats = sake.last_stats
+    assert stats.name == "add_genotypes"
+    assert (stats.rows_in, stats.rows_out) == (variants.height, genotypes.height)
+    assert {"prepare", "queries", "concat", "output"} <= stats.durations().keys()
+    assert sum(query.rows_out or 0 for query in stats.queries) == genotypes.height
+    assert all(query.name == "genotype_query" for query in stats.queries)
+    assert all(query.profile is None for query in stats.queries)
+    assert sorted(query.key[0] for query in stats.queries) == sorted(
+        variants.pipe(sake_module.utils.add_id_part).get_column("id_part").unique().to_list(),
+    )
+    assert stats.bytes_read == sum(query.bytes_read for query in stats.queries)
+    # id filter skip row groups with id statistics outside variants ids
+    assert stats.bytes_read <= sum(sake_module.stats.parquet_bytes(path) for path in stats.files)
+    assert stats.duration > 0
+    assert calls[-1] is stats
+    assert [call.name for call in calls] == ["get_interval", "add_genotypes"]
+
+    # nested call are part of outer call
+    sake.get_intervals(["X"], [47115191], [99009863])
+    assert sake.last_stats.name == "get_intervals"
+    assert [query.name for query in sake.last_stats.queries] == ["get_intervals"]
+
+    # generator statistics are record when it's exhausted
+    list(sake.iter_genotypes(variants))
+    assert sake.last_stats.name == "iter_genotypes"
+    assert sake.last_stats.rows_out == genotypes.height
+    assert len(sake.last_stats.queries) == len(stats.queries)
+
+    sake.close()
+
+
+def test_stats_profile() -> None:
+    """Check duckdb profile of query is kept."""
+    sake_path = pathlib.Path("tests/data")
+    sake = Sake(sake_path, "germline", profile=True)
+
+    variants = sake.get_interval("X", 47115191, 99009863)
+    sake.add_genotypes(variants)
+
+    queries = sake.last_stats.queries
+    assert queries
+    assert all(query.profile is not None and "children" in query.profile for query in queries)
+    assert "scan" in queries[0].durations()
+
+    assert sake.add_variants(variants.select("id")).height == variants.height
+    assert sake.last_stats.queries[0].profile is not None
+    assert ("X",) in [query.key for query in sake.last_stats.queries]
+
+    # profiling is disable after query
+    sake.profile = False
+    sake.add_genotypes(variants)
+    assert sake.last_stats.queries
+    assert all(query.profile is None for query in sake.last_stats.queries)
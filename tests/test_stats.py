@@ -0,0 +1,56 @@
+"""Test stats submodule."""
+
+from __future__ import annotations
+
+# std import
+import typing
+
+# 3rd party import
+import polars
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import pathlib
+
+
+def test_stats() -> None:
+    """Check stages and files record."""
+    stats = sake.stats.CallStats(name="method", rows_in=2)
+    with stats.stage("scan"):
+        pass
+    with stats.stage("concat"):
+        pass
+    with stats.stage("scan"):
+        pass
+    assert stats.duration == 0.0
+
+    stats.finish(polars.DataFrame({"id": [1, 2, 3]}))
+    assert stats.rows_out == 3
+    assert stats.duration >= 0
+    assert list(stats.durations()) == ["scan", "concat"]
+
+    query = sake.stats.QueryStats(name="query", key=(1,), files=["a.parquet"], bytes_read=10)
+    stats.add_query(query)
+    stats.add_file("a.parquet", 5)
+    assert stats.files == ["a.parquet"]
+    assert stats.bytes_read == 15
+
+    result = stats.to_dict()
+    assert result["queries"][0]["key"] == (1,)
+    assert set(result["durations"]) == {"scan", "concat"}
+
+
+def test_parquet_bytes(tmp_path: pathlib.Path) -> None:
+    """Check bytes read in parquet file."""
+    path = tmp_path / "file.parquet"
+    polars.DataFrame({"id": range(1000)}).write_parquet(path, row_group_size=100)
+
+    assert sake.stats.parquet_bytes(tmp_path / "absent.parquet") == 0
+    assert sake.stats.parquet_bytes(path) == path.stat().st_size
+    one = sake.stats.parquet_bytes(path, [0])
+    assert 0 < one < sake.stats.parquet_bytes(path, [0, 1]) < path.stat().st_size
+    assert sake.stats.row_count(polars.DataFrame({"id": [1]}).to_arrow()) == 1
+    assert sake.stats.row_count(None) is None
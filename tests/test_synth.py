@@ -0,0 +1,117 @@
+"""Test synth submodule."""
+
+from __future__ import annotations
+
+# std import
+import typing
+
+# 3rd party import
+import polars
+import polars.testing
+import pytest
+
+# project import
+import sake
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # std import
+    import pathlib
+
+
+def test_generate_patients() -> None:
+    """Check families generation."""
+    patients = sake.synth.generate_patients(100, families=(0, 0, 1))
+
+    assert patients.height == 100
+    assert patients.get_column("sample").is_unique().all()
+    # last family is truncate
+    assert patients.group_by("pid_crc").len().get_column("len").max() == 3
+    assert patients.filter(polars.col("kindex")).height == 34
+    assert set(patients.filter(~polars.col("kindex")).get_column("link")) == {"mere", "pere"}
+
+    singletons = sake.synth.generate_patients(10, families=(1, 0, 0))
+    assert singletons.get_column("kindex").all()
+
+    with pytest.raises(ValueError, match="samples"):
+        sake.synth.generate_patients(0)
+    with pytest.raises(ValueError, match="families"):
+        sake.synth.generate_patients(10, families=(1, -1, 0))
+
+
+def test_generate(tmp_path: pathlib.Path) -> None:
+    """Check layout, determinism and inheritance of generated sake."""
+    for name, seed in [("a", 1), ("b", 1), ("c", 2)]:
+        sake.synth.generate(
+            tmp_path / name,
+            variants=2_000,
+            samples=15,
+            seed=seed,
+            families=(0, 0, 1),
+            allele_frequency=(0.5, 5),
+            de_novo_rate=0,
+        )
+
+    path = tmp_path / "a"
+    # scratch directory is removed
+    assert sorted(entry.name for entry in path.iterdir()) == ["annotations", "germline", "samples"]
+    partition = next((path / "germline" / "genotypes" / "partitions").glob("id_part=*/*.parquet"))
+    assert "id_part" in polars.read_parquet(partition, hive_partitioning=False).columns
+    files = sorted(file.relative_to(path) for file in path.rglob("*.parquet"))
+    assert files == sorted(file.relative_to(tmp_path / "b") for file in (tmp_path / "b").rglob("*.parquet"))
+    for file in files:
+        polars.testing.assert_frame_equal(
+            polars.read_parquet(path / file, hive_partitioning=False),
+            polars.read_parquet(tmp_path / "b" / file, hive_partitioning=False),
+        )
+    assert not polars.read_parquet(path / "germline" / "variants" / "1.parquet").equals(
+        polars.read_parquet(tmp_path / "c" / "germline" / "variants" / "1.parquet"),
+    )
+
+    database = sake.Sake(path, "germline")
+    variants = database.all_variants()
+    assert variants.height == 2_000
+    assert variants.get_column("id").is_unique().all()
+    assert variants.filter(polars.col("id") >= 2**63).height > 0
+
+    # variants id are in same order than chromosome position
+    chrom_1 = variants.filter(polars.col("chr") == "1").sort("pos")
+    assert chrom_1.filter(polars.col("id") < 2**63).get_column("id").is_sorted()
+
+    genotypes = database.add_genotypes(variants)
+    assert genotypes.height > 0
+    assert set(genotypes.get_column("gt").unique()) <= {1, 2}
+
+    # without de novo, variant of an index is carry by one of his parents
+    samples = database.add_sample_info(genotypes)
+    transmissions = database.add_transmissions(samples.filter(polars.col("link") == "patient"))
+    assert transmissions.height == samples.filter(polars.col("link") == "patient").height
+    assert transmissions.filter(polars.col("mother_gt").is_null() & polars.col("father_gt").is_null()).height == 0
+
+    assert database.add_annotations(variants, "snpeff", "4.3t").height == variants.height
+    assert "nvp_score" in database.add_annotations(variants, "nvp", "1.0").columns
+    assert database.get_variant_of_prescription("000000").height > 0
+    assert database.get_cnv_by_sample("000000", "wisecondor").height == 15
+
+
+def test_generate_remove_scratch_on_error(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check scratch directory is remove if generation fail."""
+
+    def fail(*_args: typing.Any, **_kwargs: typing.Any) -> None:
+        raise RuntimeError("merge")
+
+    monkeypatch.setattr(sake.synth, "_merge_genotypes", fail)
+    with pytest.raises(RuntimeError, match="merge"):
+        sake.synth.generate(tmp_path, variants=40, samples=2, seed=3, families=(1, 0, 0))
+
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ["annotations", "germline", "samples"]
+
+
+def test_generate_chromosome_without_carrier(tmp_path: pathlib.Path) -> None:
+    """Check chromosome with variants but without genotypes."""
+    sake.synth.generate(tmp_path, variants=40, samples=2, seed=3, families=(1, 0, 0))
+
+    database = sake.Sake(tmp_path, "germline")
+    variants = database.all_variants()
+    genotypes = database.add_genotypes(variants)
+    carriers = set(genotypes.get_column("chr"))
+    assert set(variants.get_column("chr")) - carriers
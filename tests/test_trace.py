@@ -0,0 +1,56 @@
+"""Test trace submodule."""
+
+from __future__ import annotations
+
+# std import
+import json
+import pathlib
+
+# 3rd party import
+import pytest
+
+# project import
+import sake
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_tracer(tmp_path: pathlib.Path, executor: str) -> None:
+    """Check trace of parallel read."""
+    tracer = sake.trace.Tracer()
+    sake_path = pathlib.Path("tests/data")
+
+    with sake.Sake(sake_path, "germline", threads=2, executor=executor, stats_callbacks=[tracer]) as database:
+        variants = database.get_interval("X", 47115191, 99009863)
+        database.add_genotypes(variants, read_threads=2)
+
+    path = tmp_path / "trace.json"
+    tracer.save(path)
+    with open(path) as fh_in:
+        events = json.load(fh_in)["traceEvents"]
+
+    calls = [event for event in events if event.get("cat") == "call"]
+    assert [event["name"] for event in calls] == ["get_interval", "add_genotypes"]
+
+    queries = [event for event in events if event.get("cat") == "query"]
+    assert queries
+    assert all(event["args"]["method"] == "add_genotypes" for event in queries)
+    assert all(len(event["args"]["partition"]) == 1 for event in queries)
+    assert all(event["args"]["bytes_read"] > 0 for event in queries)
+    # queries are run by workers, not by thread that call method
+    assert {(event["pid"], event["tid"]) for event in queries}.isdisjoint({(calls[1]["pid"], calls[1]["tid"])})
+
+    scans = [event for event in events if event.get("cat") == "query_stage" and event["name"] == "scan"]
+    assert len(scans) == len(queries)
+    assert any(event["name"] == "concat" for event in events if event.get("cat") == "stage")
+
+    add_genotypes = calls[1]
+    for event in queries:
+        assert add_genotypes["ts"] <= event["ts"]
+        assert event["ts"] + event["dur"] <= add_genotypes["ts"] + add_genotypes["dur"]
+
+    names = {event["args"]["name"] for event in events if event["ph"] == "M" and event["name"] == "process_name"}
+    assert "main" in names
+    assert (len(names) > 1) == (executor == "process")
+
+    tracer.clear()
+    assert tracer.to_dict()["traceEvents"] == []